@@ -0,0 +1 @@
+"""Benchmarks for the Ymera Cloud Agent Delegation Framework"""
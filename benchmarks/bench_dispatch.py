@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Task Dispatch Benchmark
+
+Measures how many tasks per second ``TaskDelegator`` dispatches to no-op
+agents while other coroutines keep unregistering and re-registering agents,
+at 10, 1k and 100k registered agents. The same load is run against the
+original list-and-lock delegator for comparison.
+
+Each measurement runs for a fixed time, so the slow configurations finish
+too.
+
+To run this benchmark:
+python -m benchmarks.bench_dispatch
+
+For a quick run:
+python -m benchmarks.bench_dispatch --seconds 0.5 --agents 10 1000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.cloud_agent import CloudAgent
+from src.delegator import TaskDelegator
+
+DISPATCHERS = 8
+
+
+class NoopAgent(CloudAgent):
+    """Agent that returns immediately."""
+
+    async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "success"}
+
+    def health_check(self) -> bool:
+        return True
+
+
+class LegacyDelegator:
+    """The list-and-lock delegator used before the registry and router."""
+
+    def __init__(self):
+        self.agents: List[CloudAgent] = []
+        self._current_agent_index = 0
+        self._index_lock = asyncio.Lock()
+
+    async def register_agent(self, agent: CloudAgent) -> None:
+        if not agent.health_check():
+            return
+        async with self._index_lock:
+            self.agents.append(agent)
+
+    async def unregister_agent(self, agent_id: str) -> bool:
+        async with self._index_lock:
+            for i, agent in enumerate(self.agents):
+                if agent.agent_id == agent_id:
+                    self.agents.pop(i)
+                    if not self.agents or self._current_agent_index >= len(self.agents):
+                        self._current_agent_index = 0
+                    return True
+        return False
+
+    async def delegate(self, task: Dict[str, Any],
+                       agent_id: Optional[str] = None) -> Dict[str, Any]:
+        async with self._index_lock:
+            if not self.agents:
+                raise ValueError("No agents registered")
+            if agent_id:
+                agent = next((a for a in self.agents if a.agent_id == agent_id), None)
+                if not agent:
+                    raise ValueError(f"Agent {agent_id} not found")
+            else:
+                agent = self.agents[self._current_agent_index]
+                self._current_agent_index = (self._current_agent_index + 1) % len(self.agents)
+        return await agent.execute(task)
+
+
+async def measure(delegator: Any, agent_count: int, seconds: float, by_id: bool,
+                  seed: int) -> Dict[str, float]:
+    """Dispatch for ``seconds`` under churn and return operation rates."""
+    agents = [NoopAgent(f"agent-{i}") for i in range(agent_count)]
+    for agent in agents:
+        await delegator.register_agent(agent)
+    # The churned agent is never dispatched to by id, so lookups always hit.
+    stable = [agent.agent_id for agent in agents[1:]] or [agents[0].agent_id]
+    deadline = time.perf_counter() + seconds
+    counts = {"dispatches": 0, "churn": 0}
+
+    async def dispatch(worker: int) -> None:
+        rng = random.Random(seed + worker)
+        task = {"action": "noop"}
+        while time.perf_counter() < deadline:
+            for _ in range(100):
+                agent_id = rng.choice(stable) if by_id else None
+                await delegator.delegate(task, agent_id=agent_id)
+            counts["dispatches"] += 100
+            await asyncio.sleep(0)
+
+    async def churn() -> None:
+        churned = agents[0]
+        while time.perf_counter() < deadline:
+            await delegator.unregister_agent(churned.agent_id)
+            await delegator.register_agent(churned)
+            counts["churn"] += 1
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(churn(), *(dispatch(worker) for worker in range(DISPATCHERS)))
+    elapsed = time.perf_counter() - started
+    return {name: count / elapsed for name, count in counts.items()}
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark task dispatch under agent churn")
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 1_000, 100_000],
+                        help='Registered agent counts to measure')
+    parser.add_argument('--seconds', type=float, default=2.0,
+                        help='Duration of each measurement')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    print(f"{'agents':>8} {'mode':>11} {'delegator':>10} {'dispatch/s':>12} {'churn/s':>10}")
+    for agent_count in args.agents:
+        for by_id in (False, True):
+            mode = "by id" if by_id else "routed"
+            for name, factory in (("registry", TaskDelegator), ("legacy", LegacyDelegator)):
+                rates = asyncio.run(measure(factory(), agent_count, args.seconds, by_id,
+                                            args.seed))
+                print(f"{agent_count:>8,} {mode:>11} {name:>10} "
+                      f"{rates['dispatches']:>12,.0f} {rates['churn']:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+
+Measures the cold-start cost of ``cloud_agent_delegate`` and the ``src``
+package: each module is imported in fresh interpreters with
+``python -X importtime`` and the median cumulative import time is reported,
+together with the slowest modules it pulled in.
+
+Task handlers import their dependencies on first use, so importing
+``cloud_agent_delegate`` should not load ``asyncio``, the delegator, the
+review or test engines, workflows or the server. With ``--max-ms`` the
+benchmark exits with status 1 when a median exceeds the budget, so it can
+guard against cold-start regressions in CI.
+
+To run this benchmark:
+python -m benchmarks.bench_import
+
+With a budget:
+python -m benchmarks.bench_import --runs 15 --max-ms 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ['src', 'cloud_agent_delegate']
+
+
+def import_times(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns:
+        Tuple of (cumulative microseconds for ``module``, cumulative
+        microseconds per imported module)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    times: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times[module], times
+
+
+def measure(module: str, runs: int) -> Tuple[List[float], Dict[str, int]]:
+    """Return per-run milliseconds and the module times of the median run."""
+    samples = sorted((import_times(module) for _ in range(runs)), key=lambda sample: sample[0])
+    median = samples[len(samples) // 2]
+    return [total / 1000 for total, _ in samples], median[1]
+
+
+def main():
+    """Run the benchmark and print import times."""
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time")
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES,
+                        help='Modules to import')
+    parser.add_argument('--runs', type=int, default=9,
+                        help='Fresh interpreters per module')
+    parser.add_argument('--top', type=int, default=8,
+                        help='Slowest imported modules to list')
+    parser.add_argument('--max-ms', type=float,
+                        help='Fail if a median import time exceeds this many ms')
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        samples, times = measure(module, args.runs)
+        median = statistics.median(samples)
+        print(f"{module}: median {median:.1f} ms, min {samples[0]:.1f} ms "
+              f"({args.runs} runs)")
+        slowest = sorted((name for name in times if name != module),
+                         key=times.get, reverse=True)[:args.top]
+        for name in slowest:
+            print(f"    {times[name] / 1000:>7.1f} ms  {name}")
+        if args.max_ms is not None and median > args.max_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the {args.max_ms:g} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Delegation Server Benchmark
+
+Measures the per-task overhead of the long-running delegation server with
+no-op agents, so the numbers are the cost of accepting, queueing and
+answering a task rather than of running it:
+
+- ``submit``: ``DelegationServer.submit`` and ``wait`` in process (queue
+  and dispatch only)
+- ``http``: ``POST /api/delegate`` with ``"wait": true`` over keep-alive
+  connections, one request at a time per connection
+
+For comparison, ``python cloud_agent_delegate.py --task report`` pays for
+interpreter startup, imports and argument parsing on every task.
+
+To run this benchmark:
+python -m benchmarks.bench_server
+
+For a quick run:
+python -m benchmarks.bench_server --tasks 2000 --connections 1 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent.cloud_agent import CloudAgent
+from src.delegator import TaskDelegator, TaskScheduler
+from src.server import DelegationServer
+
+
+class NoopAgent(CloudAgent):
+    """Agent that returns immediately."""
+
+    async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "success"}
+
+    def health_check(self) -> bool:
+        return True
+
+
+async def start_server() -> DelegationServer:
+    delegator = TaskDelegator()
+    await delegator.register_agent(NoopAgent("noop"))
+    server = DelegationServer(TaskScheduler(delegator, max_queue=100_000))
+    await server.start()
+    return server
+
+
+async def measure_submit(tasks: int) -> List[float]:
+    """Return seconds per task for in-process submissions."""
+    server = await start_server()
+    latencies = []
+    try:
+        for n in range(tasks):
+            started = time.perf_counter()
+            await server.wait(await server.submit({"n": n}))
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await server.close()
+        await server.scheduler.stop()
+    return latencies
+
+
+async def measure_http(tasks: int, connections: int) -> List[float]:
+    """Return seconds per request over ``connections`` keep-alive connections."""
+    server = await start_server()
+    latencies: List[float] = []
+
+    async def client(count: int) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        body = json.dumps({"task": {"action": "noop"}, "wait": True}).encode()
+        request = (f"POST /api/delegate HTTP/1.1\r\nHost: bench\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+        for _ in range(count):
+            started = time.perf_counter()
+            writer.write(request)
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+        writer.close()
+
+    try:
+        await asyncio.gather(*(client(tasks // connections) for _ in range(connections)))
+    finally:
+        await server.close()
+        await server.scheduler.stop()
+    return latencies
+
+
+def report(mode: str, connections: int, latencies: List[float], elapsed: float) -> None:
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{mode:>7} {connections:>11} {len(latencies) / elapsed:>10,.0f} "
+          f"{statistics.median(latencies) * 1e6:>10,.0f} {p99 * 1e6:>10,.0f}")
+
+
+def main():
+    """Run the benchmark and print per-task overhead."""
+    parser = argparse.ArgumentParser(description="Benchmark delegation server overhead")
+    parser.add_argument('--tasks', type=int, default=20_000,
+                        help='Tasks per measurement')
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 8, 64],
+                        help='Concurrent HTTP connections to measure')
+    args = parser.parse_args()
+
+    print(f"{'mode':>7} {'connections':>11} {'tasks/s':>10} {'p50 us':>10} {'p99 us':>10}")
+    started = time.perf_counter()
+    latencies = asyncio.run(measure_submit(args.tasks))
+    report("submit", 0, latencies, time.perf_counter() - started)
+    for connections in args.connections:
+        started = time.perf_counter()
+        latencies = asyncio.run(measure_http(args.tasks, connections))
+        report("http", connections, latencies, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,15 +7,55 @@ It demonstrates how to structure task delegation, handle different operation typ
 and generate reports.
 """
 
-import argparse
 import json
 import os
 import sys
+import threading
+import time
 import zipfile
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, redirect_stdout
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import IO, TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.cache import ResultCache, cache_key, task_digest
+from src.config import AgentConfig
+from src.fs import (
+    ChangeSet,
+    FileEntry,
+    FileIndex,
+    FileIndexCache,
+    ZipFileSystem,
+    is_zip_archive,
+    scan_tree,
+)
+from src.handlers import HandlerError, HandlerRegistry
+
+# Modules used by only some tasks (asyncio, the delegator and agents, the
+# extractors, review and test engines, workflows and the server) are
+# imported by the handlers that need them, keeping startup cheap.
+if TYPE_CHECKING:
+    from src.delegator import TaskScheduler
+    from src.organize import FileClassifier
+    from src.workflow import Workflow, WorkflowResult
+
+
+# Maximum number of paths listed per change type in incremental results
+MAX_REPORTED_CHANGES = 1000
+
+# Task parameters with side effects; tasks using them are never served from cache
+SIDE_EFFECT_KWARGS = ('incremental', 'ndjson')
+# Task parameters that do not change the result, left out of cache keys
+RESULT_NEUTRAL_KWARGS = ('workers',)
+# Pools that can run tasks for delegate_task_async
+TASK_EXECUTORS = ('thread', 'process')
+
+# Endpoints of the delegation API, shared by the server and its clients
+CLOUD_CONFIG_PATH = "cloud-agent-config.json"
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8765
 
 
 class TaskType(Enum):
@@ -25,26 +65,113 @@ class TaskType(Enum):
     REVIEW = "review"
     TEST = "test"
     REPORT = "report"
+    WORKFLOW = "workflow"
+
+
+def _as_task_type(task: Union[TaskType, str]) -> Union[TaskType, str]:
+    """Return the ``TaskType`` of a built-in task name, other names unchanged."""
+    if isinstance(task, TaskType):
+        return task
+    try:
+        return TaskType(task)
+    except ValueError:
+        return task
+
+
+def _task_name(task: Union[TaskType, str]) -> str:
+    """Return the name of a task type or plugin task."""
+    return task.value if isinstance(task, TaskType) else task
 
 
 class CloudAgentDelegate:
     """Main delegation class for coordinating cloud agent tasks."""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, scan_workers: Optional[int] = None,
+                 task_executor: Optional[str] = None, task_workers: Optional[int] = None):
         """
         Initialize the cloud agent delegate.
         
         Args:
             config_path: Path to configuration file (optional)
+            scan_workers: Threads used to index directory trees (optional)
+            task_executor: Pool running ``delegate_task_async`` tasks,
+                ``thread`` or ``process`` (default: ``async_tasks.executor``)
+            task_workers: Size of that pool (default: ``async_tasks.workers``)
+            
+        Raises:
+            ValueError: If the task executor is unknown
         """
         self.config_path = config_path or "config/agent_config.yaml"
+        self.config = self._load_config(self.config_path)
         self.reports_dir = Path("reports")
         self.reports_dir.mkdir(exist_ok=True)
+        # Directory indexes shared by all handlers for the delegate's lifetime
+        self.file_index = FileIndexCache(workers=scan_workers)
+        self._classifier: Optional['FileClassifier'] = None
+        # Memoized results of idempotent tasks (None when disabled)
+        self.result_cache = ResultCache.from_config(self.config.get('result_cache'))
+        self._config_digest = task_digest(self.config.config)
+        # Pool for delegate_task_async, created on first use
+        async_tasks = self.config.get('async_tasks') or {}
+        self.task_executor = task_executor or async_tasks.get('executor', 'thread')
+        if self.task_executor not in TASK_EXECUTORS:
+            raise ValueError(f"Unknown task executor: {self.task_executor}")
+        self.task_workers = task_workers or async_tasks.get('workers')
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        # Task handlers by name: the built-in ones and configured plugins;
+        # installed plugins are looked up when an unknown task is asked for
+        self.handlers = HandlerRegistry()
+        for task_type in TaskType:
+            self.handlers.register(task_type.value,
+                                   getattr(CloudAgentDelegate, f"_handle_{task_type.value}"))
+        self.handlers.register_config(self.config.get('handlers'))
+    
+    @property
+    def classifier(self) -> 'FileClassifier':
+        """File classifier of the organize task, built on first use."""
+        if self._classifier is None:
+            from src.organize import FileClassifier
+            
+            self._classifier = FileClassifier.from_config(self.config.get_task_config('organize'))
+        return self._classifier
+    
+    @classifier.setter
+    def classifier(self, classifier: 'FileClassifier') -> None:
+        self._classifier = classifier
+    
+    @staticmethod
+    def _load_config(config_path: str) -> AgentConfig:
+        """
+        Load the agent configuration, falling back to defaults.
         
-    def delegate_task(self, task_type: TaskType, input_path: str, **kwargs) -> Dict:
+        Args:
+            config_path: Path to the YAML or JSON configuration file
+            
+        Returns:
+            Loaded configuration (empty if it could not be read)
+        """
+        try:
+            return AgentConfig(config_path)
+        except ImportError as e:
+            print(f"[CloudAgent] Warning: {e}; categories, retries, health checks, "
+                  f"scheduling, server and handler settings use their defaults "
+                  f"(pip install 'ymera[yaml]')", file=sys.stderr)
+            return AgentConfig()
+        
+    def delegate_task(self, task_type: Union[TaskType, str], input_path: str, **kwargs) -> Dict:
         """
         Delegate a task to the appropriate cloud agent.
         
+        Built-in tasks are named by ``TaskType``; tasks added by plugins
+        (see ``src.handlers``) are named by string.
+        
+        Successful results of the task types listed in ``result_cache.tasks``
+        are memoized, keyed by the task parameters, the configuration and a
+        fingerprint of the input; repeating the task on an unchanged input
+        returns the stored result without running it. A directory input is
+        revalidated once, and the fingerprint and the handler share that index.
+        
         Args:
             task_type: Type of task to perform
             input_path: Path to input file or directory
@@ -53,35 +180,239 @@ class CloudAgentDelegate:
         Returns:
             Dictionary containing task results
         """
-        print(f"[CloudAgent] Delegating {task_type.value} task...")
-        
-        # Filter kwargs based on task type
-        if task_type == TaskType.UNZIP:
-            valid_kwargs = {k: v for k, v in kwargs.items() if k in ['output_dir']}
-            return self._handle_unzip(input_path, **valid_kwargs)
-        elif task_type == TaskType.ORGANIZE:
-            return self._handle_organize(input_path, **kwargs)
-        elif task_type == TaskType.REVIEW:
-            return self._handle_review(input_path, **kwargs)
-        elif task_type == TaskType.TEST:
-            return self._handle_test(input_path, **kwargs)
-        elif task_type == TaskType.REPORT:
-            valid_kwargs = {k: v for k, v in kwargs.items() if k in ['format']}
-            return self._handle_report(input_path, **valid_kwargs)
-        else:
-            return {"status": "error", "message": f"Unknown task type: {task_type}"}
+        with self._pin_input(task_type, input_path, kwargs):
+            key, cached = self._cached_result(task_type, input_path, kwargs)
+            if cached is not None:
+                return cached
+            
+            print(f"[CloudAgent] Delegating {_task_name(task_type)} task...")
+            result = self._dispatch(task_type, input_path, **kwargs)
+            self._store_result(key, result, input_path)
+            return result
     
-    def _handle_unzip(self, zip_path: str, output_dir: Optional[str] = None) -> Dict:
+    def run_pipeline(self, task_types: List[Union[TaskType, str]], input_path: str,
+                     **kwargs) -> Dict:
         """
-        Handle file unzipping task.
+        Run several tasks in order in this process, feeding each the same tree.
+        
+        When the chain starts with ``unzip``, the later stages work on its
+        output directory. That directory is indexed once right after
+        extraction; every later stage reads the shared in-memory index,
+        which is revalidated with stat calls, instead of listing the tree
+        again. The chain stops at the first stage that ends with
+        an error, and a ``report`` stage records the timings of the stages
+        before it.
         
         Args:
-            zip_path: Path to zip file
+            task_types: Tasks to run, in order
+            input_path: Archive or directory the first stage reads
+            **kwargs: Task-specific parameters, passed to every stage
+            
+        Returns:
+            Dictionary with the result and timing of each stage
+        """
+        stages: List[Dict] = []
+        results: Dict[str, Dict] = {}
+        current_input = input_path
+        started = time.perf_counter()
+        for task_type in map(_as_task_type, task_types):
+            stage_kwargs = dict(kwargs)
+            if task_type == TaskType.REPORT:
+                stage_kwargs['stages'] = stages
+            stage_start = time.perf_counter()
+            result = self.delegate_task(task_type, current_input, **stage_kwargs)
+            if task_type == TaskType.UNZIP and result.get('status') == 'success':
+                current_input = result['output_dir']
+                # Index the extracted tree now so later stages share one scan
+                self.file_index.invalidate(current_input)
+                self.file_index.get(current_input)
+            stages.append({
+                "task": _task_name(task_type),
+                "status": result.get('status', 'unknown'),
+                "message": result.get('message'),
+                "seconds": round(time.perf_counter() - stage_start, 4),
+            })
+            results[_task_name(task_type)] = result
+            if result.get('status') == 'error':
+                break
+        
+        elapsed = time.perf_counter() - started
+        completed = len(stages) == len(task_types)
+        succeeded = completed and all(stage['status'] == 'success' for stage in stages)
+        return {
+            "status": "success" if succeeded else "error",
+            "message": f"Pipeline ran {len(stages)} of {len(task_types)} stages in {elapsed:.2f}s",
+            "stages": stages,
+            "total_seconds": round(elapsed, 4),
+            "results": results
+        }
+    
+    async def delegate_task_async(self, task_type: Union[TaskType, str], input_path: str,
+                                  **kwargs) -> Dict:
+        """
+        Delegate a task without blocking the event loop.
+        
+        Gives the same result as ``delegate_task``, but the handler runs on
+        the delegate's task pool, so many tasks can run at once from one
+        event loop. With the ``thread`` executor handlers share this
+        delegate's indexes and caches; with ``process`` each worker holds
+        its own delegate and ``kwargs`` must be picklable. Workflows run
+        their steps on the calling loop.
+        
+        Args:
+            task_type: Type of task to perform
+            input_path: Path to input file or directory
+            **kwargs: Additional task-specific parameters
+            
+        Returns:
+            Dictionary containing task results
+        """
+        import asyncio
+        
+        task_type = _as_task_type(task_type)
+        loop = asyncio.get_running_loop()
+        if task_type == TaskType.WORKFLOW:
+            workflow, error = await loop.run_in_executor(None, self._load_workflow, input_path)
+            if error is not None:
+                return error
+            print(f"[CloudAgent] Delegating {_task_name(task_type)} task...")
+            return self._workflow_summary(workflow, await self._run_workflow(workflow))
+        
+        executor = self._get_task_executor()
+        if self.task_executor == 'thread':
+            return await loop.run_in_executor(
+                executor, lambda: self.delegate_task(task_type, input_path, **kwargs))
+        
+        # Cache lookups stay in this process; only the handler crosses over.
+        # They run on the loop's default pool: fingerprinting waits on the
+        # scanning pool, so it must not occupy one of its threads.
+        key, cached = await loop.run_in_executor(
+            None, self._cached_result, task_type, input_path, kwargs)
+        if cached is not None:
+            return cached
+        print(f"[CloudAgent] Delegating {_task_name(task_type)} task...")
+        result = await loop.run_in_executor(
+            executor, run_worker_task, _task_name(task_type), input_path, kwargs)
+        await loop.run_in_executor(None, self._store_result, key, result, input_path)
+        return result
+    
+    def _get_task_executor(self) -> Executor:
+        """Create the pool for ``delegate_task_async`` on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                if self.task_executor == 'process':
+                    from concurrent.futures import ProcessPoolExecutor
+                    
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.task_workers or os.cpu_count() or 1,
+                        initializer=init_worker, initargs=(self.config_path,))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.task_workers,
+                                                        thread_name_prefix="delegate-task")
+            return self._executor
+    
+    def close(self) -> None:
+        """Shut down the task and scanning pools and close the result cache."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.file_index.close()
+        if self.result_cache is not None:
+            self.result_cache.close()
+    
+    def _cached_result(self, task_type: Union[TaskType, str], input_path: str,
+                       kwargs: Dict) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return the cache key of a task and its cached result, if any."""
+        key = self._result_cache_key(task_type, input_path, kwargs)
+        if key is None:
+            return None, None
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            print(f"[CloudAgent] Using cached {_task_name(task_type)} result")
+        return key, cached
+    
+    def _store_result(self, key: Optional[str], result: Dict, input_path: str) -> None:
+        """Cache a successful result under ``key``."""
+        if key is not None and result.get('status') == 'success':
+            self.result_cache.put(key, result, input_path)
+    
+    def _is_cacheable(self, task_type: Union[TaskType, str], kwargs: Dict) -> bool:
+        """Return True if the result of a task may be cached."""
+        if self.result_cache is None or _task_name(task_type) not in self.result_cache.actions:
+            return False
+        return not any(kwargs.get(name) for name in SIDE_EFFECT_KWARGS)
+    
+    def _pin_input(self, task_type: Union[TaskType, str], input_path: str,
+                   kwargs: Dict) -> ExitStack:
+        """Pin the index of a cacheable directory input for the duration of a task."""
+        stack = ExitStack()
+        if input_path and self._is_cacheable(task_type, kwargs) and os.path.isdir(input_path):
+            stack.enter_context(self.file_index.pinned(input_path))
+        return stack
+    
+    def _result_cache_key(self, task_type: Union[TaskType, str], input_path: str,
+                          kwargs: Dict) -> Optional[str]:
+        """Return the cache key of a task, or None if it must not be cached."""
+        if not self._is_cacheable(task_type, kwargs):
+            return None
+        name = _task_name(task_type)
+        params = {name: value for name, value in kwargs.items()
+                  if name not in RESULT_NEUTRAL_KWARGS}
+        params.update({"task": name, "config": self._config_digest,
+                       "input": os.path.abspath(input_path) if input_path else None})
+        # Fingerprint directories from the shared index the handler reads
+        entries = (self.file_index.get(input_path).iter_files()
+                   if input_path and os.path.isdir(input_path) else None)
+        return cache_key(params, input_path, entries)
+    
+    def _dispatch(self, task_type: Union[TaskType, str], input_path: str, **kwargs) -> Dict:
+        """Run a task with the handler registered for its name."""
+        name = _task_name(task_type)
+        try:
+            handler = self.handlers.get(name)
+        except HandlerError as e:
+            return {"status": "error", "message": str(e)}
+        if handler is None:
+            return {"status": "error", "message": f"Unknown task type: {name}"}
+        return handler(self, input_path, **kwargs)
+    
+    def _handle_unzip(self, zip_path: str, output_dir: Optional[str] = None,
+                      workers: Optional[int] = None, incremental: bool = False,
+                      **kwargs) -> Dict:
+        """
+        Handle archive extraction task.
+        
+        The backend is chosen from the archive's magic bytes. Zip members
+        are extracted in parallel and their CRC-32 checksums are verified in
+        the same pass; tar archives (plain, gzip, bzip2 or xz) are streamed
+        in a single decompress-and-write pass. ``tasks.unzip.max_file_size_mb``
+        from the configuration limits the uncompressed size of each member.
+        
+        In incremental mode a manifest of member CRCs and sizes is kept next
+        to ``output_dir``; only new or changed zip members are written and
+        members that disappeared from the archive are deleted.
+        
+        Args:
+            zip_path: Path to zip or tar archive
             output_dir: Output directory (default: extracted/)
+            workers: Number of zip extraction processes (default: CPU count)
+            incremental: Only apply changes since the previous extraction
+            **kwargs: Additional parameters
             
         Returns:
             Task result dictionary
         """
+        from src.archive import (
+            ArchiveError,
+            IncrementalZipExtractor,
+            TarExtractor,
+            ZipExtractor,
+            detect_archive_format,
+            formats,
+        )
+        from src.archive.common import megabytes_to_bytes
+        
         if not os.path.exists(zip_path):
             return {
                 "status": "error",
@@ -96,37 +427,122 @@ class CloudAgentDelegate:
                 "recommendation": "Please upload a valid zip file to proceed"
             }
         
+        archive_format = detect_archive_format(zip_path)
+        if archive_format is None:
+            return {
+                "status": "error",
+                "message": f"Invalid or corrupted archive (unrecognized format): {zip_path}"
+            }
+        if archive_format == formats.SEVEN_ZIP:
+            return {
+                "status": "error",
+                "message": f"7z archives are not supported: {zip_path}"
+            }
+        
         output_dir = output_dir or "extracted"
         os.makedirs(output_dir, exist_ok=True)
         
+        unzip_config = self.config.get_task_config('unzip')
+        max_member_bytes = megabytes_to_bytes(unzip_config.get('max_file_size_mb'))
+        
+        extra = {}
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(output_dir)
-                file_list = zip_ref.namelist()
+            if archive_format == formats.ZIP:
+                extractor = ZipExtractor(workers=workers, max_member_bytes=max_member_bytes)
+                if incremental:
+                    stats, extra["incremental"] = IncrementalZipExtractor(extractor).extract(
+                        zip_path, output_dir)
+                else:
+                    stats = extractor.extract(zip_path, output_dir)
+            else:
+                if incremental:
+                    extra["note"] = "Incremental mode requires zip CRCs; performed a full extraction"
+                extractor = TarExtractor(max_member_bytes=max_member_bytes)
+                stats = extractor.extract(zip_path, output_dir, archive_format)
+            
+            if stats.error_count:
+                return {
+                    "status": "error",
+                    "message": f"{stats.error_count} members failed extraction or CRC verification",
+                    "format": archive_format,
+                    "output_dir": output_dir,
+                    "extraction": stats.to_dict(),
+                    **extra
+                }
             
             return {
                 "status": "success",
-                "message": f"Extracted {len(file_list)} files to {output_dir}",
-                "files": file_list,
-                "output_dir": output_dir
+                "message": f"Extracted {stats.files} files to {output_dir}",
+                "format": archive_format,
+                "output_dir": output_dir,
+                # Plain tar has no checksums; compressed streams carry their own.
+                "crc_verified": archive_format != formats.TAR,
+                "extraction": stats.to_dict(),
+                **extra
             }
         except zipfile.BadZipFile:
             return {
                 "status": "error",
                 "message": f"Invalid or corrupted zip file: {zip_path}"
             }
+        except ArchiveError as e:
+            return {
+                "status": "error",
+                "message": f"{e}: {zip_path}"
+            }
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Failed to extract: {str(e)}"
             }
     
-    def _handle_organize(self, input_path: str, **kwargs) -> Dict:
+    @contextmanager
+    def _open_files(self, input_path: str) -> Iterator[Iterable[FileEntry]]:
+        """
+        Open a tree for iterating over its files.
+        
+        Directories go through the shared file index, which is built once
+        with ``os.scandir`` and revalidated on later calls by re-stating
+        its directories and files. Zip archives are read in place through a virtual filesystem
+        built from their central directory, so no extraction is needed.
+        
+        Args:
+            input_path: Directory or zip archive
+            
+        Yields:
+            An iterable of file entries (path, name, size, mtime)
+        """
+        if is_zip_archive(input_path):
+            with ZipFileSystem(input_path) as zip_fs:
+                yield zip_fs.iter_files()
+        else:
+            yield self.file_index.get(input_path).iter_files()
+    
+    def _handle_organize(self, input_path: str, incremental: bool = False,
+                         state_db: Optional[str] = None,
+                         ndjson: Optional[Union[str, IO[str]]] = None, **kwargs) -> Dict:
         """
         Handle file organization task.
         
+        Files are classified with the rules compiled from
+        ``tasks.organize.categories`` in the configuration.
+        
+        In incremental mode the classification state (path, size, mtime and
+        category) is kept in a SQLite database under ``reports/``. A re-run
+        only stats directories, reclassifies new or changed files and
+        reports what was added, removed or recategorised.
+        
+        In streaming mode (``ndjson``) files are classified as they are
+        discovered and written out as one JSON record per line; only the
+        category counts are kept and returned, so memory use does not grow
+        with the size of the tree.
+        
         Args:
-            input_path: Path to directory to organize
+            input_path: Path to directory or zip archive to organize
+            incremental: Reuse and update the persisted state (directories only)
+            state_db: State database path (default: reports/organize_state.sqlite)
+            ndjson: Stream records to this file path, ``-`` for stdout, or an
+                open text stream (optional)
             **kwargs: Additional parameters
             
         Returns:
@@ -138,32 +554,25 @@ class CloudAgentDelegate:
                 "message": f"Path not found: {input_path}"
             }
         
-        # Simple organization by file type
-        organized = {
-            "source_code": [],
-            "documentation": [],
-            "tests": [],
-            "configs": [],
-            "other": []
-        }
+        if incremental and os.path.isdir(input_path):
+            return self._organize_incremental(
+                input_path, state_db or str(self.reports_dir / "organize_state.sqlite"))
         
-        for root, dirs, files in os.walk(input_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_lower = file.lower()
-                ext = os.path.splitext(file)[1].lower()
-                
-                # Check for test files first (before checking source code extensions)
-                if any(pattern in file_lower for pattern in ['.test.', '.spec.', '_test.', '_spec.']):
-                    organized["tests"].append(file_path)
-                elif ext in ['.py', '.js', '.java', '.cpp', '.c', '.go', '.rs']:
-                    organized["source_code"].append(file_path)
-                elif ext in ['.md', '.txt', '.rst', '.pdf']:
-                    organized["documentation"].append(file_path)
-                elif ext in ['.yaml', '.yml', '.json', '.toml', '.ini']:
-                    organized["configs"].append(file_path)
-                else:
-                    organized["other"].append(file_path)
+        if ndjson is not None:
+            return self._organize_streaming(input_path, ndjson)
+        
+        organized = {category: [] for category in self.classifier.categories}
+        classify = self.classifier.classify
+        
+        try:
+            with self._open_files(input_path) as entries:
+                for entry in entries:
+                    organized[classify(entry.name)].append(entry.path)
+        except zipfile.BadZipFile:
+            return {
+                "status": "error",
+                "message": f"Invalid or corrupted zip file: {input_path}"
+            }
         
         total_files = sum(len(files) for files in organized.values())
         
@@ -174,55 +583,189 @@ class CloudAgentDelegate:
             "details": organized
         }
     
-    def _handle_review(self, input_path: str, **kwargs) -> Dict:
+    def _organize_streaming(self, input_path: str, ndjson: Union[str, IO[str]]) -> Dict:
+        """
+        Organize a tree as a generator pipeline, streaming records as NDJSON.
+        
+        Directories are walked lazily instead of through the cached index so
+        nothing proportional to the tree size is held in memory.
+        
+        Args:
+            input_path: Directory or zip archive to organize
+            ndjson: Output file path, ``-`` for stdout, or an open text stream
+            
+        Returns:
+            Task result dictionary with category counts only
+        """
+        from src.organize import classify_entries, write_ndjson
+        
+        with ExitStack() as stack:
+            if ndjson == "-":
+                out = sys.stdout
+            elif isinstance(ndjson, str):
+                out = stack.enter_context(open(ndjson, 'w', encoding='utf-8'))
+            else:
+                out = ndjson
+            
+            try:
+                if is_zip_archive(input_path):
+                    entries = stack.enter_context(ZipFileSystem(input_path)).iter_files()
+                else:
+                    entries = scan_tree(input_path)
+                counts = write_ndjson(classify_entries(entries, self.classifier), out,
+                                      self.classifier.categories)
+            except zipfile.BadZipFile:
+                return {
+                    "status": "error",
+                    "message": f"Invalid or corrupted zip file: {input_path}"
+                }
+        
+        total_files = sum(counts.values())
+        
+        result = {
+            "status": "success",
+            "message": f"Organized {total_files} files into categories",
+            "categories": counts
+        }
+        if isinstance(ndjson, str):
+            result["ndjson"] = ndjson
+        return result
+    
+    def _organize_incremental(self, input_path: str, state_db: str) -> Dict:
+        """
+        Organize a directory against persisted state, classifying only changes.
+        
+        Args:
+            input_path: Directory to organize
+            state_db: Path to the SQLite state database
+            
+        Returns:
+            Task result dictionary
+        """
+        from src.organize import OrganizeStateStore
+        
+        executor = self.file_index.executor
+        with OrganizeStateStore(state_db) as store:
+            index = store.load_index(input_path)
+            if index is None:
+                index = FileIndex.build(input_path, executor)
+                changes = ChangeSet()
+                changes.added = list(index.iter_files())
+            else:
+                changes = index.refresh(executor)
+            
+            previous = store.categories(input_path, changes.modified)
+            categories = {entry.path: self.classifier.classify(entry.name)
+                          for entry in changes.added + changes.modified}
+            recategorised = [
+                {"path": path, "from": previous[path], "to": category}
+                for path, category in categories.items()
+                if path in previous and previous[path] != category
+            ]
+            
+            # A new classifier invalidates every stored category.
+            if store.rules_fingerprint(input_path) not in (None, self.classifier.fingerprint):
+                for path, name, old_category in store.iter_files(input_path):
+                    if path in categories:
+                        continue
+                    category = self.classifier.classify(name)
+                    if category != old_category:
+                        categories[path] = category
+                        recategorised.append({"path": path, "from": old_category, "to": category})
+            
+            store.save(input_path, index, changes, categories, self.classifier.fingerprint)
+            counts = store.category_counts(input_path)
+        
+        category_counts = {name: counts.get(name, 0) for name in self.classifier.categories}
+        total_files = sum(category_counts.values())
+        change_count = len(changes.added) + len(changes.removed) + len(recategorised)
+        
+        return {
+            "status": "success",
+            "message": f"Organized {total_files} files into categories ({change_count} changes)",
+            "categories": category_counts,
+            "changes": {
+                "added": [e.path for e in changes.added[:MAX_REPORTED_CHANGES]],
+                "removed": [e.path for e in changes.removed[:MAX_REPORTED_CHANGES]],
+                "recategorised": recategorised[:MAX_REPORTED_CHANGES],
+                "counts": {
+                    "added": len(changes.added),
+                    "removed": len(changes.removed),
+                    "modified": len(changes.modified),
+                    "recategorised": len(recategorised)
+                }
+            },
+            "state_db": state_db
+        }
+    
+    def _handle_review(self, input_path: str, workers: Optional[int] = None,
+                       cache_db: Optional[str] = None, **kwargs) -> Dict:
         """
         Handle code review task.
         
+        Python files are parsed and checked on a process pool for the
+        categories in ``tasks.review.enabled_checks``. Findings are cached by
+        content hash, so unchanged files are never parsed again.
+        
         Args:
-            input_path: Path to code to review
+            input_path: Path to code (directory or zip archive) to review
+            workers: Number of analysis processes (default: CPU count)
+            cache_db: Result cache path (default: reports/review_cache.sqlite)
             **kwargs: Additional parameters
             
         Returns:
             Task result dictionary
         """
+        from src.review import ALL_CHECKS, ReviewCache, ReviewEngine
+        
         if not os.path.exists(input_path):
             return {
                 "status": "error",
                 "message": f"Path not found: {input_path}"
             }
         
-        review_results = {
-            "files_reviewed": 0,
-            "issues": [],
-            "suggestions": []
-        }
+        review_config = self.config.get_task_config('review')
+        checks = [check for check in review_config.get('enabled_checks') or ALL_CHECKS
+                  if check in ALL_CHECKS]
+        cache_db = cache_db or str(self.reports_dir / "review_cache.sqlite")
+        root = os.path.abspath(input_path)
         
-        # Simple file count and basic checks
-        for root, dirs, files in os.walk(input_path):
-            for file in files:
-                if file.endswith(('.py', '.js', '.java')):
-                    review_results["files_reviewed"] += 1
-        
-        # Placeholder suggestions
-        review_results["suggestions"].extend([
-            "Add unit tests for core functionality",
-            "Include API documentation",
-            "Add error handling for edge cases",
-            "Consider adding logging for debugging"
-        ])
+        try:
+            with ReviewCache(cache_db) as cache:
+                engine = ReviewEngine(checks, workers=workers, cache=cache)
+                if is_zip_archive(input_path):
+                    with ZipFileSystem(input_path) as zip_fs:
+                        report = engine.review(root, zip_fs.iter_files(), zip_fs.read_bytes)
+                else:
+                    index = self.file_index.get(input_path)
+                    report = engine.review(root, index.iter_files(),
+                                           io_executor=self.file_index.executor)
+        except zipfile.BadZipFile:
+            return {
+                "status": "error",
+                "message": f"Invalid or corrupted zip file: {input_path}"
+            }
         
+        review_results = report.to_dict()
         return {
             "status": "success",
-            "message": f"Reviewed {review_results['files_reviewed']} files",
+            "message": (f"Reviewed {review_results['files_reviewed']} files, "
+                        f"found {review_results['issue_count']} issues"),
             "review": review_results
         }
     
-    def _handle_test(self, input_path: str, **kwargs) -> Dict:
+    def _handle_test(self, input_path: str, workers: Optional[int] = None, **kwargs) -> Dict:
         """
         Handle testing task.
         
+        Collects the pytest suite under ``input_path`` and runs it as
+        parallel shards balanced by the file durations recorded on earlier
+        runs (reports/test_durations.json). The whole run is bounded by the
+        ``test_runner`` agent's timeout.
+        
         Args:
             input_path: Path to code to test
+            workers: Number of shards run at once (default: CPU count)
             **kwargs: Additional parameters
             
         Returns:
@@ -233,29 +776,62 @@ class CloudAgentDelegate:
                 "status": "error",
                 "message": f"Path not found: {input_path}"
             }
+        if not os.path.isdir(input_path):
+            return {
+                "status": "error",
+                "message": f"Tests can only be run from a directory: {input_path}"
+            }
         
-        test_results = {
-            "total_tests": 0,
-            "passed": 0,
-            "failed": 0,
-            "skipped": 0
-        }
+        from src.testing import DurationStore, ShardedTestRunner, TestRunnerError
         
-        # Placeholder test results
+        timeout = self.config.get_agent_config('test_runner').get('timeout')
+        durations = DurationStore(str(self.reports_dir / "test_durations.json"))
+        runner = ShardedTestRunner(workers=workers, timeout=timeout, durations=durations)
+        try:
+            report = runner.run(input_path)
+        except TestRunnerError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        
+        test_results = report.to_dict()
+        message = (f"Ran {report.total_tests} tests in {len(report.shards)} shards: "
+                   f"{report.passed} passed, {report.failed} failed, "
+                   f"{report.errors} errors, {report.skipped} skipped")
+        if not report.ok:
+            # Failing tests, and shards that crashed before reporting any,
+            # stop a chain or workflow like any other error
+            return {
+                "status": "error",
+                "message": message,
+                "details": {"failed": report.failed, "errors": report.errors,
+                            "failures": report.failures},
+                "test_results": test_results
+            }
+        if not report.shards:
+            return {
+                "status": "success",
+                "message": "Test execution completed",
+                "test_results": test_results,
+                "note": "No test files found. Please add tests to enable E2E testing."
+            }
         return {
             "status": "success",
-            "message": "Test execution completed",
-            "test_results": test_results,
-            "note": "No test files found. Please add tests to enable E2E testing."
+            "message": message,
+            "test_results": test_results
         }
     
-    def _handle_report(self, input_path: str, format: str = "detailed", **kwargs) -> Dict:
+    def _handle_report(self, input_path: str, format: str = "detailed",
+                       stages: Optional[List[Dict]] = None, **kwargs) -> Dict:
         """
         Handle report generation task.
         
         Args:
             input_path: Path to data for report
             format: Report format (basic/detailed)
+            stages: Status and timing of the pipeline stages run before
+                the report (optional)
             **kwargs: Additional parameters
             
         Returns:
@@ -270,6 +846,9 @@ class CloudAgentDelegate:
             "summary": "Cloud agent delegation report",
             "status": "completed"
         }
+        if stages is not None:
+            report_data["stages"] = list(stages)
+            report_data["total_seconds"] = round(sum(stage['seconds'] for stage in stages), 4)
         
         with open(report_file, 'w') as f:
             json.dump(report_data, f, indent=2)
@@ -281,9 +860,320 @@ class CloudAgentDelegate:
             "report_data": report_data
         }
 
+    def _handle_workflow(self, input_path: str, **kwargs) -> Dict:
+        """
+        Handle workflow task.
+        
+        Loads the ``workflow`` of a task file, derives step dependencies from
+        their input/output paths and runs the steps through a
+        ``TaskDelegator``, one local agent per configured agent, with
+        independent steps running concurrently.
+        
+        Args:
+            input_path: Path to the JSON task file
+            **kwargs: Additional parameters
+            
+        Returns:
+            Task result dictionary
+        """
+        import asyncio
+        
+        workflow, error = self._load_workflow(input_path)
+        if error is not None:
+            return error
+        return self._workflow_summary(workflow, asyncio.run(self._run_workflow(workflow)))
+    
+    @staticmethod
+    def _load_workflow(input_path: str) -> Tuple[Optional['Workflow'], Optional[Dict]]:
+        """Load the workflow of a task file, or return the error result."""
+        from src.workflow import Workflow
+        
+        if not os.path.isfile(input_path):
+            return None, {
+                "status": "error",
+                "message": f"Task file not found: {input_path}"
+            }
+        try:
+            return Workflow.load(input_path), None
+        except (OSError, ValueError, TypeError) as e:
+            return None, {
+                "status": "error",
+                "message": f"Invalid workflow in {input_path}: {e}"
+            }
+    
+    @staticmethod
+    def _workflow_summary(workflow: 'Workflow', result: 'WorkflowResult') -> Dict:
+        """Build the task result of a finished workflow."""
+        failed = [step.step.step_id for step in result.steps if not step.succeeded]
+        return {
+            "status": "success" if result.succeeded else "error",
+            "message": (f"Workflow {workflow.workflow_id} completed in {result.wall_time:.2f}s "
+                        f"(critical path {result.critical_path_time:.2f}s)" if not failed else
+                        f"Workflow {workflow.workflow_id} failed at steps {failed}"),
+            "workflow": result.to_dict()
+        }
+    
+    async def _run_workflow(self, workflow: 'Workflow') -> 'WorkflowResult':
+        """Register a local agent per configured agent and run ``workflow``."""
+        from src.workflow import WorkflowExecutor
+        
+        scheduler = await self._start_scheduler()
+        try:
+            return await WorkflowExecutor(scheduler.delegator, scheduler).run(workflow)
+        finally:
+            await self._stop_scheduler(scheduler)
+    
+    async def serve(self, host: Optional[str] = None, port: Optional[int] = None,
+                    on_start=None) -> None:
+        """
+        Serve the delegation API until cancelled.
+        
+        Tasks are run the way workflow steps are, by one local agent per
+        configured agent, with the agents, indexes and caches kept warm
+        between tasks. The endpoints come from ``cloud-agent-config.json``
+        and the address and result retention from the ``server`` section.
+        
+        Args:
+            host: Interface to bind (default: ``server.host``)
+            port: Port to bind (default: ``server.port``; 0 picks a free one)
+            on_start: Called with the ``DelegationServer`` once it listens
+        """
+        from src.server import DelegationServer
+        
+        settings = self.config.get('server') or {}
+        scheduler = await self._start_scheduler()
+        server = DelegationServer(
+            scheduler,
+            endpoints=load_cloud_config().get('endpoints'),
+            max_results=int(settings.get('max_results', 10000)),
+        )
+        try:
+            await server.start(host or settings.get('host', DEFAULT_SERVER_HOST),
+                               port if port is not None
+                               else int(settings.get('port', DEFAULT_SERVER_PORT)))
+            print(f"[CloudAgent] Serving the delegation API on port {server.port}")
+            if on_start is not None:
+                on_start(server)
+            await server.serve_forever()
+        finally:
+            await server.close()
+            await self._stop_scheduler(scheduler)
+    
+    async def _start_scheduler(self) -> 'TaskScheduler':
+        """Build a delegator with a local agent per configured agent, behind a scheduler."""
+        from src.delegator import (HealthMonitor, HedgePolicy, RetryPolicy, TaskDelegator,
+                                   TaskScheduler)
+        
+        routing = self.config.get('routing') or {}
+        settings = load_cloud_config().get('settings') or {}
+        delegator = TaskDelegator(
+            strategy=routing.get('strategy', 'round_robin'),
+            retry_policy=RetryPolicy.from_config(self.config.get('retry_policy'), settings),
+            hedge_policy=HedgePolicy.from_config(self.config.get('hedging')),
+            default_timeout=routing.get('default_timeout', settings.get('timeout')),
+            health_monitor=HealthMonitor.from_config(self.config.get('health')),
+        )
+        agents = self.config.get('agents', {}) or {}
+        for agent_id, agent_config in agents.items():
+            await delegator.register_agent(self._local_agent(agent_id, agent_config))
+        if not agents:
+            await delegator.register_agent(self._local_agent("local", {}))
+        scheduler = TaskScheduler.from_config(delegator, self.config.get('scheduling'), settings)
+        if delegator.health_monitor is not None:
+            delegator.health_monitor.start()
+        return scheduler
+    
+    @staticmethod
+    async def _stop_scheduler(scheduler: 'TaskScheduler') -> None:
+        """Stop a scheduler from ``_start_scheduler`` and release its agents."""
+        from src.agent import LocalProcessAgent
+        
+        delegator = scheduler.delegator
+        await scheduler.stop()
+        if delegator.health_monitor is not None:
+            await delegator.health_monitor.stop()
+        for agent in delegator.agents:
+            if isinstance(agent, LocalProcessAgent):
+                agent.close()
+    
+    def _local_agent(self, agent_id: str, agent_config: Dict):
+        """
+        Create the agent that runs workflow steps for a configured agent.
+        
+        With ``routing.local_agent: process`` each agent gets a warm process
+        pool sized from its ``memory`` setting, with workers holding their
+        own delegate; otherwise steps run on threads of this process.
+        """
+        from src.agent import LocalAgent, LocalProcessAgent
+        
+        routing = self.config.get('routing') or {}
+        if routing.get('local_agent') == 'process':
+            return LocalProcessAgent(agent_id, run_worker_step, agent_config,
+                                     initializer=init_worker, initargs=(self.config_path,))
+        return LocalAgent(agent_id, self._run_step, agent_config)
+    
+    def _run_step(self, task: Dict) -> Dict:
+        """
+        Execute one workflow step as a task of this delegate.
+        
+        Unzip steps extract into the step's output; other steps whose output
+        is a ``.json`` file have their result written there.
+        """
+        task_type = _as_task_type(task['action'])
+        if _task_name(task_type) not in self.handlers:
+            return {"status": "error", "message": f"Unknown action: {task['action']}"}
+        output = task.get('output')
+        kwargs = {key: value for key, value in task.items()
+                  if key not in ('step', 'action', 'input', 'output', 'agent', 'priority')}
+        if task_type == TaskType.UNZIP and output:
+            kwargs['output_dir'] = output
+        
+        result = self.delegate_task(task_type, task.get('input'), **kwargs)
+        if output and output.endswith('.json') and task_type != TaskType.UNZIP:
+            parent = os.path.dirname(output)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            with open(output, 'w') as f:
+                json.dump(result, f, indent=2)
+        return result
+    
+
+# Delegate of a worker process, built once by ``init_worker``
+_worker_delegate: Optional[CloudAgentDelegate] = None
+
+
+def init_worker(config_path: Optional[str] = None) -> None:
+    """Build the delegate a ``LocalProcessAgent`` worker runs steps with."""
+    global _worker_delegate
+    _worker_delegate = CloudAgentDelegate(config_path)
+
+
+def run_worker_step(task: Dict) -> Dict:
+    """Run one workflow step in a ``LocalProcessAgent`` worker."""
+    if _worker_delegate is None:
+        init_worker()
+    return _worker_delegate._run_step(task)
+
+
+def run_worker_task(task_type: str, input_path: str, kwargs: Dict) -> Dict:
+    """Run a task's handler in a ``delegate_task_async`` worker process."""
+    if _worker_delegate is None:
+        init_worker()
+    return _worker_delegate._dispatch(task_type, input_path, **kwargs)
+
+
+def load_cloud_config(path: str = CLOUD_CONFIG_PATH) -> Dict:
+    """Return the ``cloudAgent`` section of ``cloud-agent-config.json``, if readable."""
+    try:
+        with open(path) as f:
+            return json.load(f).get('cloudAgent', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _serve_main(argv: List[str]) -> None:
+    """Run the ``serve`` subcommand: keep a delegate warm behind the delegation API."""
+    import argparse
+    import asyncio
+    import signal
+    
+    parser = argparse.ArgumentParser(
+        prog="cloud_agent_delegate.py serve",
+        description="Serve the delegation API from a long-running process"
+    )
+    parser.add_argument('--host', type=str, help='Interface to bind (default: server.host)')
+    parser.add_argument('--port', type=int, help='Port to bind (default: server.port)')
+    parser.add_argument('--config', type=str, help='Path to configuration file')
+    args = parser.parse_args(argv)
+    
+    delegate = CloudAgentDelegate(config_path=args.config)
+    
+    async def serve() -> None:
+        # SIGTERM stops the server like Ctrl-C, running the same cleanup
+        current = asyncio.current_task()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, current.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+        await delegate.serve(args.host, args.port)
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        delegate.close()
+
+
+def _submit_main(argv: List[str]) -> None:
+    """Run the ``submit`` subcommand: send one task to a running server."""
+    import argparse
+    import asyncio
+    from src.agent import HttpAgent
+    
+    parser = argparse.ArgumentParser(
+        prog="cloud_agent_delegate.py submit",
+        description="Submit a task to a running delegation server and print its result"
+    )
+    parser.add_argument('--task', type=str, required=True,
+                        help='Task type to delegate (built-in or provided by a plugin)')
+    parser.add_argument('--input', type=str, default='YmeraRefactor.zip',
+                        help='Input file or directory path')
+    parser.add_argument('--output', type=str, help='Output path of the task')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--format', type=str, choices=['basic', 'detailed'],
+                        help='Report format (for report task)')
+    parser.add_argument('--priority', type=str, choices=['high', 'normal', 'low'],
+                        help='Scheduling priority')
+    parser.add_argument('--agent', type=str, default='cli',
+                        help='Configured agent to run the task on (default: routed)')
+    parser.add_argument('--url', type=str,
+                        help='Server URL (default: from the server config section)')
+    parser.add_argument('--config', type=str, help='Path to configuration file')
+    args = parser.parse_args(argv)
+    
+    # Paths are resolved by the server, which may run in another directory
+    task = {"action": args.task, "input": os.path.abspath(args.input)}
+    if args.output:
+        task["output"] = os.path.abspath(args.output)
+    for name in ('workers', 'format', 'priority'):
+        if getattr(args, name):
+            task[name] = getattr(args, name)
+    
+    url = args.url
+    if not url:
+        config = CloudAgentDelegate._load_config(args.config or "config/agent_config.yaml")
+        settings = config.get('server') or {}
+        url = (f"http://{settings.get('host', DEFAULT_SERVER_HOST)}:"
+               f"{settings.get('port', DEFAULT_SERVER_PORT)}")
+    agent = HttpAgent.from_config(args.agent, url, {"cloudAgent": load_cloud_config()},
+                                  max_connections=1, request_timeout=None,
+                                  wait_for_result=True)
+    try:
+        result = asyncio.run(agent.execute(task))
+    except OSError as e:
+        print(f"[CloudAgent] Cannot reach the server at {url}: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        agent.close()
+    
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result.get('status') == 'success' else 1)
+
+
+def _parse_tasks(value: str) -> List[Union[TaskType, str]]:
+    """Parse a ``--task`` value: one task name or a comma-separated chain."""
+    return [_as_task_type(name.strip()) for name in value.split(',')]
+
 
 def main():
     """Main entry point for the cloud agent delegation script."""
+    if sys.argv[1:2] == ['serve']:
+        return _serve_main(sys.argv[2:])
+    if sys.argv[1:2] == ['submit']:
+        return _submit_main(sys.argv[2:])
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Cloud Agent Delegation Framework",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -294,15 +1184,20 @@ Examples:
   %(prog)s --task review --input extracted/
   %(prog)s --task test --input extracted/
   %(prog)s --task report --format detailed
+  %(prog)s --task workflow --input tasks/example_task.json
+  %(prog)s --task unzip,organize,review,test,report --input YmeraRefactor.zip
+  %(prog)s serve --port 8765
+  %(prog)s submit --task review --input extracted/
         """
     )
     
     parser.add_argument(
         '--task',
-        type=str,
+        type=_parse_tasks,
         required=True,
-        choices=['unzip', 'organize', 'review', 'test', 'report'],
-        help='Task type to delegate'
+        metavar='TASK[,TASK...]',
+        help=('Task type to delegate (unzip, organize, review, test, report, workflow, '
+              'or one added by a plugin), or a comma-separated chain run in one process')
     )
     
     parser.add_argument(
@@ -312,6 +1207,31 @@ Examples:
         help='Input file or directory path'
     )
     
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Output directory (for unzip task)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of worker processes (for unzip, review and test tasks)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only process changes since the previous run (for unzip and organize tasks)'
+    )
+    
+    parser.add_argument(
+        '--ndjson',
+        type=str,
+        metavar='PATH',
+        help="Stream organize records as NDJSON to PATH ('-' for stdout)"
+    )
+    
     parser.add_argument(
         '--format',
         type=str,
@@ -326,28 +1246,59 @@ Examples:
         help='Path to configuration file'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Run the task even if a cached result exists'
+    )
+    
     args = parser.parse_args()
     
     # Initialize delegate
     delegate = CloudAgentDelegate(config_path=args.config)
+    if args.no_cache:
+        delegate.result_cache = None
     
-    # Map task string to TaskType enum
-    task_type = TaskType(args.task)
+    task_types = args.task
+    unknown = [name for name in map(_task_name, task_types) if name not in delegate.handlers]
+    if unknown:
+        parser.error(f"argument --task: unknown task {', '.join(unknown)} "
+                     f"(choose from {', '.join(delegate.handlers.names())})")
     
     # Execute task
-    result = delegate.delegate_task(
-        task_type,
-        args.input,
-        format=args.format
-    )
+    task_kwargs = {'format': args.format}
+    if args.output:
+        task_kwargs['output_dir'] = args.output
+    if args.workers:
+        task_kwargs['workers'] = args.workers
+    if args.incremental:
+        task_kwargs['incremental'] = True
     
-    # Print results
-    print("\n" + "="*60)
-    print(f"Task: {task_type.value.upper()}")
-    print(f"Status: {result.get('status', 'unknown').upper()}")
-    print("="*60)
-    print(json.dumps(result, indent=2))
-    print("="*60 + "\n")
+    # When records stream to stdout, everything else goes to stderr
+    summary_stream = sys.stdout
+    if args.ndjson == '-':
+        task_kwargs['ndjson'] = sys.stdout
+        summary_stream = sys.stderr
+    elif args.ndjson:
+        task_kwargs['ndjson'] = args.ndjson
+    
+    with redirect_stdout(summary_stream):
+        if len(task_types) == 1:
+            result = delegate.delegate_task(
+                task_types[0],
+                args.input,
+                **task_kwargs
+            )
+        else:
+            result = delegate.run_pipeline(task_types, args.input, **task_kwargs)
+        
+        # Print results
+        print("\n" + "="*60)
+        print(f"Task: {','.join(_task_name(task_type) for task_type in task_types).upper()}")
+        print(f"Status: {result.get('status', 'unknown').upper()}")
+        print("="*60)
+        print(json.dumps(result, indent=2))
+        print("="*60 + "\n")
     
     # Exit with appropriate code
     sys.exit(0 if result.get('status') == 'success' else 1)
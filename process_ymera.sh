@@ -63,13 +63,8 @@ validate_zip() {
     
     log_success "Zip file validated (${FILE_SIZE} bytes)"
     
-    # Test zip integrity
-    if ! unzip -t "$ZIP_FILE" > /dev/null 2>&1; then
-        log_error "Zip file is corrupted or invalid!"
-        exit 1
-    fi
-    
-    log_success "Zip file integrity verified"
+    # Integrity (CRC-32) is verified during extraction, so the archive
+    # is only read once.
 }
 
 ################################################################################
@@ -86,11 +81,15 @@ extract_contents() {
     
     mkdir -p "$EXTRACT_DIR"
     
-    # Extract zip file
-    unzip -q "$ZIP_FILE" -d "$EXTRACT_DIR"
+    # Extract in parallel, verifying CRCs in the same pass
+    if ! python3 "$SCRIPT_DIR/cloud_agent_delegate.py" --task unzip \
+            --input "$ZIP_FILE" --output "$EXTRACT_DIR" > "$SCRIPT_DIR/extraction_result.txt"; then
+        log_error "Zip file is corrupted or invalid! See extraction_result.txt"
+        exit 1
+    fi
     
     local FILE_COUNT=$(find "$EXTRACT_DIR" -type f | wc -l)
-    log_success "Extracted $FILE_COUNT files to $EXTRACT_DIR"
+    log_success "Extracted and verified $FILE_COUNT files to $EXTRACT_DIR"
 }
 
 ################################################################################
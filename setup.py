@@ -13,7 +13,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/ymera-mansour/ymera",
-    packages=find_packages(exclude=['examples*', 'tests*']),
+    packages=find_packages(exclude=['examples*', 'tests*', 'benchmarks*']),
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -27,4 +27,8 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[],
+    extras_require={
+        # Reads config/agent_config.yaml; without it defaults are used
+        "yaml": ["pyyaml>=6.0"],
+    },
 )
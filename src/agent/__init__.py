@@ -1,5 +1,9 @@
 """Cloud Agent module"""
 
 from .cloud_agent import CloudAgent
+from .http_agent import ConnectionPool, HttpAgent, HttpAgentError
+from .local_agent import LocalAgent
+from .local_process_agent import LocalProcessAgent, WorkerTimeoutError, pool_size
 
-__all__ = ['CloudAgent']
+__all__ = ['CloudAgent', 'ConnectionPool', 'HttpAgent', 'HttpAgentError', 'LocalAgent',
+           'LocalProcessAgent', 'WorkerTimeoutError', 'pool_size']
@@ -11,6 +11,11 @@ from typing import Any, Dict, Optional
 class CloudAgent(ABC):
     """Abstract base class for cloud agents."""
     
+    # Whether cancelling ``execute`` stops the work. Agents whose work goes
+    # on after cancellation (threads, worker processes, remote services) set
+    # this to False, and the delegator does not retry their timed-out tasks.
+    cancellable = True
+    
     def __init__(self, agent_id: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialize a cloud agent.
@@ -27,6 +32,10 @@ class CloudAgent(ABC):
         """
         Execute a task on the cloud agent.
         
+        The delegator cancels this coroutine when the task's deadline passes
+        or a hedged copy wins; implementations should release resources on
+        ``asyncio.CancelledError`` and let it propagate.
+        
         Args:
             task: Task specification dictionary
             
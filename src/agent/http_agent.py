@@ -0,0 +1,321 @@
+"""
+HTTP Agent
+
+A cloud agent that delegates tasks to a remote service through the
+endpoints declared in ``cloud-agent-config.json``:
+
+- ``POST /api/delegate`` with ``{"agent_id", "task"}`` submits a task and
+  answers ``{"task_id"}``, or ``{"task_id", "result"}`` when it finished
+  right away
+- ``POST /api/results`` with ``{"task_ids": [...]}`` answers
+  ``{"results": {task_id: result or null}}`` for many tasks at once
+- ``GET /api/status`` answers 200 while the service is up
+
+With ``wait_for_result`` the agent asks the service to answer
+``/api/delegate`` only once the task has finished, instead of polling.
+
+Requests go through a pool of keep-alive connections capped per host, so
+concurrent tasks reuse a few sockets instead of opening one each. Request
+bodies above ``compress_threshold`` bytes are sent gzip-compressed and gzip
+responses are accepted. Submitted tasks wait on a single poller that asks
+``/api/results`` about all of them in one request per ``poll_interval``.
+
+Only the standard library is used; blocking ``http.client`` calls run on a
+thread per connection.
+"""
+
+import asyncio
+import gzip
+import http.client
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .cloud_agent import CloudAgent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINTS = {
+    "delegation": "/api/delegate",
+    "status": "/api/status",
+    "results": "/api/results",
+}
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_COMPRESS_THRESHOLD = 1024
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_REQUEST_TIMEOUT = 30.0
+# Task ids per /api/results request
+RESULTS_BATCH_SIZE = 500
+# Consecutive failed polls after which waiting tasks fail
+MAX_POLL_FAILURES = 5
+
+
+class HttpAgentError(Exception):
+    """Raised when the remote service answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections to one host, at most ``max_connections`` open."""
+
+    def __init__(self, base_url: str, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT):
+        """
+        Initialize the pool.
+
+        Args:
+            base_url: ``http://`` or ``https://`` URL of the service
+            max_connections: Connections open to the host at once
+            timeout: Socket timeout per request in seconds (None waits
+                indefinitely)
+
+        Raises:
+            ValueError: If the URL scheme is not HTTP(S)
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self._idle: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self.opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = (http.client.HTTPSConnection if self.scheme == 'https'
+                            else http.client.HTTPConnection)
+        self.opened += 1
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a request on an idle connection, or a new one if none is idle.
+
+        Blocks while ``max_connections`` requests are in progress. A reused
+        connection the server already closed is replaced and the request
+        sent once more.
+
+        Returns:
+            Tuple of (status, lower-cased headers, body)
+        """
+        with self._slots:
+            try:
+                connection, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                connection, reused = self._connect(), False
+            try:
+                try:
+                    response = self._send(connection, method, path, body, headers)
+                except (http.client.RemoteDisconnected, ConnectionResetError,
+                        BrokenPipeError):
+                    if not reused:
+                        raise
+                    connection.close()
+                    connection = self._connect()
+                    response = self._send(connection, method, path, body, headers)
+            except Exception:
+                connection.close()
+                raise
+            status, response_headers, data, will_close = response
+            if will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return status, response_headers, data
+
+    def _send(self, connection: http.client.HTTPConnection, method: str, path: str,
+              body: Optional[bytes], headers: Optional[Dict[str, str]]):
+        connection.request(method, self.prefix + path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, response_headers, data, response.will_close
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpAgent(CloudAgent):
+    """Delegates tasks to a remote service over pooled HTTP connections."""
+
+    # The remote service keeps running a task whose call was cancelled
+    cancellable = False
+
+    def __init__(self, agent_id: str, base_url: str, config: Optional[Dict[str, Any]] = None,
+                 endpoints: Optional[Dict[str, str]] = None,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 request_timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+                 pool: Optional[ConnectionPool] = None, wait_for_result: bool = False):
+        """
+        Initialize an HTTP agent.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            base_url: URL of the service the endpoints are relative to
+            config: Agent configuration (``capabilities``, ``timeout``)
+            endpoints: ``delegation``, ``status`` and ``results`` paths
+            max_connections: Connections open to the host at once
+            compress_threshold: Request bodies larger than this many bytes
+                are gzip-compressed
+            poll_interval: Seconds between bulk result requests
+            request_timeout: Socket timeout per request in seconds
+            pool: Connection pool to share with other agents on the same host
+            wait_for_result: Have the service answer the submission with the
+                result, for services that support ``"wait": true``
+        """
+        super().__init__(agent_id, config)
+        self.base_url = base_url
+        self.endpoints = dict(DEFAULT_ENDPOINTS, **(endpoints or {}))
+        self.compress_threshold = compress_threshold
+        self.poll_interval = poll_interval
+        self.wait_for_result = wait_for_result
+        self.pool = pool or ConnectionPool(base_url, max_connections, request_timeout)
+        # One thread per connection; more would only queue on the pool.
+        self._executor = ThreadPoolExecutor(max_workers=self.pool.max_connections,
+                                            thread_name_prefix=f"http-{agent_id}")
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self.requests = 0
+        self.result_requests = 0
+
+    @classmethod
+    def from_config(cls, agent_id: str, base_url: str, cloud_config: Dict[str, Any],
+                    **kwargs) -> 'HttpAgent':
+        """
+        Build an agent from the contents of ``cloud-agent-config.json``.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            base_url: URL of the service
+            cloud_config: Parsed configuration (``cloudAgent`` section)
+            **kwargs: Further ``HttpAgent`` arguments
+        """
+        section = cloud_config.get('cloudAgent', cloud_config)
+        settings = section.get('settings', {})
+        config = {"capabilities": section.get('capabilities', [])}
+        if settings.get('timeout'):
+            config["timeout"] = settings['timeout']
+        return cls(agent_id, base_url, config, endpoints=section.get('endpoints'), **kwargs)
+
+    def _call(self, method: str, path: str, payload: Optional[Any] = None) -> Any:
+        """Send a JSON request and decode the JSON answer (blocking)."""
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+            headers["Content-Type"] = "application/json"
+            if len(body) > self.compress_threshold:
+                body = gzip.compress(body, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+        status, response_headers, data = self.pool.request(method, path, body, headers)
+        self.requests += 1
+        if response_headers.get('content-encoding') == 'gzip':
+            data = gzip.decompress(data)
+        if status >= 400:
+            raise HttpAgentError(status, data.decode('utf-8', 'replace')[:200])
+        return json.loads(data) if data else {}
+
+    async def _request(self, method: str, path: str, payload: Optional[Any] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, method, path, payload)
+
+    async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit ``task`` to the service and wait for its result.
+
+        Args:
+            task: Task specification dictionary
+
+        Returns:
+            Result dictionary reported by the service
+
+        Raises:
+            HttpAgentError: If the service rejects the task
+            OSError: If the service cannot be reached
+        """
+        payload = {"agent_id": self.agent_id, "task": task}
+        if self.wait_for_result:
+            payload["wait"] = True
+        answer = await self._request('POST', self.endpoints['delegation'], payload)
+        if answer.get('result') is not None:
+            return answer['result']
+        task_id = str(answer['task_id'])
+        future = asyncio.get_running_loop().create_future()
+        self._pending[task_id] = future
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        try:
+            return await future
+        finally:
+            self._pending.pop(task_id, None)
+
+    async def _poll(self) -> None:
+        """Fetch the results of all pending tasks in bulk until none are left."""
+        failures = 0
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            task_ids = list(self._pending)
+            try:
+                for start in range(0, len(task_ids), RESULTS_BATCH_SIZE):
+                    batch = task_ids[start:start + RESULTS_BATCH_SIZE]
+                    answer = await self._request('POST', self.endpoints['results'],
+                                                 {"task_ids": batch})
+                    self.result_requests += 1
+                    self._resolve(answer.get('results') or {})
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning("Fetching results from %s failed (%d): %s",
+                               self.base_url, failures, e)
+                if failures >= MAX_POLL_FAILURES:
+                    self._fail_pending(e)
+
+    def _resolve(self, results: Dict[str, Any]) -> None:
+        for task_id, result in results.items():
+            future = self._pending.get(task_id)
+            if result is not None and future is not None and not future.done():
+                future.set_result(result)
+
+    def _fail_pending(self, error: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def health_check(self) -> bool:
+        """Return True if the service answers on its status endpoint."""
+        try:
+            self._call('GET', self.endpoints['status'])
+            return True
+        except (OSError, HttpAgentError, ValueError) as e:
+            logger.warning("Agent %s is unreachable: %s", self.agent_id, e)
+            return False
+
+    def get_capabilities(self) -> Dict[str, Any]:
+        """Describe the agent, including its service URL."""
+        capabilities = super().get_capabilities()
+        capabilities["base_url"] = self.base_url
+        return capabilities
+
+    def close(self) -> None:
+        """Close pooled connections and the request threads."""
+        self._executor.shutdown(wait=False)
+        self.pool.close()
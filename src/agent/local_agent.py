@@ -0,0 +1,59 @@
+"""
+Local Agent
+
+A cloud agent that runs tasks in this process by calling a handler on a
+worker thread, so blocking handlers do not stall the event loop and several
+tasks can run at once.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional
+
+from .cloud_agent import CloudAgent
+
+TaskHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class LocalAgent(CloudAgent):
+    """Executes tasks in-process through a blocking handler."""
+    
+    # A handler thread cannot be interrupted
+    cancellable = False
+    
+    def __init__(self, agent_id: str, handler: TaskHandler,
+                 config: Optional[Dict[str, Any]] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Initialize a local agent.
+        
+        Args:
+            agent_id: Unique identifier for the agent
+            handler: Called with the task dictionary, returns the result
+            config: Optional configuration dictionary
+            executor: Thread pool to run the handler on (default: the loop's)
+        """
+        super().__init__(agent_id, config)
+        self.handler = handler
+        self.executor = executor
+    
+    async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the handler for ``task`` on a worker thread.
+        
+        If this coroutine is cancelled, e.g. at the task's deadline, it
+        returns immediately; the thread cannot be interrupted, so the handler
+        runs to completion in the background and its result is discarded.
+        
+        Args:
+            task: Task specification dictionary
+            
+        Returns:
+            Result dictionary returned by the handler
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.handler, task)
+    
+    def health_check(self) -> bool:
+        """Local agents are always available."""
+        return True
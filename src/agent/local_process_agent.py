@@ -0,0 +1,167 @@
+"""
+Local Process Agent
+
+A cloud agent that runs tasks on a warm pool of worker processes on this
+host, so delegated work uses every core without any cloud provider.
+
+Only the task dictionary and a reference to a module-level handler cross
+the process boundary for each task; any expensive state (configuration,
+indexes, compiled classifiers) is built once per worker by the pool's
+``initializer`` and kept for the worker's lifetime.
+
+The pool is sized from the agent's configuration: one worker per core,
+but no more than the host's memory divided by the agent's ``memory`` (MB).
+The agent's ``timeout`` (seconds) is enforced inside each worker with a
+real-time timer on POSIX systems, so a task that overruns is interrupted
+and its worker returns to the pool.
+"""
+
+import asyncio
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .cloud_agent import CloudAgent
+
+TaskHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class WorkerTimeoutError(TimeoutError):
+    """Raised in a worker when a task overruns the agent's timeout."""
+
+
+def host_memory_mb() -> Optional[int]:
+    """Return the physical memory of this host in MB, if it can be determined."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def pool_size(config: Dict[str, Any], cpu_count: Optional[int] = None,
+              memory_mb: Optional[int] = None) -> int:
+    """
+    Return the number of workers for an agent configuration.
+
+    Args:
+        config: Agent configuration; ``memory`` is the MB one task may use
+        cpu_count: Cores available (default: ``os.cpu_count()``)
+        memory_mb: Host memory in MB (default: detected)
+    """
+    workers = cpu_count or os.cpu_count() or 1
+    per_task = config.get('memory')
+    memory_mb = memory_mb if memory_mb is not None else host_memory_mb()
+    if per_task and memory_mb:
+        workers = min(workers, memory_mb // int(per_task))
+    return max(1, workers)
+
+
+def _raise_timeout(signum, frame):
+    raise WorkerTimeoutError()
+
+
+def _run_in_worker(handler: TaskHandler, task: Dict[str, Any],
+                   timeout: Optional[float]) -> Dict[str, Any]:
+    """Run ``handler`` in a worker process, interrupting it after ``timeout``."""
+    if not timeout or not hasattr(signal, 'setitimer'):
+        return handler(task)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return handler(task)
+    except WorkerTimeoutError:
+        raise WorkerTimeoutError(f"Task exceeded the worker timeout of {timeout:g}s") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+class LocalProcessAgent(CloudAgent):
+    """Executes tasks on a warm local process pool."""
+
+    # A running task continues in its worker until it ends or the worker's
+    # own timeout interrupts it
+    cancellable = False
+
+    def __init__(self, agent_id: str, handler: TaskHandler,
+                 config: Optional[Dict[str, Any]] = None, workers: Optional[int] = None,
+                 initializer: Optional[Callable[..., None]] = None,
+                 initargs: Tuple[Any, ...] = ()):
+        """
+        Initialize a local process agent.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            handler: Module-level function called in a worker with the task
+                dictionary; it must be picklable by reference
+            config: Agent configuration (``memory``, ``timeout``, ``capabilities``)
+            workers: Pool size (default: from ``memory`` and the core count)
+            initializer: Called once in every worker when it starts
+            initargs: Arguments for ``initializer``
+        """
+        super().__init__(agent_id, config)
+        self.handler = handler
+        self.workers = workers or pool_size(self.config)
+        self.timeout = self.config.get('timeout')
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the pool on first use, or again after a worker died."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=self.initializer,
+                                             initargs=self.initargs)
+        return self._pool
+
+    async def start(self) -> None:
+        """Start every worker now instead of on the first tasks."""
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm) for _ in range(self.workers)))
+
+    async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the handler for ``task`` in a worker process.
+
+        Cancelling a task that is still queued removes it from the pool; a
+        task that is already running continues until it finishes or the
+        worker's timeout interrupts it.
+
+        Args:
+            task: Task specification dictionary
+
+        Returns:
+            Result dictionary returned by the handler
+
+        Raises:
+            WorkerTimeoutError: If the task ran past the agent's timeout
+            BrokenProcessPool: If a worker died; the pool is replaced for
+                later tasks
+        """
+        pool = self._get_pool()
+        future = pool.submit(_run_in_worker, self.handler, task, self.timeout)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            if self._pool is pool:
+                self._pool = None
+                pool.shutdown(wait=False)
+            raise
+
+    def health_check(self) -> bool:
+        """Local workers are always available; a broken pool is replaced on the next task."""
+        return True
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,39 @@
+"""Archive extraction module
+
+The extractors are imported on first access, so code that only detects
+archive formats (such as ``src.fs``) does not load ``tarfile``, the
+compression modules or the process pool machinery.
+"""
+
+import importlib
+
+from .common import ArchiveError, ExtractionStats, MemberTooLargeError
+from .formats import detect_archive_format
+
+# Exports imported on first access, by defining submodule
+_LAZY_EXPORTS = {
+    'ExtractionManifest': 'manifest',
+    'IncrementalZipExtractor': 'manifest',
+    'TarExtractor': 'tar_extractor',
+    'ZipExtractor': 'zip_extractor',
+}
+
+__all__ = [
+    'ArchiveError',
+    'ExtractionManifest',
+    'ExtractionStats',
+    'IncrementalZipExtractor',
+    'MemberTooLargeError',
+    'TarExtractor',
+    'ZipExtractor',
+    'detect_archive_format',
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,143 @@
+"""
+Archive Extraction Primitives
+
+Shared helpers for the archive extraction backends: path sanitisation,
+size limits and extraction statistics.
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Buffer size used for streaming member data to disk.
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of error messages kept in a result.
+MAX_REPORTED_ERRORS = 50
+
+
+class ArchiveError(Exception):
+    """Raised when an archive cannot be read or extracted."""
+
+
+class MemberTooLargeError(ArchiveError):
+    """Raised when an archive member exceeds the configured size limit."""
+
+
+def safe_member_path(output_dir: str, name: str) -> Optional[str]:
+    """
+    Map an archive member name to a path inside ``output_dir``.
+
+    Mirrors the sanitisation done by ``zipfile.ZipFile.extract``: drive
+    letters, absolute prefixes and ``..`` components are dropped so a
+    member can never be written outside the output directory.
+
+    Args:
+        output_dir: Extraction root
+        name: Member name as stored in the archive
+
+    Returns:
+        Target path, or None if nothing remains after sanitising
+    """
+    name = name.replace('\\', '/')
+    name = os.path.splitdrive(name)[1]
+    parts = [part for part in name.split('/') if part not in ('', '.', '..')]
+    if not parts:
+        return None
+    return os.path.join(output_dir, *parts)
+
+
+def megabytes_to_bytes(limit_mb: Optional[float]) -> Optional[int]:
+    """Convert a ``max_file_size_mb`` style limit to bytes."""
+    if limit_mb is None:
+        return None
+    return int(float(limit_mb) * 1024 * 1024)
+
+
+class ExtractionStats:
+    """Aggregated counters for a single extraction run."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.files = 0
+        self.directories = 0
+        self.bytes_written = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+        self.failed_members: List[str] = []
+        self._started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, message: str, member: Optional[str] = None) -> None:
+        """
+        Record a member-level error, keeping the report bounded.
+
+        Args:
+            message: Human-readable error description
+            member: Name of the member that failed, if any
+        """
+        self.error_count += 1
+        if member is not None:
+            self.failed_members.append(member)
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def merge(self, partial: Dict[str, Any]) -> None:
+        """
+        Merge counters returned by an extraction worker.
+
+        Args:
+            partial: Dictionary produced by ``ExtractionStats.to_partial``
+        """
+        self.files += partial.get('files', 0)
+        self.directories += partial.get('directories', 0)
+        self.bytes_written += partial.get('bytes_written', 0)
+        self.skipped += partial.get('skipped', 0)
+        self.failed_members.extend(partial.get('failed_members', []))
+        for message in partial.get('errors', []):
+            self.add_error(message)
+        self.error_count += partial.get('error_count', 0) - len(partial.get('errors', []))
+
+    def to_partial(self) -> Dict[str, Any]:
+        """Serialise the counters for transfer back from a worker process."""
+        return {
+            'files': self.files,
+            'directories': self.directories,
+            'bytes_written': self.bytes_written,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'failed_members': self.failed_members,
+        }
+
+    def finish(self) -> 'ExtractionStats':
+        """Stop the clock and return self."""
+        self.elapsed = time.perf_counter() - self._started
+        return self
+
+    def throughput(self) -> Dict[str, float]:
+        """
+        Compute extraction throughput.
+
+        Returns:
+            Dictionary with ``mb_per_s`` and ``files_per_s``
+        """
+        elapsed = self.elapsed or 1e-9
+        return {
+            'mb_per_s': round(self.bytes_written / (1024 * 1024) / elapsed, 2),
+            'files_per_s': round(self.files / elapsed, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable summary of the run."""
+        return {
+            'files_extracted': self.files,
+            'directories_created': self.directories,
+            'bytes_written': self.bytes_written,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'error_count': self.error_count,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'throughput': self.throughput(),
+        }
@@ -0,0 +1,53 @@
+"""
+Archive Format Detection
+
+Identifies archive formats from their magic bytes so the extraction backend
+does not depend on the file name.
+"""
+
+from typing import Optional
+
+ZIP = "zip"
+TAR = "tar"
+GZIP = "gzip"
+BZIP2 = "bz2"
+XZ = "xz"
+SEVEN_ZIP = "7z"
+
+# Compressed formats that are expected to wrap a tar stream.
+COMPRESSED_TAR_FORMATS = (GZIP, BZIP2, XZ)
+
+_MAGIC_PREFIXES = (
+    (b"PK\x03\x04", ZIP),
+    (b"PK\x05\x06", ZIP),  # empty archive
+    (b"PK\x07\x08", ZIP),  # spanned archive
+    (b"\x1f\x8b", GZIP),
+    (b"BZh", BZIP2),
+    (b"\xfd7zXZ\x00", XZ),
+    (b"7z\xbc\xaf\x27\x1c", SEVEN_ZIP),
+)
+
+# POSIX and GNU tar headers carry "ustar" at offset 257.
+_TAR_MAGIC_OFFSET = 257
+_TAR_MAGIC = b"ustar"
+
+
+def detect_archive_format(path: str) -> Optional[str]:
+    """
+    Detect an archive's format from its leading bytes.
+
+    Args:
+        path: Path to the archive
+
+    Returns:
+        One of the format constants in this module, or None if unknown
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_TAR_MAGIC_OFFSET + len(_TAR_MAGIC))
+
+    for magic, fmt in _MAGIC_PREFIXES:
+        if header.startswith(magic):
+            return fmt
+    if header[_TAR_MAGIC_OFFSET:_TAR_MAGIC_OFFSET + len(_TAR_MAGIC)] == _TAR_MAGIC:
+        return TAR
+    return None
@@ -0,0 +1,162 @@
+"""
+Incremental Extraction Manifest
+
+Records the CRC-32 and size of every member written by a zip extraction in
+a manifest stored next to the output tree. Re-extracting a new revision of
+the same archive then only writes members whose central-directory entry
+changed and deletes members that are no longer in the archive.
+
+The manifest describes what was extracted, not what is on disk: files
+modified or deleted by hand inside the output tree are not detected.
+"""
+
+import json
+import os
+import zipfile
+from typing import Dict, Iterable, List, Tuple
+
+from .common import ExtractionStats, safe_member_path
+from .zip_extractor import ZipExtractor
+
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(output_dir: str) -> str:
+    """Return the manifest path for an output tree (a sibling file)."""
+    return os.path.normpath(os.path.abspath(output_dir)) + MANIFEST_SUFFIX
+
+
+class ExtractionManifest:
+    """Maps member names to their (CRC-32, size) signature."""
+
+    def __init__(self, entries: Dict[str, Tuple[int, int]] = None):
+        """
+        Initialize a manifest.
+
+        Args:
+            entries: Mapping of member name to (crc, file_size)
+        """
+        self.entries: Dict[str, Tuple[int, int]] = entries or {}
+
+    @classmethod
+    def from_infos(cls, infos: Iterable[zipfile.ZipInfo]) -> 'ExtractionManifest':
+        """Build a manifest from central-directory entries (files only)."""
+        return cls({info.filename: (info.CRC, info.file_size)
+                    for info in infos if not info.is_dir()})
+
+    @classmethod
+    def load(cls, path: str) -> 'ExtractionManifest':
+        """
+        Load a manifest, returning an empty one if it is missing or unreadable.
+
+        Args:
+            path: Manifest file path
+        """
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != MANIFEST_VERSION:
+            return cls()
+        return cls({name: (crc, size) for name, (crc, size) in data['members'].items()})
+
+    def save(self, path: str) -> None:
+        """
+        Write the manifest atomically.
+
+        Args:
+            path: Manifest file path
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'members': self.entries}, f,
+                      separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def diff(self, newer: 'ExtractionManifest') -> Tuple[List[str], List[str], int]:
+        """
+        Compare this manifest with a newer one.
+
+        Args:
+            newer: Manifest of the archive about to be extracted
+
+        Returns:
+            Tuple of (new or changed names, removed names, unchanged count)
+        """
+        changed = [name for name, signature in newer.entries.items()
+                   if self.entries.get(name) != signature]
+        removed = [name for name in self.entries if name not in newer.entries]
+        unchanged = len(newer.entries) - len(changed)
+        return changed, removed, unchanged
+
+
+def _remove_member(output_dir: str, name: str) -> bool:
+    """Delete a vanished member and prune directories it leaves empty."""
+    target = safe_member_path(output_dir, name)
+    if target is None or not os.path.isfile(target):
+        return False
+    os.remove(target)
+    root = os.path.abspath(output_dir)
+    parent = os.path.dirname(os.path.abspath(target))
+    while parent != root and parent.startswith(root):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+    return True
+
+
+class IncrementalZipExtractor:
+    """Re-extracts only the members of a zip that changed since the last run."""
+
+    def __init__(self, extractor: ZipExtractor):
+        """
+        Initialize the incremental extractor.
+
+        Args:
+            extractor: Extractor used to write new and changed members
+        """
+        self.extractor = extractor
+
+    def extract(self, zip_path: str, output_dir: str) -> Tuple[ExtractionStats, Dict[str, int]]:
+        """
+        Bring ``output_dir`` in line with ``zip_path``.
+
+        Args:
+            zip_path: Path to the zip archive
+            output_dir: Extraction root holding a previous revision
+
+        Returns:
+            Tuple of (extraction statistics, summary with ``changed``,
+            ``removed`` and ``unchanged`` counts)
+        """
+        manifest_path = manifest_path_for(output_dir)
+        previous = ExtractionManifest.load(manifest_path)
+
+        with zipfile.ZipFile(zip_path, 'r') as archive:
+            infos = archive.infolist()
+        current = ExtractionManifest.from_infos(infos)
+        changed, removed, unchanged = previous.diff(current)
+
+        # Directories are cheap and idempotent, so always recreate them.
+        changed_set = set(changed)
+        to_extract = [info for info in infos
+                      if info.is_dir() or info.filename in changed_set]
+        del infos
+
+        stats = self.extractor.extract_infos(zip_path, output_dir, to_extract)
+        removed_count = sum(1 for name in removed if _remove_member(output_dir, name))
+
+        # Failed members are left out so the next run retries them.
+        for name in stats.failed_members:
+            current.entries.pop(name, None)
+        current.save(manifest_path)
+
+        return stats, {
+            'changed': len(changed) - len(stats.failed_members),
+            'removed': removed_count,
+            'unchanged': unchanged,
+        }
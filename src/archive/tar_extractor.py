@@ -0,0 +1,240 @@
+"""
+Streaming Tar Extraction
+
+Extracts tar archives (optionally gzip, bzip2 or xz compressed) in a single
+sequential pass. Decompression runs on a background thread that feeds a
+bounded queue, so inflating the next block overlaps with writing the current
+member to disk. zlib, bz2 and lzma release the GIL while decompressing,
+which lets the two stages run on separate cores.
+"""
+
+import bz2
+import io
+import lzma
+import os
+import queue
+import tarfile
+import threading
+import zlib
+from typing import Callable, Optional
+
+from . import formats
+from .common import (
+    COPY_BUFFER_SIZE,
+    ArchiveError,
+    ExtractionStats,
+    MemberTooLargeError,
+    safe_member_path,
+)
+
+# Number of decompressed chunks buffered between the two threads. Bounds
+# memory to roughly QUEUE_DEPTH * COPY_BUFFER_SIZE plus one chunk's expansion.
+QUEUE_DEPTH = 8
+
+# Write buffer for member files; large so small reads coalesce into few syscalls.
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+_DECOMPRESSORS = {
+    formats.GZIP: lambda: zlib.decompressobj(16 + zlib.MAX_WBITS),
+    formats.BZIP2: bz2.BZ2Decompressor,
+    formats.XZ: lzma.LZMADecompressor,
+}
+
+_EOF = object()
+
+
+class ThreadedDecompressReader(io.RawIOBase):
+    """Read-only stream that decompresses a file on a background thread."""
+
+    def __init__(self, path: str, make_decompressor: Callable,
+                 chunk_size: int = COPY_BUFFER_SIZE, queue_depth: int = QUEUE_DEPTH):
+        """
+        Start decompressing ``path`` in the background.
+
+        Args:
+            path: Compressed file to read
+            make_decompressor: Factory returning a zlib/bz2/lzma decompressor
+            chunk_size: Size of raw reads from ``path``
+            queue_depth: Maximum number of decompressed chunks buffered
+        """
+        super().__init__()
+        self._path = path
+        self._make_decompressor = make_decompressor
+        self._chunk_size = chunk_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_depth)
+        self._buffer = memoryview(b"")
+        self._finished = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Queue an item unless the reader has been closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        """Background thread: read, decompress and queue chunks."""
+        try:
+            decompressor = self._make_decompressor()
+            with open(self._path, 'rb') as raw:
+                while not self._stop.is_set():
+                    chunk = raw.read(self._chunk_size)
+                    if not chunk:
+                        break
+                    # Concatenated streams (e.g. multi-member gzip) restart
+                    # with a fresh decompressor on the leftover bytes.
+                    while chunk:
+                        data = decompressor.decompress(chunk)
+                        if data and not self._put(data):
+                            return
+                        if not decompressor.eof:
+                            break
+                        chunk = decompressor.unused_data
+                        if chunk:
+                            decompressor = self._make_decompressor()
+            if not decompressor.eof:
+                raise ArchiveError("Compressed stream is truncated")
+            self._put(_EOF)
+        except Exception as e:  # surfaced to the reading thread
+            self._put(e)
+
+    def readable(self) -> bool:
+        """This stream is readable."""
+        return True
+
+    def readinto(self, b) -> int:
+        """Fill ``b`` with decompressed bytes; returns 0 at end of stream."""
+        while not self._buffer:
+            if self._finished:
+                return 0
+            item = self._queue.get()
+            if item is _EOF:
+                self._finished = True
+                return 0
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            self._buffer = memoryview(item)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        """Stop the background thread and release resources."""
+        self._stop.set()
+        super().close()
+
+
+class TarExtractor:
+    """Extracts tar archives in one streaming decompress-and-write pass."""
+
+    def __init__(self, max_member_bytes: Optional[int] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            max_member_bytes: Optional per-member size limit in bytes
+        """
+        self.max_member_bytes = max_member_bytes
+
+    def _open_stream(self, tar_path: str, fmt: str):
+        """Return a sequential byte stream of the uncompressed tar data."""
+        if fmt == formats.TAR:
+            return open(tar_path, 'rb', buffering=COPY_BUFFER_SIZE)
+        factory = _DECOMPRESSORS.get(fmt)
+        if factory is None:
+            raise ArchiveError(f"Unsupported tar compression: {fmt}")
+        return io.BufferedReader(ThreadedDecompressReader(tar_path, factory),
+                                 buffer_size=COPY_BUFFER_SIZE)
+
+    def _write_member(self, archive: tarfile.TarFile, member: tarfile.TarInfo,
+                      target: str) -> int:
+        """Stream a regular file member to ``target``."""
+        limit = self.max_member_bytes
+        if limit is not None and member.size > limit:
+            raise MemberTooLargeError(
+                f"declared size {member.size} exceeds limit of {limit} bytes")
+        source = archive.extractfile(member)
+        written = 0
+        with open(target, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+            while True:
+                chunk = source.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                out.write(chunk)
+        os.utime(target, (member.mtime, member.mtime))
+        return written
+
+    def extract(self, tar_path: str, output_dir: str,
+                fmt: Optional[str] = None) -> ExtractionStats:
+        """
+        Extract ``tar_path`` into ``output_dir``.
+
+        Only regular files and directories are extracted; links and device
+        nodes are counted as skipped.
+
+        Args:
+            tar_path: Path to the tar archive
+            output_dir: Extraction root
+            fmt: Format constant from ``formats`` (detected if omitted)
+
+        Returns:
+            Statistics for the run
+
+        Raises:
+            ArchiveError: If the archive or its compression layer is invalid
+        """
+        fmt = fmt or formats.detect_archive_format(tar_path)
+        stats = ExtractionStats()
+        created_dirs = set()
+        os.makedirs(output_dir, exist_ok=True)
+
+        stream = self._open_stream(tar_path, fmt)
+        try:
+            with tarfile.open(fileobj=stream, mode='r|') as archive:
+                while True:
+                    member = archive.next()
+                    if member is None:
+                        break
+                    # Streaming mode never revisits members; drop them so
+                    # memory stays flat on archives with many entries.
+                    archive.members = []
+                    target = safe_member_path(output_dir, member.name)
+                    if target is None or not (member.isfile() or member.isdir()):
+                        stats.skipped += 1
+                        continue
+                    if member.isdir():
+                        os.makedirs(target, exist_ok=True)
+                        created_dirs.add(target)
+                        stats.directories += 1
+                        continue
+
+                    parent = os.path.dirname(target)
+                    if parent not in created_dirs:
+                        os.makedirs(parent, exist_ok=True)
+                        created_dirs.add(parent)
+                    try:
+                        stats.bytes_written += self._write_member(archive, member, target)
+                        stats.files += 1
+                    except (MemberTooLargeError, OSError) as e:
+                        stats.add_error(f"{member.name}: {e}", member.name)
+                        if os.path.exists(target):
+                            os.remove(target)
+        except (tarfile.TarError, zlib.error, lzma.LZMAError, EOFError) as e:
+            raise ArchiveError(f"Invalid or corrupted tar archive: {e}")
+        except OSError as e:
+            # bz2 reports corrupt data as OSError.
+            if fmt == formats.BZIP2:
+                raise ArchiveError(f"Invalid or corrupted tar archive: {e}")
+            raise
+        finally:
+            stream.close()
+        return stats.finish()
@@ -0,0 +1,235 @@
+"""
+Parallel Zip Extraction
+
+Extracts zip archives by fanning members out across a process pool. Each
+worker opens its own handle on the archive, streams members to disk in
+fixed-size chunks and verifies CRC-32 checksums while writing, so the
+archive is read exactly once and memory use does not depend on member size.
+"""
+
+import heapq
+import os
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .common import (
+    COPY_BUFFER_SIZE,
+    ExtractionStats,
+    MemberTooLargeError,
+    safe_member_path,
+)
+
+# Archives with fewer members than this are extracted in-process; the cost
+# of starting workers outweighs any gain.
+PARALLEL_MIN_MEMBERS = 64
+
+# Number of batches handed to each worker; more batches smooth out skew.
+BATCHES_PER_WORKER = 4
+
+# Per-process cache of the open archive so batches reuse one handle.
+_worker_archive: Optional[Tuple[Tuple[int, str, int, int], zipfile.ZipFile]] = None
+
+
+def _open_worker_archive(zip_path: str) -> zipfile.ZipFile:
+    """Return this process's handle on ``zip_path``, reopening if it changed."""
+    global _worker_archive
+    st = os.stat(zip_path)
+    # The pid guards against reusing a handle inherited through fork().
+    key = (os.getpid(), os.path.abspath(zip_path), st.st_size, st.st_mtime_ns)
+    if _worker_archive is not None:
+        cached_key, handle = _worker_archive
+        if cached_key == key:
+            return handle
+        handle.close()
+    handle = zipfile.ZipFile(zip_path, 'r')
+    _worker_archive = (key, handle)
+    return handle
+
+
+def _close_worker_archive() -> None:
+    """Close this process's cached archive handle, if any."""
+    global _worker_archive
+    if _worker_archive is not None:
+        _worker_archive[1].close()
+        _worker_archive = None
+
+
+def _copy_member(source, target_path: str, limit: Optional[int]) -> int:
+    """Stream one member to disk, enforcing ``limit`` on the bytes read."""
+    written = 0
+    with open(target_path, 'wb') as target:
+        while True:
+            chunk = source.read(COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if limit is not None and written > limit:
+                raise MemberTooLargeError(f"exceeds {limit} bytes")
+            target.write(chunk)
+    return written
+
+
+def extract_batch(zip_path: str, output_dir: str, names: List[str],
+                  max_member_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract a batch of members from a zip archive.
+
+    Runs inside pool workers as well as in-process for small archives.
+    Reading a member to the end makes ``zipfile`` check its CRC-32, so a
+    successful return means every extracted member was verified.
+
+    Args:
+        zip_path: Path to the zip archive
+        output_dir: Extraction root
+        names: Member names to extract
+        max_member_bytes: Optional per-member size limit in bytes
+
+    Returns:
+        Partial statistics dictionary (see ``ExtractionStats.to_partial``)
+    """
+    stats = ExtractionStats()
+    archive = _open_worker_archive(zip_path)
+    created_dirs = set()
+
+    for name in names:
+        info = archive.getinfo(name)
+        target = safe_member_path(output_dir, name)
+        if target is None:
+            stats.skipped += 1
+            continue
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+            stats.directories += 1
+            continue
+        if max_member_bytes is not None and info.file_size > max_member_bytes:
+            stats.add_error(f"{name}: declared size {info.file_size} exceeds "
+                            f"limit of {max_member_bytes} bytes", name)
+            continue
+
+        parent = os.path.dirname(target)
+        if parent not in created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            created_dirs.add(parent)
+
+        try:
+            with archive.open(info) as source:
+                stats.bytes_written += _copy_member(source, target, max_member_bytes)
+            stats.files += 1
+        except (zipfile.BadZipFile, MemberTooLargeError, OSError) as e:
+            stats.add_error(f"{name}: {e}", name)
+            if os.path.exists(target):
+                os.remove(target)
+
+    return stats.to_partial()
+
+
+def plan_batches(infos: Iterable[zipfile.ZipInfo], batch_count: int) -> List[List[str]]:
+    """
+    Split members into batches of roughly equal compressed size.
+
+    Uses longest-processing-time-first assignment so one huge member does
+    not leave the other workers idle.
+
+    Args:
+        infos: Members to distribute
+        batch_count: Number of batches to produce
+
+    Returns:
+        List of non-empty member name lists
+    """
+    batches: List[List[str]] = [[] for _ in range(max(1, batch_count))]
+    loads = [(0, slot) for slot in range(len(batches))]
+    ordered = sorted(infos, key=lambda i: i.compress_size, reverse=True)
+    for info in ordered:
+        load, slot = loads[0]
+        batches[slot].append(info.filename)
+        # Directories and empty files still cost a syscall, so weight them as 1.
+        heapq.heapreplace(loads, (load + info.compress_size + 1, slot))
+    return [batch for batch in batches if batch]
+
+
+class ZipExtractor:
+    """Extracts zip archives in parallel with streaming CRC verification."""
+
+    def __init__(self, workers: Optional[int] = None,
+                 max_member_bytes: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            max_member_bytes: Optional per-member size limit in bytes
+            executor: Optional existing process pool to submit batches to
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_member_bytes = max_member_bytes
+        self.executor = executor
+
+    def extract(self, zip_path: str, output_dir: str,
+                members: Optional[List[str]] = None) -> ExtractionStats:
+        """
+        Extract ``zip_path`` into ``output_dir``.
+
+        Args:
+            zip_path: Path to the zip archive
+            output_dir: Extraction root
+            members: Optional subset of member names to extract
+
+        Returns:
+            Statistics for the run
+
+        Raises:
+            zipfile.BadZipFile: If the archive's central directory is invalid
+        """
+        with zipfile.ZipFile(zip_path, 'r') as archive:
+            infos = archive.infolist()
+        if members is not None:
+            wanted = set(members)
+            infos = [info for info in infos if info.filename in wanted]
+        return self.extract_infos(zip_path, output_dir, infos)
+
+    def extract_infos(self, zip_path: str, output_dir: str,
+                      infos: List[zipfile.ZipInfo]) -> ExtractionStats:
+        """
+        Extract the given members of ``zip_path`` into ``output_dir``.
+
+        Use this when the central directory has already been read, to avoid
+        parsing it a second time.
+
+        Args:
+            zip_path: Path to the zip archive
+            output_dir: Extraction root
+            infos: Members to extract, as returned by ``ZipFile.infolist``
+
+        Returns:
+            Statistics for the run
+        """
+        stats = ExtractionStats()
+        os.makedirs(output_dir, exist_ok=True)
+        if not infos:
+            return stats.finish()
+        if self.workers <= 1 or len(infos) < PARALLEL_MIN_MEMBERS:
+            names = [info.filename for info in infos]
+            try:
+                stats.merge(extract_batch(zip_path, output_dir, names,
+                                          self.max_member_bytes))
+            finally:
+                _close_worker_archive()
+            return stats.finish()
+
+        batches = plan_batches(infos, self.workers * BATCHES_PER_WORKER)
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [
+                executor.submit(extract_batch, zip_path, output_dir, batch,
+                                self.max_member_bytes)
+                for batch in batches
+            ]
+            for future in futures:
+                stats.merge(future.result())
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+        return stats.finish()
@@ -0,0 +1,6 @@
+"""Result cache module"""
+
+from .fingerprint import cache_key, input_fingerprint, task_digest
+from .result_cache import ResultCache
+
+__all__ = ['ResultCache', 'cache_key', 'input_fingerprint', 'task_digest']
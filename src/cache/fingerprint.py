@@ -0,0 +1,72 @@
+"""
+Cache Keys
+
+Builds result-cache keys from a canonical hash of the task parameters and a
+fingerprint of the input path. The fingerprint covers the relative path,
+size and mtime of every file under the input, so any file added, removed,
+resized or touched changes the key; like the review cache's stat check, a
+rewrite that keeps both size and mtime is not detected. Hashing the
+contents themselves would cost as much as most of the tasks being cached.
+
+Callers that already hold an up-to-date index of a directory pass its
+entries, so computing the key does not walk the tree a second time.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from ..fs.entry import FileEntry
+from ..fs.file_index import scan_tree
+
+DIGEST_SIZE = 16
+
+
+def task_digest(task: Dict[str, Any]) -> str:
+    """
+    Return a hash of ``task`` that ignores key order.
+
+    Values that are not JSON types are hashed by their ``str()``.
+    """
+    encoded = json.dumps(task, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def input_fingerprint(path: Optional[str],
+                      entries: Optional[Iterable[FileEntry]] = None) -> str:
+    """
+    Return a fingerprint of the file or directory tree at ``path``.
+
+    Args:
+        path: Input file or directory (None or a missing path gives a fixed
+            fingerprint, so tasks that fail on it are keyed consistently)
+        entries: Files of the directory ``path`` (default: scan the tree)
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    if not path or not os.path.exists(path):
+        digest.update(b'missing')
+        return digest.hexdigest()
+    if os.path.isdir(path):
+        # Sorted so the fingerprint does not depend on scan order
+        entries = sorted((os.path.relpath(entry.path, path), entry.size, entry.mtime_ns)
+                         for entry in (scan_tree(path) if entries is None else entries))
+        for rel, size, mtime_ns in entries:
+            digest.update(f"{rel}\0{size}\0{mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+        return digest.hexdigest()
+    stat = os.stat(path)
+    digest.update(f"{stat.st_size}\0{stat.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_key(task: Dict[str, Any], input_path: Optional[str],
+              entries: Optional[Iterable[FileEntry]] = None) -> str:
+    """
+    Return the result-cache key of ``task`` run on ``input_path``.
+
+    Args:
+        task: Task parameters, including everything that affects the result
+        input_path: Path whose contents the task reads
+        entries: Files of the directory ``input_path`` (default: scan the tree)
+    """
+    return f"{task_digest(task)}:{input_fingerprint(input_path, entries)}"
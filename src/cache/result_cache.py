@@ -0,0 +1,276 @@
+"""
+Result Cache
+
+Memoizes task results. Entries live in an in-memory LRU bounded by
+``max_entries`` and, optionally, in a SQLite file that outlives the process;
+a disk hit is promoted into memory. Every entry expires ``ttl`` seconds
+after it was stored. Each store also deletes the expired rows of the disk
+tier and, beyond ``max_disk_entries`` rows, the oldest ones. Results are
+stored JSON-encoded, so each lookup returns a fresh copy the caller may
+modify.
+
+The cache is shared between threads (workflow steps run their handlers on
+worker threads), so all operations take one lock.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_ENTRIES = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    input TEXT,
+    expires REAL,
+    stored REAL NOT NULL,
+    result TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_input ON results (input);
+CREATE INDEX IF NOT EXISTS results_expires ON results (expires);
+CREATE INDEX IF NOT EXISTS results_stored ON results (stored);
+"""
+
+
+class ResultCache:
+    """LRU of task results with TTLs and an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None,
+                 db_path: Optional[str] = None, actions: Iterable[str] = (),
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept in memory
+            ttl: Seconds an entry stays valid (default: until evicted or invalidated)
+            db_path: SQLite file for the disk tier (default: memory only)
+            actions: Task types whose results may be cached
+            max_disk_entries: Rows kept in the disk tier
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.ttl = ttl
+        self.db_path = db_path
+        self.actions = frozenset(actions)
+        # key -> (expires, input path, encoded result)
+        self._entries: 'OrderedDict[str, Tuple[Optional[float], Optional[str], str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "disk_hits": 0, "stores": 0,
+                          "evictions": 0, "disk_evictions": 0, "expirations": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_entries = 0
+        if db_path:
+            parent = os.path.dirname(db_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+            if columns and 'stored' not in columns:
+                # Written by a version without store times; it is only a cache
+                self._conn.execute("DROP TABLE results")
+            self._conn.executescript(_SCHEMA)
+            self._disk_entries = self._conn.execute(
+                "SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['ResultCache']:
+        """
+        Build a cache from a ``result_cache`` configuration section.
+
+        Returns:
+            The cache, or None when the section is missing or not enabled
+        """
+        if not config or not config.get('enabled', False):
+            return None
+        ttl = config.get('ttl_seconds')
+        return cls(
+            max_entries=int(config.get('max_entries', DEFAULT_MAX_ENTRIES)),
+            ttl=float(ttl) if ttl else None,
+            db_path=config.get('db_path'),
+            actions=config.get('tasks', []),
+            max_disk_entries=int(config.get('max_disk_entries', DEFAULT_MAX_DISK_ENTRIES)),
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a result.
+
+        Args:
+            key: Cache key (see ``cache_key``)
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return json.loads(entry[2])
+                del self._entries[key]
+                self._counters["expirations"] += 1
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT input, expires, result FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    input_path, expires, encoded = row
+                    if expires is None or expires > now:
+                        self._remember(key, (expires, input_path, encoded))
+                        self._counters["hits"] += 1
+                        self._counters["disk_hits"] += 1
+                        return json.loads(encoded)
+                    with self._conn:
+                        self._disk_entries -= self._conn.execute(
+                            "DELETE FROM results WHERE key = ?", (key,)).rowcount
+                    self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, result: Dict[str, Any], input_path: Optional[str] = None,
+            ttl: Optional[float] = None) -> bool:
+        """
+        Store a result.
+
+        Args:
+            key: Cache key
+            result: JSON-serializable result dictionary
+            input_path: Input the result was computed from, for ``invalidate_path``
+            ttl: Seconds the entry stays valid (default: the cache's ``ttl``)
+
+        Returns:
+            True if stored, False if the result is not JSON-serializable
+        """
+        try:
+            encoded = json.dumps(result, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return False
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.time()
+        expires = now + ttl if ttl else None
+        input_path = os.path.abspath(input_path) if input_path else None
+        with self._lock:
+            self._remember(key, (expires, input_path, encoded))
+            self._counters["stores"] += 1
+            if self._conn is not None:
+                with self._conn:
+                    self._store_row(key, input_path, expires, now, encoded)
+        return True
+
+    def _store_row(self, key: str, input_path: Optional[str], expires: Optional[float],
+                   now: float, encoded: str) -> None:
+        """Write a disk row, then drop expired rows and the oldest ones over the limit."""
+        conn = self._conn
+        if conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is None:
+            self._disk_entries += 1
+        conn.execute("INSERT OR REPLACE INTO results (key, input, expires, stored, result) "
+                     "VALUES (?, ?, ?, ?, ?)", (key, input_path, expires, now, encoded))
+        expired = conn.execute("DELETE FROM results WHERE expires <= ?", (now,)).rowcount
+        self._disk_entries -= expired
+        self._counters["expirations"] += expired
+        excess = self._disk_entries - self.max_disk_entries
+        if excess > 0:
+            evicted = conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY stored LIMIT ?)", (excess,)).rowcount
+            self._disk_entries -= evicted
+            self._counters["disk_evictions"] += evicted
+
+    def _remember(self, key: str, entry: Tuple[Optional[float], Optional[str], str]) -> None:
+        """Insert into the memory tier, evicting the least recently used entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """
+        Drop one entry, or every entry.
+
+        Args:
+            key: Key to drop (default: clear the cache)
+
+        Returns:
+            Number of memory and disk entries removed
+        """
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                if self._conn is not None:
+                    with self._conn:
+                        removed += self._conn.execute("DELETE FROM results").rowcount
+                    self._disk_entries = 0
+                return removed
+            removed = 1 if self._entries.pop(key, None) is not None else 0
+            if self._conn is not None:
+                with self._conn:
+                    deleted = self._conn.execute(
+                        "DELETE FROM results WHERE key = ?", (key,)).rowcount
+                self._disk_entries -= deleted
+                removed += deleted
+            return removed
+
+    def invalidate_path(self, path: str) -> int:
+        """
+        Drop every entry computed from ``path``.
+
+        Returns:
+            Number of memory and disk entries removed
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[1] == path]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+            if self._conn is not None:
+                with self._conn:
+                    deleted = self._conn.execute(
+                        "DELETE FROM results WHERE input = ?", (path,)).rowcount
+                self._disk_entries -= deleted
+                removed += deleted
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and sizes.
+
+        ``hit_rate`` is hits over lookups; ``evictions`` counts entries
+        pushed out of memory by ``max_entries`` and ``disk_evictions`` rows
+        deleted by ``max_disk_entries``.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            if self._conn is not None:
+                stats["disk_entries"] = self._disk_entries
+                stats["max_disk_entries"] = self.max_disk_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -8,6 +8,13 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+YAML_SUFFIXES = ('.yaml', '.yml')
+
 
 class AgentConfig:
     """Manages configuration for cloud agents."""
@@ -25,12 +32,23 @@ class AgentConfig:
             self.load()
     
     def load(self) -> None:
-        """Load configuration from file."""
+        """
+        Load configuration from file.
+        
+        JSON files are always supported. YAML files (``.yaml``/``.yml``)
+        require the optional PyYAML dependency.
+        
+        Raises:
+            ImportError: If a YAML file is given and PyYAML is not installed
+        """
         if not self.config_path:
             return
         
         path = Path(self.config_path)
         if path.exists():
+            if path.suffix in YAML_SUFFIXES:
+                self.config = self._load_yaml(path)
+                return
             try:
                 with open(path, 'r') as f:
                     self.config = json.load(f)
@@ -39,6 +57,20 @@ class AgentConfig:
             except IOError as e:
                 raise IOError(f"Error reading config file {self.config_path}: {e}")
     
+    def _load_yaml(self, path: Path) -> Dict[str, Any]:
+        """Load a YAML configuration file."""
+        if yaml is None:
+            raise ImportError(
+                f"PyYAML is required to read {self.config_path} (pip install pyyaml)"
+            )
+        try:
+            with open(path, 'r') as f:
+                return yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in config file {self.config_path}: {e}")
+        except IOError as e:
+            raise IOError(f"Error reading config file {self.config_path}: {e}")
+    
     def save(self) -> None:
         """Save configuration to file."""
         if not self.config_path:
@@ -87,3 +119,16 @@ class AgentConfig:
         """
         agents = self.config.get('agents', {})
         return agents.get(agent_id, {})
+    
+    def get_task_config(self, task: str) -> Dict[str, Any]:
+        """
+        Get configuration for a specific task type.
+        
+        Args:
+            task: Task name (e.g. ``unzip``, ``organize``)
+            
+        Returns:
+            Task-specific configuration dictionary
+        """
+        tasks = self.config.get('tasks', {})
+        return tasks.get(task) or {}
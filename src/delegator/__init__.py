@@ -1,5 +1,13 @@
 """Task Delegator module"""
 
-from .task_delegator import TaskDelegator
+from .health import CircuitBreaker, HealthMonitor
+from .metrics import DelegationMetrics
+from .registry import AgentRegistry
+from .retry import HedgePolicy, RetryPolicy
+from .router import AgentRouter
+from .scheduler import QueueFullError, TaskScheduler
+from .task_delegator import TaskDelegator, TaskTimeoutError
 
-__all__ = ['TaskDelegator']
+__all__ = ['AgentRegistry', 'AgentRouter', 'CircuitBreaker', 'DelegationMetrics',
+           'HealthMonitor', 'HedgePolicy', 'QueueFullError', 'RetryPolicy', 'TaskDelegator',
+           'TaskScheduler', 'TaskTimeoutError']
@@ -0,0 +1,307 @@
+"""
+Agent Health Monitoring
+
+Keeps a cached health state per agent so dispatch never waits on a probe.
+Two signals decide whether an agent receives routed tasks:
+
+- a background loop calls every agent's ``health_check`` each
+  ``interval`` seconds (on a worker thread, or awaited if it is a
+  coroutine function) and caches the answer; a probe that raises or takes
+  longer than ``probe_timeout`` counts as unhealthy
+- a circuit breaker per agent fed by the outcome of delegated tasks: after
+  ``failure_threshold`` consecutive failures or timeouts it opens, and
+  ``reset_timeout`` seconds later it goes half-open and lets tasks through
+  again; the next outcome closes it or opens it for another period
+
+An agent that is unhealthy or whose breaker is open is suspended in the
+router, so routed selection skips it at no extra cost per task. Tasks sent
+to an agent by id are not affected.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .metrics import COMPLETED, FAILED, TIMEOUT
+from .registry import AgentRegistry
+from .router import AgentRouter
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_INTERVAL = 30.0
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+# Probes running at once, so a round over many agents does not flood the
+# worker threads.
+MAX_CONCURRENT_PROBES = 32
+
+
+class CircuitBreaker:
+    """Closed, open and half-open states driven by task outcomes."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before half-opening
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def record_success(self) -> bool:
+        """
+        Record a successful task.
+
+        Returns:
+            True if this closed the breaker
+        """
+        self.failures = 0
+        if self.state == CLOSED:
+            return False
+        self.state = CLOSED
+        self.opened_at = None
+        return True
+
+    def record_failure(self, now: float) -> bool:
+        """
+        Record a failed or timed-out task.
+
+        Args:
+            now: Current ``time.monotonic()``
+
+        Returns:
+            True if this opened the breaker
+        """
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED
+                                       and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = now
+            return True
+        return False
+
+    def half_open(self, now: float) -> bool:
+        """
+        Move an open breaker to half-open once its reset timeout has passed.
+
+        Returns:
+            True if the state changed
+        """
+        if self.state != OPEN or now - self.opened_at < self.reset_timeout:
+            return False
+        self.state = HALF_OPEN
+        return True
+
+
+class HealthMonitor:
+    """Cached agent health and circuit breakers for a delegator."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL,
+                 probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between probe rounds
+            probe_timeout: Seconds a single health check may take
+            failure_threshold: Consecutive task failures that open a breaker
+            reset_timeout: Seconds a breaker stays open
+        """
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._registry: Optional[AgentRegistry] = None
+        self._router: Optional[AgentRouter] = None
+        self._healthy: Dict[str, bool] = {}
+        self._last_probe: Dict[str, float] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['HealthMonitor']:
+        """
+        Build a monitor from a ``health`` configuration section.
+
+        Returns:
+            The monitor, or None when the section is missing or not enabled
+        """
+        if not config or not config.get('enabled', False):
+            return None
+        return cls(
+            interval=float(config.get('interval_seconds', DEFAULT_INTERVAL)),
+            probe_timeout=float(config.get('probe_timeout_seconds', DEFAULT_PROBE_TIMEOUT)),
+            failure_threshold=int(config.get('failure_threshold', DEFAULT_FAILURE_THRESHOLD)),
+            reset_timeout=float(config.get('reset_timeout_seconds', DEFAULT_RESET_TIMEOUT)),
+        )
+
+    def attach(self, registry: AgentRegistry, router: AgentRouter) -> None:
+        """Monitor the agents of ``registry``, suspending them in ``router``."""
+        self._registry = registry
+        self._router = router
+
+    def forget(self, agent_id: str) -> None:
+        """Drop the health state of an agent that was (re-)registered or removed."""
+        self._healthy.pop(agent_id, None)
+        self._last_probe.pop(agent_id, None)
+        self._breakers.pop(agent_id, None)
+        timer = self._timers.pop(agent_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _breaker(self, agent_id: str) -> CircuitBreaker:
+        breaker = self._breakers.get(agent_id)
+        if breaker is None:
+            breaker = self._breakers[agent_id] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def is_available(self, agent_id: str) -> bool:
+        """Return True if the agent is healthy and its breaker is not open."""
+        breaker = self._breakers.get(agent_id)
+        return (self._healthy.get(agent_id, True)
+                and (breaker is None or breaker.state != OPEN))
+
+    def _refresh(self, agent_id: str) -> None:
+        """Suspend or resume the agent in the router to match its state."""
+        if self._router is None:
+            return
+        if self.is_available(agent_id):
+            if self._router.resume(agent_id):
+                logger.info("Agent %s is available again", agent_id)
+        elif self._router.suspend(agent_id):
+            logger.warning("Agent %s suspended (healthy=%s, circuit=%s)", agent_id,
+                           self._healthy.get(agent_id, True), self._breaker(agent_id).state)
+
+    def record(self, agent_id: str, outcome: str) -> None:
+        """
+        Feed the outcome of a delegated task to the agent's breaker.
+
+        Args:
+            agent_id: Agent the task ran on
+            outcome: Task outcome from ``delegator.metrics``; cancelled tasks
+                are ignored
+        """
+        if outcome == COMPLETED:
+            breaker = self._breakers.get(agent_id)
+            if breaker is not None and breaker.record_success():
+                # Also reached by a task that was in flight while the breaker was open
+                logger.info("Circuit for agent %s closed", agent_id)
+                timer = self._timers.pop(agent_id, None)
+                if timer is not None:
+                    timer.cancel()
+                self._refresh(agent_id)
+        elif outcome in (FAILED, TIMEOUT):
+            breaker = self._breaker(agent_id)
+            if breaker.record_failure(time.monotonic()):
+                logger.warning("Circuit for agent %s opened after %d failures",
+                               agent_id, breaker.failures)
+                self._refresh(agent_id)
+                self._schedule_half_open(agent_id, breaker)
+
+    def _schedule_half_open(self, agent_id: str, breaker: CircuitBreaker) -> None:
+        timer = self._timers.pop(agent_id, None)
+        if timer is not None:
+            timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timers[agent_id] = loop.call_later(
+            breaker.reset_timeout, self._half_open, agent_id, breaker)
+
+    def _half_open(self, agent_id: str, breaker: CircuitBreaker) -> None:
+        self._timers.pop(agent_id, None)
+        # The agent may have been re-registered with a fresh breaker meanwhile.
+        if self._breakers.get(agent_id) is breaker and breaker.half_open(time.monotonic()):
+            logger.info("Circuit for agent %s half-open", agent_id)
+            self._refresh(agent_id)
+
+    async def probe(self, agent: Any) -> bool:
+        """
+        Run one health check and cache its answer.
+
+        Returns:
+            True if the agent reported healthy within ``probe_timeout``
+        """
+        try:
+            if asyncio.iscoroutinefunction(agent.health_check):
+                check = agent.health_check()
+            else:
+                loop = asyncio.get_running_loop()
+                check = loop.run_in_executor(None, agent.health_check)
+            healthy = bool(await asyncio.wait_for(check, self.probe_timeout))
+        except Exception as e:
+            logger.warning("Health check of agent %s failed: %s", agent.agent_id, e)
+            healthy = False
+        # Skip agents that were unregistered or replaced while probing.
+        if self._registry is not None and self._registry.get(agent.agent_id) is not agent:
+            return healthy
+        self._healthy[agent.agent_id] = healthy
+        self._last_probe[agent.agent_id] = time.time()
+        self._refresh(agent.agent_id)
+        return healthy
+
+    async def probe_all(self) -> Dict[str, bool]:
+        """
+        Probe every registered agent once.
+
+        Returns:
+            Agent id -> health
+        """
+        if self._registry is None:
+            return {}
+        limit = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+        async def bounded(agent: Any) -> bool:
+            async with limit:
+                return await self.probe(agent)
+
+        agents = self._registry.snapshot()
+        results = await asyncio.gather(*(bounded(agent) for agent in agents))
+        return {agent.agent_id: healthy for agent, healthy in zip(agents, results)}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception:
+                logger.exception("Health probe round failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start probing in the background on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the probe loop and pending half-open timers."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def state(self, agent_id: str) -> Dict[str, Any]:
+        """Return the cached health, circuit state and last probe time of an agent."""
+        breaker = self._breakers.get(agent_id)
+        return {
+            "healthy": self._healthy.get(agent_id, True),
+            "circuit": breaker.state if breaker else CLOSED,
+            "failures": breaker.failures if breaker else 0,
+            "last_probe": self._last_probe.get(agent_id),
+        }
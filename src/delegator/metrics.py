@@ -0,0 +1,68 @@
+"""
+Delegation Metrics
+
+Counts how delegated tasks ended on each agent, and the seconds spent on
+them: ``completed`` (the agent returned a result), ``failed`` (it raised),
+``timeout`` (it ran past its deadline and was cancelled) and ``cancelled``
+(abandoned by the caller, e.g. the losing copy of a hedged task). The
+seconds recorded under ``timeout`` are the time hung agent calls held a
+slot before being cut off.
+"""
+
+from typing import Any, Dict, List
+
+COMPLETED = "completed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+OUTCOMES = (COMPLETED, FAILED, TIMEOUT, CANCELLED)
+
+
+class DelegationMetrics:
+    """Per-agent task outcome counters."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        # agent id -> outcome -> [count, seconds]
+        self._agents: Dict[str, Dict[str, List[float]]] = {}
+
+    def record(self, agent_id: str, outcome: str, elapsed: float) -> None:
+        """
+        Count one finished task.
+
+        Args:
+            agent_id: Agent the task ran on
+            outcome: One of ``completed``, ``failed``, ``timeout`` or ``cancelled``
+            elapsed: Seconds the task ran
+        """
+        counters = self._agents.get(agent_id)
+        if counters is None:
+            counters = self._agents[agent_id] = {name: [0, 0.0] for name in OUTCOMES}
+        entry = counters[outcome]
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def agent(self, agent_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return the counters of one agent (empty if it ran nothing)."""
+        counters = self._agents.get(agent_id, {})
+        return {outcome: {"count": int(count), "seconds": round(seconds, 3)}
+                for outcome, (count, seconds) in counters.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all counters.
+
+        Returns:
+            Dictionary with ``agents`` (per-agent counters) and ``totals``
+            (counters summed over agents)
+        """
+        totals = {name: [0, 0.0] for name in OUTCOMES}
+        for counters in self._agents.values():
+            for outcome, (count, seconds) in counters.items():
+                totals[outcome][0] += count
+                totals[outcome][1] += seconds
+        return {
+            "agents": {agent_id: self.agent(agent_id) for agent_id in self._agents},
+            "totals": {outcome: {"count": int(count), "seconds": round(seconds, 3)}
+                       for outcome, (count, seconds) in totals.items()},
+        }
@@ -0,0 +1,71 @@
+"""
+Agent Registry
+
+Holds registered agents by id. Lookups, registration and removal are O(1)
+dictionary operations. Readers that need the whole set get an immutable
+snapshot tuple: it is built once after a change and then shared, so
+iterating it is never disturbed by agents registering or leaving while the
+reader awaits.
+
+All methods are synchronous, so within one event loop they cannot
+interleave with each other and need no lock.
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+
+from ..agent.cloud_agent import CloudAgent
+
+
+class AgentRegistry:
+    """Registered agents keyed by id, with a copy-on-write snapshot."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._agents: Dict[str, CloudAgent] = {}
+        self._snapshot: Optional[Tuple[CloudAgent, ...]] = ()
+
+    def add(self, agent: CloudAgent) -> Optional[CloudAgent]:
+        """
+        Register an agent.
+
+        Args:
+            agent: Agent to register
+
+        Returns:
+            Previously registered agent with the same id, which it replaces
+        """
+        previous = self._agents.pop(agent.agent_id, None)
+        self._agents[agent.agent_id] = agent
+        self._snapshot = None
+        return previous
+
+    def remove(self, agent_id: str) -> Optional[CloudAgent]:
+        """
+        Unregister an agent.
+
+        Returns:
+            The removed agent, or None if it was not registered
+        """
+        agent = self._agents.pop(agent_id, None)
+        if agent is not None:
+            self._snapshot = None
+        return agent
+
+    def get(self, agent_id: str) -> Optional[CloudAgent]:
+        """Return the agent registered as ``agent_id``, if any."""
+        return self._agents.get(agent_id)
+
+    def snapshot(self) -> Tuple[CloudAgent, ...]:
+        """Return the registered agents in registration order, as an immutable tuple."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._agents.values())
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._agents
+
+    def __iter__(self) -> Iterator[CloudAgent]:
+        return iter(self.snapshot())
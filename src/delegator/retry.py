@@ -0,0 +1,173 @@
+"""
+Retry and Hedging Policies
+
+``RetryPolicy`` decides how often a failed task is attempted again and how
+long to wait in between: exponential backoff with full jitter, so that
+tasks failing together do not retry in lockstep.
+
+``HedgePolicy`` decides when a slow task gets a duplicate on a second agent.
+It keeps a window of recent latencies per action; once a task has run longer
+than a chosen percentile of them, the delegator sends the copy and keeps
+whichever result arrives first.
+"""
+
+import random
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 200
+
+
+class RetryPolicy:
+    """Number of attempts per task and the backoff between them."""
+
+    def __init__(self, max_attempts: int = 1, initial_delay: float = 0.0,
+                 backoff_multiplier: float = 2.0, max_delay: float = DEFAULT_MAX_DELAY,
+                 seed: Optional[int] = None):
+        """
+        Initialize a retry policy.
+
+        Args:
+            max_attempts: Attempts per task, including the first (1 disables retries)
+            initial_delay: Backoff ceiling in seconds before the second attempt
+            backoff_multiplier: Growth of the ceiling per further attempt
+            max_delay: Upper bound of the ceiling in seconds
+            seed: Optional random seed for the jitter
+
+        Raises:
+            ValueError: If ``max_attempts`` is below 1 or a delay is negative
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if initial_delay < 0 or max_delay < 0:
+            raise ValueError("Retry delays must not be negative")
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.backoff_multiplier = backoff_multiplier
+        self.max_delay = max_delay
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]],
+                    settings: Optional[Dict[str, Any]] = None) -> 'RetryPolicy':
+        """
+        Build a policy from a ``retry_policy`` configuration section.
+
+        Reads ``max_attempts``, ``initial_delay_seconds``, ``backoff_multiplier``
+        and ``max_delay_seconds``. Without ``max_attempts``, ``retryAttempts``
+        (the number of retries after the first attempt) is read from the
+        section, then from ``settings``.
+
+        Args:
+            config: Configuration dictionary (None gives a policy without retries)
+            settings: ``cloudAgent.settings`` of cloud-agent-config.json (optional)
+        """
+        config = config or {}
+        settings = settings or {}
+        if 'max_attempts' in config:
+            max_attempts = int(config['max_attempts'])
+        else:
+            retries = config.get('retryAttempts', settings.get('retryAttempts', 0))
+            max_attempts = int(retries) + 1
+        return cls(
+            max_attempts=max_attempts,
+            initial_delay=float(config.get('initial_delay_seconds', 0.0)),
+            backoff_multiplier=float(config.get('backoff_multiplier', 2.0)),
+            max_delay=float(config.get('max_delay_seconds', DEFAULT_MAX_DELAY)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the seconds to wait after failed attempt number ``attempt``.
+
+        The delay is drawn uniformly between 0 and
+        ``initial_delay * backoff_multiplier ** (attempt - 1)``, capped at
+        ``max_delay``.
+        """
+        ceiling = min(self.max_delay,
+                      self.initial_delay * self.backoff_multiplier ** (attempt - 1))
+        return self._rng.uniform(0.0, ceiling)
+
+
+class HedgePolicy:
+    """Delay after which a running task is duplicated onto a second agent."""
+
+    def __init__(self, percentile: float = DEFAULT_PERCENTILE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, window: int = DEFAULT_WINDOW,
+                 min_delay: float = 0.0):
+        """
+        Initialize a hedging policy.
+
+        Args:
+            percentile: Latency percentile (0-100) a task must exceed to be hedged
+            min_samples: Latencies an action needs before its tasks are hedged
+            window: Recent latencies kept per action
+            min_delay: Never hedge before this many seconds
+
+        Raises:
+            ValueError: If ``percentile`` is not within 0-100
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.percentile = percentile
+        self.min_samples = max(1, min_samples)
+        self.window = max(self.min_samples, window)
+        self.min_delay = min_delay
+        self.sent = 0
+        self.won = 0
+        self._latencies: Dict[Optional[str], Deque[float]] = {}
+        # Cached delay per action and the samples recorded since it was computed.
+        self._delays: Dict[Optional[str], float] = {}
+        self._stale: Dict[Optional[str], int] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional['HedgePolicy']:
+        """
+        Build a policy from a ``hedging`` configuration section.
+
+        Returns:
+            The policy, or None when the section is missing or not enabled
+        """
+        if not config or not config.get('enabled', False):
+            return None
+        return cls(
+            percentile=float(config.get('percentile', DEFAULT_PERCENTILE)),
+            min_samples=int(config.get('min_samples', DEFAULT_MIN_SAMPLES)),
+            window=int(config.get('window', DEFAULT_WINDOW)),
+            min_delay=float(config.get('min_delay_seconds', 0.0)),
+        )
+
+    def record(self, action: Optional[str], latency: float) -> None:
+        """Add the latency of a completed task for ``action``."""
+        samples = self._latencies.get(action)
+        if samples is None:
+            samples = self._latencies[action] = deque(maxlen=self.window)
+        samples.append(latency)
+        self._stale[action] = self._stale.get(action, 0) + 1
+
+    def delay(self, action: Optional[str]) -> Optional[float]:
+        """
+        Return the seconds after which a task for ``action`` is hedged.
+
+        Returns:
+            The delay, or None while fewer than ``min_samples`` latencies
+            are known
+        """
+        samples = self._latencies.get(action)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        # Re-sorting the window on every task would dominate dispatch, so
+        # the percentile is refreshed after a tenth of the window changed.
+        if action not in self._delays or self._stale[action] * 10 >= self.window:
+            ordered = sorted(samples)
+            rank = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            self._delays[action] = max(self.min_delay, ordered[rank])
+            self._stale[action] = 0
+        return self._delays[action]
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many hedges were sent and how many finished first."""
+        return {"sent": self.sent, "won": self.won}
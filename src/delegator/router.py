@@ -0,0 +1,365 @@
+"""
+Agent Router
+
+Indexes agents by the ``capabilities`` listed in their configuration and
+picks one agent per task among those able to run its action. Agents that
+declare no capabilities are generic and can run any action.
+
+Strategies:
+
+- ``round_robin``: rotate through the matching agents
+- ``least_inflight``: the matching agent with the fewest running tasks;
+  agents are kept in buckets by in-flight count, so selection and load
+  updates are O(1). The buckets are only maintained when this strategy or
+  a per-agent in-flight limit needs them.
+- ``ewma``: power of two choices; sample two matching agents and take the
+  one with the lower latency EWMA weighted by its in-flight count
+
+Every decision costs O(1) regardless of how many agents are registered;
+registering, removing, suspending or resuming an agent costs
+O(capabilities). A suspended agent stays registered, keeping its load and
+latency, but is left out of selection until it is resumed.
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+ROUND_ROBIN = "round_robin"
+LEAST_INFLIGHT = "least_inflight"
+EWMA = "ewma"
+STRATEGIES = (ROUND_ROBIN, LEAST_INFLIGHT, EWMA)
+
+DEFAULT_EWMA_ALPHA = 0.3
+
+
+def agent_capabilities(agent: Any) -> List[str]:
+    """Return the capabilities an agent declares in its configuration."""
+    config = getattr(agent, 'config', None) or {}
+    return list(config.get('capabilities') or [])
+
+
+class _AgentState:
+    """Routing state of one registered agent."""
+
+    __slots__ = ('agent', 'inflight', 'latency', 'pools', 'suspended')
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+        self.inflight = 0
+        self.latency: Optional[float] = None
+        self.pools: List['_Pool'] = []
+        self.suspended = False
+
+    def score(self) -> float:
+        # Unmeasured agents score 0 so they are tried early.
+        return (self.latency or 0.0) * (self.inflight + 1)
+
+
+class _Pool:
+    """Agents able to run one capability."""
+
+    def __init__(self, track_load: bool = False):
+        self.members: List[_AgentState] = []
+        self._positions: Dict[str, int] = {}
+        self._cursor = 0
+        # In-flight count -> agents at that count (dicts keep insertion order).
+        self._buckets: Dict[int, Dict[str, _AgentState]] = {}
+        self._min_load = 0
+        self.track_load = track_load
+
+    def enable_load_tracking(self) -> None:
+        """Start maintaining the in-flight buckets, indexing current members."""
+        if self.track_load:
+            return
+        self.track_load = True
+        for state in self.members:
+            self._buckets.setdefault(state.inflight, {})[state.agent.agent_id] = state
+        self._min_load = min(self._buckets, default=0)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add(self, state: _AgentState) -> None:
+        agent_id = state.agent.agent_id
+        self._positions[agent_id] = len(self.members)
+        self.members.append(state)
+        if not self.track_load:
+            return
+        self._buckets.setdefault(state.inflight, {})[agent_id] = state
+        if len(self.members) == 1 or state.inflight < self._min_load:
+            self._min_load = state.inflight
+
+    def remove(self, state: _AgentState) -> None:
+        agent_id = state.agent.agent_id
+        position = self._positions.pop(agent_id)
+        last = self.members.pop()
+        if last is not state:
+            self.members[position] = last
+            self._positions[last.agent.agent_id] = position
+        if not self.track_load:
+            return
+        self._take_from_bucket(state.inflight, agent_id)
+        if self._buckets and state.inflight == self._min_load \
+                and self._min_load not in self._buckets:
+            self._min_load = min(self._buckets)
+
+    def _take_from_bucket(self, load: int, agent_id: str) -> None:
+        bucket = self._buckets[load]
+        del bucket[agent_id]
+        if not bucket:
+            del self._buckets[load]
+
+    def move(self, state: _AgentState, old_load: int) -> None:
+        """Re-bucket an agent whose in-flight count changed by one."""
+        agent_id = state.agent.agent_id
+        self._take_from_bucket(old_load, agent_id)
+        self._buckets.setdefault(state.inflight, {})[agent_id] = state
+        if state.inflight < self._min_load:
+            self._min_load = state.inflight
+        elif old_load == self._min_load and old_load not in self._buckets:
+            # Counts change by one, so the new minimum is the next count up.
+            self._min_load = state.inflight
+
+    def round_robin(self) -> _AgentState:
+        self._cursor %= len(self.members)
+        state = self.members[self._cursor]
+        self._cursor += 1
+        return state
+
+    def least_inflight(self) -> _AgentState:
+        return next(iter(self._buckets[self._min_load].values()))
+
+    def two_choices(self, rng: random.Random) -> _AgentState:
+        count = len(self.members)
+        if count == 1:
+            return self.members[0]
+        first = rng.randrange(count)
+        second = rng.randrange(count - 1)
+        if second >= first:
+            second += 1
+        a, b = self.members[first], self.members[second]
+        return a if a.score() <= b.score() else b
+
+
+class AgentRouter:
+    """Selects an agent per task by capability and load."""
+
+    def __init__(self, strategy: str = ROUND_ROBIN, ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+                 seed: Optional[int] = None):
+        """
+        Initialize the router.
+
+        Args:
+            strategy: One of ``round_robin``, ``least_inflight`` or ``ewma``
+            ewma_alpha: Weight of the newest latency sample in the EWMA
+            seed: Optional random seed for the ``ewma`` strategy
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self._rng = random.Random(seed)
+        self._states: Dict[str, _AgentState] = {}
+        self._track_load = strategy == LEAST_INFLIGHT
+        # Every agent, for tasks without an action.
+        self._all = _Pool(self._track_load)
+        # Agents without declared capabilities.
+        self._generic = _Pool(self._track_load)
+        self._pools: Dict[str, _Pool] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, agent_id: str) -> Optional[Any]:
+        """Return the registered agent with ``agent_id``, if any."""
+        state = self._states.get(agent_id)
+        return state.agent if state else None
+
+    def _join(self, state: _AgentState, pool: _Pool) -> None:
+        if not state.suspended:
+            pool.add(state)
+        state.pools.append(pool)
+
+    def add(self, agent: Any) -> None:
+        """
+        Register an agent, replacing any agent with the same id.
+
+        Args:
+            agent: Agent with ``agent_id`` and optional ``config['capabilities']``
+        """
+        self.remove(agent.agent_id)
+        state = _AgentState(agent)
+        self._states[agent.agent_id] = state
+        self._join(state, self._all)
+        capabilities = agent_capabilities(agent)
+        if not capabilities:
+            self._join(state, self._generic)
+            for pool in self._pools.values():
+                self._join(state, pool)
+            return
+        for capability in dict.fromkeys(capabilities):
+            pool = self._pools.get(capability)
+            if pool is None:
+                pool = self._pools[capability] = _Pool(self._track_load)
+                # Suspended generic agents join on resume
+                for generic in self._generic.members:
+                    self._join(generic, pool)
+            self._join(state, pool)
+
+    def remove(self, agent_id: str) -> bool:
+        """
+        Unregister an agent.
+
+        Returns:
+            True if the agent was registered
+        """
+        state = self._states.pop(agent_id, None)
+        if state is None:
+            return False
+        if not state.suspended:
+            for pool in state.pools:
+                pool.remove(state)
+        return True
+
+    def suspend(self, agent_id: str) -> bool:
+        """
+        Stop selecting an agent without unregistering it.
+
+        Tasks already running on it still finish normally.
+
+        Returns:
+            True if the agent was registered and not already suspended
+        """
+        state = self._states.get(agent_id)
+        if state is None or state.suspended:
+            return False
+        for pool in state.pools:
+            pool.remove(state)
+        state.suspended = True
+        return True
+
+    def resume(self, agent_id: str) -> bool:
+        """
+        Make a suspended agent selectable again.
+
+        Returns:
+            True if the agent was registered and suspended
+        """
+        state = self._states.get(agent_id)
+        if state is None or not state.suspended:
+            return False
+        state.suspended = False
+        for pool in state.pools:
+            pool.add(state)
+        if self._generic in state.pools:
+            # Capability pools created while the agent was suspended
+            for pool in self._pools.values():
+                if pool not in state.pools:
+                    self._join(state, pool)
+        return True
+
+    def is_suspended(self, agent_id: str) -> bool:
+        """Return True if the agent is registered but suspended."""
+        state = self._states.get(agent_id)
+        return state is not None and state.suspended
+
+    def _pool_for(self, capability: Optional[str]) -> _Pool:
+        if capability is None:
+            return self._all
+        return self._pools.get(capability, self._generic)
+
+    def can_route(self, capability: Optional[str] = None) -> bool:
+        """Return True if any registered agent can run ``capability``."""
+        return bool(self._pool_for(capability))
+
+    def select(self, capability: Optional[str] = None,
+               max_inflight: Optional[int] = None) -> Optional[Any]:
+        """
+        Pick an agent able to run ``capability``.
+
+        Args:
+            capability: Action of the task (None matches every agent)
+            max_inflight: Skip agents already running this many tasks
+                (turns on load tracking on first use)
+
+        Returns:
+            Selected agent, or None if no agent matches or all matching
+            agents are at ``max_inflight``
+        """
+        pool = self._pool_for(capability)
+        if not pool:
+            return None
+        if self.strategy == LEAST_INFLIGHT:
+            state = pool.least_inflight()
+        elif self.strategy == EWMA:
+            state = pool.two_choices(self._rng)
+        else:
+            state = pool.round_robin()
+        if max_inflight is not None and state.inflight >= max_inflight:
+            self.enable_load_tracking()
+            # Fall back to the least loaded agent, found in O(1).
+            state = pool.least_inflight()
+            if state.inflight >= max_inflight:
+                return None
+        return state.agent
+
+    def enable_load_tracking(self) -> None:
+        """
+        Maintain in-flight buckets from now on.
+
+        Needed for ``select(max_inflight=...)``; costs O(registrations) once.
+        """
+        if self._track_load:
+            return
+        self._track_load = True
+        for pool in [self._all, self._generic] + list(self._pools.values()):
+            pool.enable_load_tracking()
+
+    def _shift_load(self, state: _AgentState, delta: int) -> None:
+        old_load = state.inflight
+        state.inflight += delta
+        if self._track_load and not state.suspended:
+            for pool in state.pools:
+                pool.move(state, old_load)
+
+    def _state_of(self, agent: Any) -> Optional[_AgentState]:
+        # Identity check: a task may finish after its agent was replaced.
+        state = self._states.get(agent.agent_id)
+        return state if state is not None and state.agent is agent else None
+
+    def begin(self, agent: Any) -> None:
+        """Record that a task was sent to ``agent``."""
+        state = self._state_of(agent)
+        if state is not None:
+            self._shift_load(state, 1)
+
+    def finish(self, agent: Any, latency: Optional[float]) -> None:
+        """
+        Record that a task on ``agent`` finished.
+
+        Args:
+            agent: Agent that ran the task
+            latency: Seconds the task took (None if it was abandoned)
+        """
+        state = self._state_of(agent)
+        if state is None:
+            return
+        if state.inflight > 0:
+            self._shift_load(state, -1)
+        if latency is None:
+            return
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency += self.ewma_alpha * (latency - state.latency)
+
+    def stats(self, agent_id: str) -> Dict[str, Any]:
+        """Return the in-flight count and latency EWMA of an agent."""
+        state = self._states.get(agent_id)
+        if state is None:
+            return {}
+        return {"inflight": state.inflight, "latency_ewma": state.latency,
+                "suspended": state.suspended}
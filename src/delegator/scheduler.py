@@ -0,0 +1,271 @@
+"""
+Task Scheduler
+
+Queues tasks in front of a ``TaskDelegator`` by priority (``high``,
+``normal``, ``low``) and dispatches them with a fixed number of workers.
+
+- Weighted fair sharing: each free worker takes the next task from the
+  non-empty priority chosen by smooth weighted round robin, so with the
+  default weights 8:4:1 high-priority tasks get most dispatch slots while
+  low-priority tasks still make progress.
+- Aging: a task that has waited ``aging`` seconds at its priority moves
+  to the front of the next higher priority, so a steady stream of urgent work cannot starve
+  the rest indefinitely.
+- Backpressure: at most ``max_queue`` tasks wait at once. ``submit`` waits
+  for room by default, or raises ``QueueFullError`` with ``wait=False``.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .task_delegator import TaskDelegator
+
+logger = logging.getLogger(__name__)
+
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+PRIORITIES = (HIGH, NORMAL, LOW)
+
+DEFAULT_WEIGHTS = {HIGH: 8, NORMAL: 4, LOW: 1}
+DEFAULT_MAX_QUEUE = 1000
+DEFAULT_CONCURRENCY = 64
+DEFAULT_AGING = 30.0
+
+
+class QueueFullError(Exception):
+    """Raised by ``submit(wait=False)`` when the queue is full."""
+
+
+class TaskScheduler:
+    """Bounded priority queue with weighted fair dispatch and aging."""
+
+    def __init__(self, delegator: TaskDelegator, max_queue: int = DEFAULT_MAX_QUEUE,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 weights: Optional[Dict[str, int]] = None,
+                 aging: Optional[float] = DEFAULT_AGING,
+                 default_priority: str = NORMAL):
+        """
+        Initialize the scheduler.
+
+        Args:
+            delegator: Delegator the tasks are dispatched through
+            max_queue: Tasks allowed to wait at once
+            concurrency: Tasks dispatched at once
+            weights: Dispatch share per priority (default: high 8, normal 4, low 1)
+            aging: Seconds waited at one priority before a task moves up
+                (None disables aging)
+            default_priority: Priority of tasks that name none
+
+        Raises:
+            ValueError: If a limit is below 1, a weight is not positive or
+                ``default_priority`` is unknown
+        """
+        if max_queue < 1 or concurrency < 1:
+            raise ValueError("max_queue and concurrency must be at least 1")
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        if any(weights[priority] < 1 for priority in PRIORITIES):
+            raise ValueError("Priority weights must be positive")
+        if default_priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {default_priority}")
+        self.delegator = delegator
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self.weights = [weights[priority] for priority in PRIORITIES]
+        self.aging = aging
+        self.default_priority = default_priority
+        # One FIFO per priority of (enqueued at, waiting since, task, future)
+        self._queues: List[Deque[Tuple[float, float, Dict[str, Any], asyncio.Future]]] = [
+            deque() for _ in PRIORITIES]
+        self._credit = [0] * len(PRIORITIES)
+        # Created by ``_bind`` inside the loop: before Python 3.10, asyncio
+        # primitives bind to an event loop when they are created
+        self._space: Optional[asyncio.Semaphore] = None
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._counters = {priority: {"submitted": 0, "dispatched": 0, "promoted": 0,
+                                     "wait_seconds": 0.0} for priority in PRIORITIES}
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, delegator: TaskDelegator, config: Optional[Dict[str, Any]],
+                    settings: Optional[Dict[str, Any]] = None) -> 'TaskScheduler':
+        """
+        Build a scheduler from a ``scheduling`` configuration section.
+
+        Without ``default_priority`` in the section, the ``priority`` of
+        ``settings`` is used.
+
+        Args:
+            delegator: Delegator the tasks are dispatched through
+            config: Configuration dictionary (None gives the defaults)
+            settings: ``cloudAgent.settings`` of cloud-agent-config.json (optional)
+        """
+        config = config or {}
+        settings = settings or {}
+        aging = config.get('aging_seconds', DEFAULT_AGING)
+        return cls(
+            delegator,
+            max_queue=int(config.get('max_queue', DEFAULT_MAX_QUEUE)),
+            concurrency=int(config.get('concurrency', DEFAULT_CONCURRENCY)),
+            weights=config.get('weights'),
+            aging=float(aging) if aging else None,
+            default_priority=config.get('default_priority', settings.get('priority', NORMAL)),
+        )
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues)
+
+    def _level(self, priority: Optional[str]) -> int:
+        priority = priority or self.default_priority
+        try:
+            return PRIORITIES.index(priority)
+        except ValueError:
+            raise ValueError(f"Unknown priority: {priority}") from None
+
+    async def submit(self, task: Dict[str, Any], priority: Optional[str] = None,
+                     wait: bool = True) -> asyncio.Future:
+        """
+        Queue a task.
+
+        Args:
+            task: Task specification dictionary
+            priority: ``high``, ``normal`` or ``low`` (default: the task's
+                ``priority`` field, else the scheduler's default)
+            wait: Wait for room when the queue is full instead of raising
+
+        Returns:
+            Future resolved with the task's result (or its exception)
+
+        Raises:
+            QueueFullError: If the queue is full and ``wait`` is False
+            ValueError: If the priority is unknown
+        """
+        level = self._level(priority or task.get('priority'))
+        self._bind()
+        if not wait and self._space.locked():
+            self.rejected += 1
+            raise QueueFullError(f"Task queue is full ({self.max_queue} tasks waiting)")
+        await self._space.acquire()
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        now = time.monotonic()
+        self._queues[level].append((now, now, task, future))
+        self._counters[PRIORITIES[level]]["submitted"] += 1
+        self._ready.release()
+        return future
+
+    async def run(self, task: Dict[str, Any], priority: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue a task and wait for its result.
+
+        Raises:
+            Exception: Whatever ``TaskDelegator.delegate`` raised for it
+        """
+        return await (await self.submit(task, priority))
+
+    def _bind(self) -> None:
+        """Create the queue semaphores on the running loop."""
+        if self._space is None:
+            self._space = asyncio.Semaphore(self.max_queue)
+            self._ready = asyncio.Semaphore(0)
+
+    def _promote(self, now: float) -> None:
+        """Move tasks that waited ``aging`` seconds at their level up one level."""
+        for level in range(1, len(self._queues)):
+            queue = self._queues[level]
+            aged = []
+            while queue and now - queue[0][1] >= self.aging:
+                enqueued, _, task, future = queue.popleft()
+                aged.append((enqueued, now, task, future))
+            if aged:
+                # Aged tasks go ahead of the work already waiting there
+                self._queues[level - 1].extendleft(reversed(aged))
+                self._counters[PRIORITIES[level]]["promoted"] += len(aged)
+
+    def _next(self) -> Tuple[int, Tuple[float, float, Dict[str, Any], asyncio.Future]]:
+        """Pop the next task by smooth weighted round robin over non-empty levels."""
+        now = time.monotonic()
+        if self.aging is not None:
+            self._promote(now)
+        total = 0
+        best = -1
+        for level, queue in enumerate(self._queues):
+            if not queue:
+                # Idle levels do not bank credit
+                self._credit[level] = 0
+                continue
+            self._credit[level] += self.weights[level]
+            total += self.weights[level]
+            if best < 0 or self._credit[level] > self._credit[best]:
+                best = level
+        self._credit[best] -= total
+        return best, self._queues[best].popleft()
+
+    async def _work(self) -> None:
+        while True:
+            await self._ready.acquire()
+            level, (enqueued, _, task, future) = self._next()
+            self._space.release()
+            counters = self._counters[PRIORITIES[level]]
+            counters["dispatched"] += 1
+            counters["wait_seconds"] += time.monotonic() - enqueued
+            if future.cancelled():
+                continue
+            try:
+                result = await self.delegator.delegate(task)
+            except asyncio.CancelledError:
+                # Stopped mid-task: resolve the submitter's future too
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    def start(self) -> None:
+        """Start the dispatch workers on the running loop (done by ``submit``)."""
+        self._bind()
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._work())
+                             for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stop dispatching; tasks still queued or running are cancelled."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for queue in self._queues:
+            while queue:
+                future = queue.popleft()[3]
+                future.cancel()
+                self._space.release()
+        if self._space is not None:
+            self._ready = asyncio.Semaphore(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return queue depth and counters per priority.
+
+        ``promoted`` counts tasks that aged out of a priority and
+        ``avg_wait`` is the mean seconds from submission to dispatch.
+        """
+        priorities = {}
+        for level, priority in enumerate(PRIORITIES):
+            counters = self._counters[priority]
+            dispatched = counters["dispatched"]
+            priorities[priority] = {
+                "queued": len(self._queues[level]),
+                "submitted": counters["submitted"],
+                "dispatched": dispatched,
+                "promoted": counters["promoted"],
+                "avg_wait": round(counters["wait_seconds"] / dispatched, 4) if dispatched else 0.0,
+            }
+        return {"queued": len(self), "max_queue": self.max_queue,
+                "rejected": self.rejected, "priorities": priorities}
@@ -2,24 +2,125 @@
 Task Delegator
 
 Handles delegation of tasks to cloud agents.
+
+Agents live in an ``AgentRegistry`` (O(1) lookup by id) and are indexed by
+an ``AgentRouter`` for selection. Both are only changed by synchronous code,
+so dispatch reads them without taking a lock and registration never waits
+for, or stalls, in-flight tasks.
+
+A ``RetryPolicy`` re-runs tasks whose agent raised, after a jittered
+backoff; routed retries may land on another agent. A ``HedgePolicy`` sends a
+duplicate of a routed task to a second agent once it has run longer than
+the usual latency of its action, and cancels whichever copy loses.
+
+Every attempt has a deadline: the task's ``timeout``, else the agent's
+configured ``timeout``, else the delegator's default. An agent call still
+running at its deadline is cancelled and, once no attempts remain, the task
+ends with a ``timeout`` result instead of holding its slot forever. Agents
+that are not ``cancellable`` keep working after the call is cancelled, so
+their timed-out tasks end at once instead of being retried next to the
+abandoned run.
+
+With a ``HealthMonitor`` attached, task outcomes feed per-agent circuit
+breakers and agents that fail probes or trip their breaker are suspended
+in the router, so routed tasks skip them without waiting on a probe.
+
+With a ``ResultCache``, successful results of the actions it lists are
+memoized by task and input fingerprint, and repeated tasks are answered
+without being dispatched. Fingerprinting and disk lookups run on a worker
+thread.
 """
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from ..agent.cloud_agent import CloudAgent
+from ..cache import ResultCache, cache_key
+from .health import HealthMonitor
+from .metrics import CANCELLED, COMPLETED, FAILED, TIMEOUT, DelegationMetrics
+from .registry import AgentRegistry
+from .retry import HedgePolicy, RetryPolicy
+from .router import ROUND_ROBIN, AgentRouter
 
 logger = logging.getLogger(__name__)
 
+# Default number of tasks ``delegate_many`` runs at once.
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Markers put on the result queue by the task feeder.
+_DONE = object()
+_FAILED = object()
+
+
+class TaskTimeoutError(asyncio.TimeoutError):
+    """Raised when an agent does not finish a task before its deadline."""
+    
+    def __init__(self, agent_id: str, timeout: float, elapsed: float):
+        """
+        Initialize the error.
+        
+        Args:
+            agent_id: Agent that was running the task
+            timeout: Deadline in seconds
+            elapsed: Seconds the task ran before it was cancelled
+        """
+        super().__init__(f"Agent {agent_id} timed out after {timeout:g}s")
+        self.agent_id = agent_id
+        self.timeout = timeout
+        self.elapsed = elapsed
+    
+    def to_result(self) -> Dict[str, Any]:
+        """Return the structured result reported for the timed-out task."""
+        return {
+            "status": "timeout",
+            "message": str(self),
+            "agent_id": self.agent_id,
+            "timeout": self.timeout,
+            "elapsed": round(self.elapsed, 3),
+        }
+
 
 class TaskDelegator:
     """Delegates tasks to registered cloud agents."""
     
-    def __init__(self):
-        """Initialize the task delegator."""
-        self.agents: List[CloudAgent] = []
-        self._current_agent_index: int = 0
-        self._index_lock: asyncio.Lock = asyncio.Lock()
+    def __init__(self, strategy: str = ROUND_ROBIN,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 hedge_policy: Optional[HedgePolicy] = None,
+                 default_timeout: Optional[float] = None,
+                 health_monitor: Optional[HealthMonitor] = None,
+                 result_cache: Optional[ResultCache] = None):
+        """
+        Initialize the task delegator.
+        
+        Args:
+            strategy: Routing strategy among agents able to run a task's
+                action (``round_robin``, ``least_inflight`` or ``ewma``)
+            retry_policy: Attempts and backoff for tasks whose agent raised
+                (default: a single attempt)
+            hedge_policy: When to duplicate slow routed tasks (default: never)
+            default_timeout: Deadline in seconds for agents without a
+                configured ``timeout`` (default: none)
+            health_monitor: Probes agents and trips circuit breakers on
+                failures (default: none; start its loop with ``start()``)
+            result_cache: Memoizes results of the actions it lists
+                (default: none)
+        """
+        self.agents = AgentRegistry()
+        self.router = AgentRouter(strategy)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hedge_policy = hedge_policy
+        self.default_timeout = default_timeout
+        self.metrics = DelegationMetrics()
+        self.health_monitor = health_monitor
+        self.result_cache = result_cache
+        if health_monitor is not None:
+            health_monitor.attach(self.agents, self.router)
+        # Signalled when a task finishes, for callers waiting on a per-agent
+        # limit. Created on first use inside the loop: before Python 3.10,
+        # asyncio primitives bind to an event loop when they are created.
+        self._capacity: Optional[asyncio.Condition] = None
+        self._capacity_waiters: int = 0
     
     async def register_agent(self, agent: CloudAgent) -> None:
         """
@@ -28,13 +129,15 @@ class TaskDelegator:
         Args:
             agent: CloudAgent instance to register
         """
-        # Check health before acquiring lock to avoid blocking
         if not agent.health_check():
             logger.warning(f"Agent {agent.agent_id} failed health check")
             return
         
-        async with self._index_lock:
-            self.agents.append(agent)
+        if self.health_monitor is not None:
+            self.health_monitor.forget(agent.agent_id)
+        self.agents.add(agent)
+        self.router.add(agent)
+        await self._notify_capacity()
         logger.info(f"Agent {agent.agent_id} registered successfully")
     
     async def unregister_agent(self, agent_id: str) -> bool:
@@ -47,49 +150,326 @@ class TaskDelegator:
         Returns:
             True if agent was found and removed, False otherwise
         """
-        async with self._index_lock:
-            for i, agent in enumerate(self.agents):
-                if agent.agent_id == agent_id:
-                    self.agents.pop(i)
-                    # Reset round-robin index if it's out of bounds or no agents left
-                    if not self.agents or self._current_agent_index >= len(self.agents):
-                        self._current_agent_index = 0
-                    logger.info(f"Agent {agent_id} unregistered")
-                    return True
-        return False
+        if self.agents.remove(agent_id) is None:
+            return False
+        self.router.remove(agent_id)
+        if self.health_monitor is not None:
+            self.health_monitor.forget(agent_id)
+        # Waiters re-check whether their action can still be routed
+        await self._notify_capacity()
+        logger.info(f"Agent {agent_id} unregistered")
+        return True
     
     async def delegate(self, task: Dict[str, Any], agent_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Delegate a task to a cloud agent.
         
+        Without ``agent_id`` the router picks one of the agents whose
+        configured capabilities include the task's ``action`` (agents without
+        capabilities accept any action), using the delegator's strategy.
+        Failed or timed-out attempts are retried and slow routed attempts
+        hedged according to the delegator's policies.
+        
         Args:
             task: Task specification dictionary
             agent_id: Optional specific agent ID to use
             
         Returns:
-            Result dictionary from task execution
+            Result dictionary from task execution, or a result with status
+            ``timeout`` if the last attempt ran past its deadline
             
         Raises:
-            ValueError: If no agents are available or specified agent not found
+            ValueError: If no agents are available, the specified agent is not
+                found, or no agent can run the task's action
+            Exception: Whatever the agent raised on the last attempt
+        """
+        return await self._run(task, agent_id, None)
+    
+    async def _run(self, task: Dict[str, Any], agent_id: Optional[str],
+                   per_agent_limit: Optional[int]) -> Dict[str, Any]:
+        """Answer ``task`` from the result cache or run it."""
+        cache = self.result_cache
+        if cache is None or task.get('action') not in cache.actions:
+            return await self._run_uncached(task, agent_id, per_agent_limit)
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(None, self._cache_lookup, task)
+        if cached is not None:
+            logger.debug("Answered %s task from the result cache", task.get('action'))
+            return cached
+        result = await self._run_uncached(task, agent_id, per_agent_limit)
+        if result.get('status') == 'success':
+            await loop.run_in_executor(None, cache.put, key, result, task.get('input'))
+        return result
+    
+    def _cache_lookup(self, task: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Fingerprint the task's input and look it up (blocking)."""
+        key = cache_key(task, task.get('input'))
+        return key, self.result_cache.get(key)
+    
+    async def _run_uncached(self, task: Dict[str, Any], agent_id: Optional[str],
+                            per_agent_limit: Optional[int]) -> Dict[str, Any]:
+        """Select an agent and execute ``task``, retrying per the retry policy."""
+        attempt = 1
+        while True:
+            agent = await self._acquire_agent(task.get('action'), per_agent_limit, agent_id)
+            logger.debug("Delegating task to agent %s", agent.agent_id)
+            try:
+                if agent_id is None and self.hedge_policy is not None:
+                    return await self._execute_hedged(agent, task, per_agent_limit)
+                return await self._execute(agent, task)
+            except Exception as e:
+                if isinstance(e, TaskTimeoutError) and not agent.cancellable:
+                    # The abandoned run goes on; a retry would run the task twice at once
+                    return e.to_result()
+                if attempt >= self.retry_policy.max_attempts:
+                    if isinstance(e, TaskTimeoutError):
+                        return e.to_result()
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning("Attempt %d on agent %s failed (%s); retrying in %.2fs",
+                               attempt, agent.agent_id, e, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+    
+    def _timeout_for(self, agent: CloudAgent, task: Dict[str, Any]) -> Optional[float]:
+        """Return the deadline for ``task`` on ``agent`` in seconds, if any."""
+        return task.get('timeout') or agent.config.get('timeout') or self.default_timeout
+    
+    async def _execute(self, agent: CloudAgent, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a task on an agent already counted as busy, then release it.
+        
+        Raises:
+            TaskTimeoutError: If the agent ran past the task's deadline; its
+                ``execute`` coroutine is cancelled
         """
-        # Select agent with thread-safe access
-        async with self._index_lock:
+        timeout = self._timeout_for(agent, task)
+        start = time.perf_counter()
+        # Stays None if the task is cancelled, e.g. as the losing hedge,
+        # so an abandoned run does not count as a latency sample.
+        latency: Optional[float] = None
+        outcome = CANCELLED
+        try:
+            if timeout:
+                result = await asyncio.wait_for(agent.execute(task), timeout)
+            else:
+                result = await agent.execute(task)
+            latency = time.perf_counter() - start
+            outcome = COMPLETED
+            if self.hedge_policy is not None:
+                self.hedge_policy.record(task.get('action'), latency)
+            return result
+        except asyncio.TimeoutError:
+            latency = time.perf_counter() - start
+            if not timeout or latency < timeout:
+                # Raised by the agent itself, not by the deadline
+                outcome = FAILED
+                raise
+            outcome = TIMEOUT
+            logger.warning("Agent %s timed out after %gs", agent.agent_id, timeout)
+            raise TaskTimeoutError(agent.agent_id, timeout, latency) from None
+        except Exception:
+            latency = time.perf_counter() - start
+            outcome = FAILED
+            raise
+        finally:
+            self.metrics.record(agent.agent_id, outcome, time.perf_counter() - start)
+            if self.health_monitor is not None:
+                self.health_monitor.record(agent.agent_id, outcome)
+            self.router.finish(agent, latency)
+            if self._capacity_waiters:
+                await self._notify_capacity()
+    
+    async def _execute_hedged(self, agent: CloudAgent, task: Dict[str, Any],
+                              per_agent_limit: Optional[int]) -> Dict[str, Any]:
+        """
+        Run a task on ``agent``, adding a copy on a second agent if it is slow.
+        
+        The first copy to succeed wins and the other is cancelled. If one copy
+        fails, the other one's outcome is returned instead. Only cancellable
+        agents are hedged, as a losing copy on any other agent would keep
+        running next to the winner.
+        """
+        action = task.get('action')
+        delay = self.hedge_policy.delay(action)
+        if delay is None or not agent.cancellable:
+            return await self._execute(agent, task)
+        
+        running = {asyncio.ensure_future(self._execute(agent, task))}
+        try:
+            done, running = await asyncio.wait(running, timeout=delay)
+            if done:
+                return done.pop().result()
+            backup = self.router.select(action, per_agent_limit)
+            if backup is not None and backup is not agent and backup.cancellable:
+                self.router.begin(backup)
+                self.hedge_policy.sent += 1
+                logger.debug("Hedging task on agent %s with agent %s",
+                             agent.agent_id, backup.agent_id)
+                hedge = asyncio.ensure_future(self._execute(backup, task))
+                running.add(hedge)
+            else:
+                hedge = None
+            while True:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [future for future in done if future.exception() is None]
+                if succeeded:
+                    if hedge in succeeded:
+                        self.hedge_policy.won += 1
+                    return (hedge if hedge in succeeded else succeeded[0]).result()
+                if not running:
+                    return done.pop().result()
+        finally:
+            for future in running:
+                future.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    def _capacity_condition(self) -> asyncio.Condition:
+        """Return the capacity condition, creating it on the running loop."""
+        if self._capacity is None:
+            self._capacity = asyncio.Condition()
+        return self._capacity
+    
+    async def _notify_capacity(self) -> None:
+        """Wake callers waiting for an agent below its per-agent limit."""
+        if self._capacity_waiters:
+            capacity = self._capacity_condition()
+            async with capacity:
+                capacity.notify_all()
+    
+    async def _acquire_agent(self, action: Optional[str], per_agent_limit: Optional[int],
+                             agent_id: Optional[str] = None) -> CloudAgent:
+        """
+        Select an agent for ``action`` and count it as busy.
+        
+        Selection runs without awaiting, so it cannot interleave with other
+        coroutines and needs no lock. With ``per_agent_limit`` it waits until
+        some matching agent is below the limit.
+        
+        Raises:
+            ValueError: If no agents are registered, ``agent_id`` is not
+                registered, or no registered agent can run ``action``
+        """
+        if agent_id:
+            agent = self.agents.get(agent_id)
+        else:
+            agent = self.router.select(action, per_agent_limit)
+        if agent is None and (agent_id or per_agent_limit is None):
             if not self.agents:
                 raise ValueError("No agents registered")
-            
             if agent_id:
-                agent = next((a for a in self.agents if a.agent_id == agent_id), None)
-                if not agent:
-                    raise ValueError(f"Agent {agent_id} not found")
+                raise ValueError(f"Agent {agent_id} not found")
+            raise ValueError(f"No agent can handle action: {action}")
+        if agent is None:
+            self._capacity_waiters += 1
+            try:
+                capacity = self._capacity_condition()
+                async with capacity:
+                    while agent is None:
+                        if not self.router.can_route(action):
+                            raise ValueError(f"No agent can handle action: {action}")
+                        await capacity.wait()
+                        agent = self.router.select(action, per_agent_limit)
+            finally:
+                self._capacity_waiters -= 1
+        self.router.begin(agent)
+        return agent
+    
+    async def delegate_many(self, tasks: Union[Iterable[Dict[str, Any]],
+                                               AsyncIterable[Dict[str, Any]]],
+                            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                            per_agent_limit: Optional[int] = None,
+                            ordered: bool = False) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Delegate many tasks, streaming results back as they finish.
+        
+        A fixed set of ``max_concurrency`` workers pulls tasks from the
+        source, so memory and coroutine count stay bounded however many tasks
+        are submitted; the source is only read as far ahead as results are
+        consumed. Each task is routed, retried and hedged like ``delegate``
+        without an agent id. A task that fails yields an error result instead
+        of stopping the stream.
+        
+        Args:
+            tasks: Iterable or async iterable of task dictionaries
+            max_concurrency: Maximum tasks running at once
+            per_agent_limit: Maximum tasks running at once on any one agent
+            ordered: Yield results in input order instead of completion order
+            
+        Yields:
+            (input index, result dictionary)
+            
+        Raises:
+            ValueError: If ``max_concurrency`` or ``per_agent_limit`` is below 1
+        """
+        if max_concurrency < 1 or (per_agent_limit is not None and per_agent_limit < 1):
+            raise ValueError("Concurrency limits must be at least 1")
+        
+        inbox: asyncio.Queue = asyncio.Queue()
+        outbox: asyncio.Queue = asyncio.Queue()
+        # Tasks read from the source but not yet yielded; bounds both queues
+        # and, in ordered mode, the reorder buffer.
+        window = asyncio.Semaphore(max_concurrency * 2)
+        
+        async def feed() -> None:
+            count = 0
+            try:
+                if hasattr(tasks, '__aiter__'):
+                    async for task in tasks:
+                        await window.acquire()
+                        inbox.put_nowait((count, task))
+                        count += 1
+                else:
+                    for task in tasks:
+                        await window.acquire()
+                        inbox.put_nowait((count, task))
+                        count += 1
+            except Exception as e:
+                outbox.put_nowait((_FAILED, e))
             else:
-                # Round-robin selection
-                agent = self.agents[self._current_agent_index]
-                self._current_agent_index = (self._current_agent_index + 1) % len(self.agents)
+                outbox.put_nowait((_DONE, count))
+            for _ in range(max_concurrency):
+                inbox.put_nowait(None)
         
-        # Execute task outside the lock to allow concurrent execution
-        logger.info(f"Delegating task to agent {agent.agent_id}")
-        result = await agent.execute(task)
-        return result
+        async def work() -> None:
+            while True:
+                item = await inbox.get()
+                if item is None:
+                    return
+                index, task = item
+                try:
+                    result = await self._run(task, None, per_agent_limit)
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+                outbox.put_nowait((index, result))
+        
+        feeder = asyncio.create_task(feed())
+        workers = [asyncio.create_task(work()) for _ in range(max_concurrency)]
+        try:
+            total: Optional[int] = None
+            yielded = 0
+            pending: Dict[int, Dict[str, Any]] = {}
+            while total is None or yielded < total:
+                index, result = await outbox.get()
+                if index is _DONE:
+                    total = result
+                    continue
+                if index is _FAILED:
+                    raise result
+                if ordered:
+                    pending[index] = result
+                    while yielded in pending:
+                        window.release()
+                        yield yielded, pending.pop(yielded)
+                        yielded += 1
+                else:
+                    window.release()
+                    yielded += 1
+                    yield index, result
+        finally:
+            for task in [feeder] + workers:
+                task.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
     
     async def list_agents(self) -> List[Dict[str, Any]]:
         """
@@ -98,5 +478,4 @@ class TaskDelegator:
         Returns:
             List of agent capability dictionaries
         """
-        async with self._index_lock:
-            return [agent.get_capabilities() for agent in self.agents]
+        return [agent.get_capabilities() for agent in self.agents.snapshot()]
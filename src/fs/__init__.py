@@ -0,0 +1,15 @@
+"""Filesystem access module"""
+
+from .entry import FileEntry
+from .file_index import ChangeSet, FileIndex, FileIndexCache, scan_tree
+from .zip_fs import ZipFileSystem, is_zip_archive
+
+__all__ = [
+    'ChangeSet',
+    'FileEntry',
+    'FileIndex',
+    'FileIndexCache',
+    'ZipFileSystem',
+    'is_zip_archive',
+    'scan_tree',
+]
@@ -0,0 +1,16 @@
+"""
+File Entries
+
+Lightweight records describing files found by the filesystem layer.
+"""
+
+from typing import NamedTuple
+
+
+class FileEntry(NamedTuple):
+    """A file discovered while indexing a tree."""
+
+    path: str
+    name: str
+    size: int
+    mtime_ns: int
@@ -0,0 +1,409 @@
+"""
+File Index
+
+Builds an index of a directory tree with ``os.scandir``, collecting each
+file's name, size and modification time once. Subdirectories are scanned in
+parallel on a thread pool, which pays off on network filesystems where every
+metadata call is a round trip.
+
+A ``FileIndexCache`` keeps one index per root; a root is built or
+revalidated by one thread at a time while other roots proceed. Revalidating
+a cached index stats every directory: a directory whose mtime changed is
+rescanned, new subdirectories are indexed and vanished ones are dropped.
+Directory mtimes change when entries are added, removed or renamed, but not
+when an existing file is rewritten in place. Callers that depend on file
+contents can ask ``refresh`` to re-stat the files of unchanged directories
+as well (one ``lstat`` per file, in parallel, without listing the
+directories again); the cache does so, because its indexes feed
+result-cache fingerprints.
+"""
+
+import os
+import stat
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .entry import FileEntry
+
+# Scanning is I/O bound, so use more threads than cores.
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class DirRecord:
+    """Scan result for a single directory."""
+
+    __slots__ = ('mtime_ns', 'files', 'subdirs')
+
+    def __init__(self, mtime_ns: int, files: List[FileEntry], subdirs: List[str]):
+        """
+        Initialize a directory record.
+
+        Args:
+            mtime_ns: Directory mtime when it was scanned (-1 if unreadable)
+            files: Files directly inside the directory
+            subdirs: Full paths of direct subdirectories
+        """
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+class ChangeSet:
+    """Files added, removed or modified between two index states."""
+
+    def __init__(self):
+        """Initialize an empty change set."""
+        self.added: List[FileEntry] = []
+        self.removed: List[FileEntry] = []
+        self.modified: List[FileEntry] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def _dir_mtime(path: str) -> int:
+    """Return a directory's mtime in nanoseconds, or -1 if it is gone."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def scan_directory(path: str) -> DirRecord:
+    """
+    Scan one directory level.
+
+    Symlinks are not followed. Unreadable directories yield an empty record.
+
+    Args:
+        path: Directory to scan
+
+    Returns:
+        Record of the directory's files and subdirectories
+    """
+    # Take the mtime first so a concurrent change forces a later rescan.
+    mtime_ns = _dir_mtime(path)
+    files: List[FileEntry] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        files.append(FileEntry(entry.path, entry.name, st.st_size,
+                                               st.st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        return DirRecord(-1, [], [])
+    return DirRecord(mtime_ns, files, subdirs)
+
+
+def restat_files(files: List[FileEntry]) -> List[FileEntry]:
+    """
+    Re-stat already indexed files without listing their directory.
+
+    Args:
+        files: Entries of one directory
+
+    Returns:
+        Current entries; files that vanished or are no longer regular files
+        are left out
+    """
+    current: List[FileEntry] = []
+    for entry in files:
+        try:
+            st = os.lstat(entry.path)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        if (st.st_size, st.st_mtime_ns) == (entry.size, entry.mtime_ns):
+            current.append(entry)
+        else:
+            current.append(entry._replace(size=st.st_size, mtime_ns=st.st_mtime_ns))
+    return current
+
+
+def scan_tree(root: str) -> Iterator[FileEntry]:
+    """
+    Lazily yield every file under ``root`` without building an index.
+
+    Memory use is bounded by the directory depth, not the tree size.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        File entries in depth-first order
+    """
+    pending = [root]
+    while pending:
+        record = scan_directory(pending.pop())
+        yield from record.files
+        pending.extend(reversed(record.subdirs))
+
+
+def _scan_subtrees(roots: List[str], executor: Executor) -> Dict[str, DirRecord]:
+    """Scan several subtrees in parallel, one task per directory."""
+    dirs: Dict[str, DirRecord] = {}
+    futures = {executor.submit(scan_directory, path): path for path in roots}
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            path = futures.pop(future)
+            record = future.result()
+            dirs[path] = record
+            for subdir in record.subdirs:
+                futures[executor.submit(scan_directory, subdir)] = subdir
+    return dirs
+
+
+class FileIndex:
+    """In-memory index of all files under a root directory."""
+
+    def __init__(self, root: str, dirs: Dict[str, DirRecord]):
+        """
+        Initialize an index.
+
+        Args:
+            root: Indexed root directory
+            dirs: Records for the root and every directory below it
+        """
+        self.root = root
+        self.dirs = dirs
+
+    @classmethod
+    def build(cls, root: str, executor: Executor) -> 'FileIndex':
+        """
+        Index ``root`` by scanning its directories in parallel.
+
+        Args:
+            root: Directory to index
+            executor: Thread pool used for scanning
+        """
+        return cls(root, _scan_subtrees([root], executor))
+
+    def _drop_subtree(self, path: str, changes: ChangeSet) -> None:
+        """Remove ``path`` and its descendants from the index."""
+        pending = [path]
+        while pending:
+            record = self.dirs.pop(pending.pop(), None)
+            if record is not None:
+                changes.removed.extend(record.files)
+                pending.extend(record.subdirs)
+
+    def refresh(self, executor: Executor, restat: bool = False) -> ChangeSet:
+        """
+        Revalidate the index against the filesystem.
+
+        Directories whose mtime changed are rescanned. With ``restat`` the
+        files of the other directories are re-stated too, so files
+        rewritten in place are picked up as well.
+
+        Args:
+            executor: Thread pool used for stat and scan calls
+            restat: Whether to re-stat files in unchanged directories
+
+        Returns:
+            Files added, removed or modified since the last refresh
+        """
+        changes = ChangeSet()
+        paths = list(self.dirs)
+        mtimes = dict(zip(paths, executor.map(_dir_mtime, paths)))
+        stale = [path for path in paths
+                 if path in self.dirs and mtimes[path] != self.dirs[path].mtime_ns]
+        if restat:
+            self._restat_unchanged(paths, set(stale), executor, changes)
+        if not stale:
+            return changes
+
+        rescanned = dict(zip(stale, executor.map(scan_directory, stale)))
+        new_subtrees: List[str] = []
+        for path, record in rescanned.items():
+            old = self.dirs.get(path)
+            if old is None:
+                continue  # dropped as part of a vanished parent
+            if record.mtime_ns == -1 and path != self.root:
+                self._drop_subtree(path, changes)
+                continue
+
+            old_files = {entry.name: entry for entry in old.files}
+            for entry in record.files:
+                previous = old_files.pop(entry.name, None)
+                if previous is None:
+                    changes.added.append(entry)
+                elif (previous.size, previous.mtime_ns) != (entry.size, entry.mtime_ns):
+                    changes.modified.append(entry)
+            changes.removed.extend(old_files.values())
+
+            current_subdirs = set(record.subdirs)
+            for subdir in old.subdirs:
+                if subdir not in current_subdirs:
+                    self._drop_subtree(subdir, changes)
+            new_subtrees.extend(d for d in record.subdirs if d not in self.dirs)
+            self.dirs[path] = record
+
+        if new_subtrees:
+            added_dirs = _scan_subtrees(new_subtrees, executor)
+            for record in added_dirs.values():
+                changes.added.extend(record.files)
+            self.dirs.update(added_dirs)
+        return changes
+
+    def _restat_unchanged(self, paths: List[str], stale: Set[str], executor: Executor,
+                          changes: ChangeSet) -> None:
+        """Re-stat the files of directories that are not being rescanned."""
+        unchanged = [path for path in paths if path not in stale and self.dirs[path].files]
+        restated = executor.map(restat_files, [self.dirs[path].files for path in unchanged])
+        for path, files in zip(unchanged, restated):
+            record = self.dirs[path]
+            if files == record.files:
+                continue
+            current = {entry.name for entry in files}
+            changes.removed.extend(entry for entry in record.files if entry.name not in current)
+            previous = {entry.name: entry for entry in record.files}
+            changes.modified.extend(entry for entry in files if entry != previous[entry.name])
+            record.files = files
+
+    def iter_files(self) -> Iterator[FileEntry]:
+        """Yield every indexed file."""
+        # Iterate a snapshot, a concurrent refresh may add or drop directories
+        for record in list(self.dirs.values()):
+            yield from record.files
+
+    def walk(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Walk the indexed tree top-down, like ``os.walk``.
+
+        Yields:
+            (directory path, subdirectory names, file names)
+        """
+        pending = [self.root]
+        while pending:
+            path = pending.pop()
+            record = self.dirs.get(path)
+            if record is None:
+                continue
+            yield (path, [os.path.basename(d) for d in record.subdirs],
+                   [entry.name for entry in record.files])
+            pending.extend(reversed(record.subdirs))
+
+    def file_count(self) -> int:
+        """Return the number of indexed files."""
+        return sum(len(record.files) for record in list(self.dirs.values()))
+
+
+class FileIndexCache:
+    """Caches one ``FileIndex`` per root, revalidated on every lookup."""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            workers: Number of scanning threads (default: 4x CPU count, max 32)
+        """
+        self.workers = workers or DEFAULT_SCAN_WORKERS
+        self._indexes: Dict[Tuple[str, str], FileIndex] = {}
+        # Guards the dictionaries and the pool; each root has its own lock
+        # held while it is built or refreshed
+        self._lock = threading.Lock()
+        self._root_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Indexes pinned by the current thread, see ``pinned``
+        self._local = threading.local()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool used for scanning, shared with callers doing metadata I/O."""
+        with self._lock:
+            return self._get_executor()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the scanning pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="file-index")
+        return self._executor
+
+    def get(self, root: str) -> FileIndex:
+        """
+        Return an up-to-date index of ``root``.
+
+        Args:
+            root: Directory to index
+        """
+        key = (os.path.abspath(root), root)
+        pinned = getattr(self._local, 'pins', {}).get(key)
+        if pinned is not None:
+            return pinned
+        with self._lock:
+            executor = self._get_executor()
+            root_lock = self._root_locks.setdefault(key, threading.Lock())
+        with root_lock:
+            with self._lock:
+                index = self._indexes.get(key)
+            if index is None:
+                index = FileIndex.build(root, executor)
+                with self._lock:
+                    self._indexes[key] = index
+            else:
+                index.refresh(executor, restat=True)
+            return index
+
+    @contextmanager
+    def pinned(self, root: str) -> Iterator[FileIndex]:
+        """
+        Revalidate the index of ``root`` once for a block of work.
+
+        Inside the block, ``get(root)`` on the same thread returns that index
+        without revalidating it again, so a caller that fingerprints a tree
+        and then processes it stats the tree only once.
+
+        Args:
+            root: Directory to index
+
+        Yields:
+            The up-to-date index
+        """
+        index = self.get(root)
+        pins = self._local.__dict__.setdefault('pins', {})
+        key = (os.path.abspath(root), root)
+        previous = pins.get(key)
+        pins[key] = index
+        try:
+            yield index
+        finally:
+            if previous is None:
+                del pins[key]
+            else:
+                pins[key] = previous
+
+    def invalidate(self, root: Optional[str] = None) -> None:
+        """
+        Drop cached indexes.
+
+        Args:
+            root: Root to drop (default: all roots)
+        """
+        with self._lock:
+            if root is None:
+                self._indexes.clear()
+                self._root_locks.clear()
+                return
+            target = os.path.abspath(root)
+            for key in [key for key in self._indexes if key[0] == target]:
+                del self._indexes[key]
+                self._root_locks.pop(key, None)
+
+    def close(self) -> None:
+        """Shut down the scanning pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,195 @@
+"""
+Zip Virtual Filesystem
+
+Exposes a zip archive as a read-only directory tree without extracting it.
+The archive is memory-mapped; the tree is built from the central directory
+alone and member contents are only decompressed when they are opened.
+"""
+
+import io
+import mmap
+import os
+import posixpath
+import time
+import zipfile
+from typing import Dict, IO, Iterator, List, Tuple
+
+from ..archive import formats
+from .entry import FileEntry
+
+
+def is_zip_archive(path: str) -> bool:
+    """
+    Check whether ``path`` is a zip archive (by magic bytes).
+
+    Args:
+        path: Filesystem path
+
+    Returns:
+        True if ``path`` is a regular file holding a zip archive
+    """
+    return (os.path.isfile(path) and os.path.getsize(path) > 0
+            and formats.detect_archive_format(path) == formats.ZIP)
+
+
+class _MappedFile(io.RawIOBase):
+    """Seekable read-only stream over a memory map, as ``zipfile`` expects."""
+
+    def __init__(self, mapping: mmap.mmap):
+        super().__init__()
+        self._map = mapping
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._map) + offset
+        return self._pos
+
+    def readinto(self, b) -> int:
+        size = max(0, min(len(b), len(self._map) - self._pos))
+        b[:size] = self._map[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+
+class ZipFileSystem:
+    """Read-only, lazily-read directory tree backed by a zip archive."""
+
+    def __init__(self, zip_path: str):
+        """
+        Map the archive and index its central directory.
+
+        Args:
+            zip_path: Path to the zip archive
+
+        Raises:
+            zipfile.BadZipFile: If the archive is invalid
+        """
+        self.zip_path = zip_path
+        self._file = open(zip_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._archive = zipfile.ZipFile(_MappedFile(self._map), 'r')
+        except zipfile.BadZipFile:
+            self._close_mapping()
+            raise
+        # Relative directory path -> (subdirectory names, file names).
+        self._dirs: Dict[str, Tuple[set, List[str]]] = {'': (set(), [])}
+        # Relative file path -> ZipInfo.
+        self._files: Dict[str, zipfile.ZipInfo] = {}
+        self._build_tree()
+
+    def _ensure_dir(self, rel_dir: str) -> None:
+        """Register ``rel_dir`` and all of its parents."""
+        while rel_dir not in self._dirs:
+            self._dirs[rel_dir] = (set(), [])
+            parent, name = posixpath.split(rel_dir)
+            self._dirs.setdefault(parent, (set(), []))[0].add(name)
+            rel_dir = parent
+
+    def _build_tree(self) -> None:
+        """Build the virtual tree from the central directory."""
+        for info in self._archive.infolist():
+            parts = [p for p in info.filename.replace('\\', '/').split('/')
+                     if p not in ('', '.', '..')]
+            if not parts:
+                continue
+            rel = '/'.join(parts)
+            if info.is_dir():
+                self._ensure_dir(rel)
+                continue
+            parent = posixpath.dirname(rel)
+            self._ensure_dir(parent)
+            self._dirs[parent][1].append(parts[-1])
+            self._files[rel] = info
+
+    def _to_path(self, rel: str) -> str:
+        """Map a relative member path to its display path."""
+        if not rel:
+            return self.zip_path
+        return os.path.join(self.zip_path, *rel.split('/'))
+
+    def _to_rel(self, path: str) -> str:
+        """Accept either a member path or a display path under the archive."""
+        prefix = self.zip_path + os.sep
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+        return path.replace(os.sep, '/').strip('/')
+
+    def walk(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Walk the virtual tree top-down, like ``os.walk``.
+
+        Yields:
+            (directory path, subdirectory names, file names)
+        """
+        pending = ['']
+        while pending:
+            rel = pending.pop()
+            subdirs, files = self._dirs[rel]
+            names = sorted(subdirs)
+            yield self._to_path(rel), names, list(files)
+            pending.extend(posixpath.join(rel, name) if rel else name
+                           for name in reversed(names))
+
+    def iter_files(self) -> Iterator[FileEntry]:
+        """Yield an entry for every file in the archive."""
+        for rel, info in self._files.items():
+            mtime_ns = int(time.mktime(info.date_time + (0, 0, -1)) * 1e9)
+            yield FileEntry(self._to_path(rel), posixpath.basename(rel),
+                            info.file_size, mtime_ns)
+
+    def file_count(self) -> int:
+        """Return the number of files in the archive."""
+        return len(self._files)
+
+    def getsize(self, path: str) -> int:
+        """Return the uncompressed size of a member."""
+        return self._files[self._to_rel(path)].file_size
+
+    def getmtime(self, path: str) -> float:
+        """Return a member's modification time as a POSIX timestamp."""
+        date_time = self._files[self._to_rel(path)].date_time
+        return time.mktime(date_time + (0, 0, -1))
+
+    def open(self, path: str) -> IO[bytes]:
+        """
+        Open a member for reading; data is decompressed on demand.
+
+        Args:
+            path: Member path, or display path under the archive
+        """
+        return self._archive.open(self._files[self._to_rel(path)])
+
+    def read_bytes(self, path: str) -> bytes:
+        """Read a member's full contents."""
+        with self.open(path) as f:
+            return f.read()
+
+    def _close_mapping(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def close(self) -> None:
+        """Release the archive and its memory map."""
+        self._archive.close()
+        self._close_mapping()
+
+    def __enter__(self) -> 'ZipFileSystem':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,5 @@
+"""Task handler registry module"""
+
+from .registry import ENTRY_POINT_GROUP, HandlerError, HandlerRegistry, load_reference
+
+__all__ = ['ENTRY_POINT_GROUP', 'HandlerError', 'HandlerRegistry', 'load_reference']
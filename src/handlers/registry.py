@@ -0,0 +1,163 @@
+"""
+Handler Registry
+
+Maps task names to the functions that run them. A handler is called as
+``handler(delegate, input_path, **kwargs)`` and returns a result dictionary.
+
+Handlers can be registered as callables or as ``"module:attribute"``
+references, which are imported only when the task first runs, so a task
+type costs nothing at startup until it is used. Besides the built-in
+tasks, handlers come from:
+
+- the ``handlers`` section of the agent configuration, mapping task names
+  to references (these may replace built-in handlers)
+- installed packages declaring entry points in the ``ymera.handlers``
+  group, named after the task::
+
+      entry_points={"ymera.handlers": ["compress = ymera_compress:handle"]}
+
+Entry points are only looked up when a task name is not otherwise known, or
+when all names are listed.
+"""
+
+import importlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "ymera.handlers"
+
+Handler = Callable[..., Dict[str, Any]]
+
+
+class HandlerError(Exception):
+    """Raised when a handler reference cannot be imported."""
+
+
+def load_reference(reference: str) -> Any:
+    """
+    Import the object named by a ``"module:attribute"`` reference.
+
+    The attribute may be dotted (``module:Class.method``).
+
+    Raises:
+        HandlerError: If the reference is malformed or cannot be imported
+    """
+    module_name, _, attribute = reference.partition(':')
+    if not module_name or not attribute:
+        raise HandlerError(f"Handler reference must look like 'module:attribute': {reference}")
+    try:
+        target = importlib.import_module(module_name)
+        for name in attribute.split('.'):
+            target = getattr(target, name)
+    except (ImportError, AttributeError) as e:
+        raise HandlerError(f"Cannot load handler {reference}: {e}") from e
+    return target
+
+
+def _entry_points(group: str) -> List[Any]:
+    """Return the installed entry points of ``group``."""
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=group))
+    # Python < 3.10 returns a dict of groups
+    return list(entry_points.get(group, ()))
+
+
+def _is_entry_point(handler: Any) -> bool:
+    return hasattr(handler, 'load') and hasattr(handler, 'group')
+
+
+class HandlerRegistry:
+    """Task handlers by name, imported on first use."""
+
+    def __init__(self, group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Initialize an empty registry.
+
+        Args:
+            group: Entry point group to discover handlers in (None disables
+                discovery)
+        """
+        self.group = group
+        # Loaded handlers, or the reference / entry point to load them from
+        self._handlers: Dict[str, Union[Handler, str, Any]] = {}
+        self._discovered = group is None
+
+    def register(self, name: str, handler: Union[Handler, str]) -> None:
+        """
+        Register a handler, replacing any handler of the same name.
+
+        Args:
+            name: Task name
+            handler: Callable, or ``"module:attribute"`` reference imported
+                when the task first runs
+        """
+        self._handlers[name] = handler
+
+    def register_config(self, config: Optional[Dict[str, str]]) -> None:
+        """
+        Register the handlers of a ``handlers`` configuration section.
+
+        Args:
+            config: Mapping of task names to ``"module:attribute"`` references
+        """
+        for name, reference in (config or {}).items():
+            self.register(name, str(reference))
+
+    def discover(self) -> None:
+        """Register handlers declared by installed packages (once)."""
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            entry_points = _entry_points(self.group)
+        except Exception as e:
+            logger.warning("Cannot list %s entry points: %s", self.group, e)
+            return
+        for entry_point in entry_points:
+            # Built-in and configured handlers take precedence
+            self._handlers.setdefault(entry_point.name, entry_point)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._handlers:
+            self.discover()
+        return name in self._handlers
+
+    def names(self) -> List[str]:
+        """Return all task names, including those of installed plugins."""
+        self.discover()
+        return sorted(self._handlers)
+
+    def get(self, name: str) -> Optional[Handler]:
+        """
+        Return the handler of a task, importing it on first use.
+
+        Returns:
+            The handler, or None if no handler has that name
+
+        Raises:
+            HandlerError: If the handler cannot be imported
+        """
+        if name not in self:
+            return None
+        handler = self._handlers[name]
+        if isinstance(handler, str):
+            handler = load_reference(handler)
+        elif _is_entry_point(handler):
+            try:
+                handler = handler.load()
+            except Exception as e:
+                raise HandlerError(f"Cannot load handler {name} from {handler.value}: {e}") from e
+        if not callable(handler):
+            raise HandlerError(f"Handler {name} is not callable")
+        self._handlers[name] = handler
+        return handler
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True if the handler of ``name`` has been imported."""
+        handler = self._handlers.get(name)
+        return callable(handler) and not _is_entry_point(handler)
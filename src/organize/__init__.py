@@ -0,0 +1,7 @@
+"""Organize task module"""
+
+from .classifier import FileClassifier
+from .state import OrganizeStateStore
+from .stream import classify_entries, write_ndjson
+
+__all__ = ['FileClassifier', 'OrganizeStateStore', 'classify_entries', 'write_ndjson']
@@ -0,0 +1,160 @@
+"""
+File Classifier
+
+Compiles the ``tasks.organize.categories`` rules from the agent configuration
+into lookup structures that classify a file name in a single pass.
+
+Each category lists rules of three kinds:
+
+- ``.ext`` / ``.test.py``: case-insensitive suffix, possibly multi-part
+- ``glob:*_test.*``: shell-style pattern matched against the whole name
+- ``re:^test_.*\\.py$``: regular expression searched in the name
+
+All rules are matched against the lower-cased file name.
+
+Pattern rules (glob and regex) are checked first, in configuration order;
+otherwise the longest matching suffix wins. Files matching nothing fall into
+the ``other`` category.
+"""
+
+import fnmatch
+import hashlib
+import itertools
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FALLBACK_CATEGORY = "other"
+
+GLOB_PREFIX = "glob:"
+REGEX_PREFIX = "re:"
+
+# Used when the configuration has no organize categories.
+DEFAULT_CATEGORIES: Dict[str, List[str]] = {
+    "source_code": [".py", ".js", ".java", ".cpp", ".c", ".go", ".rs"],
+    "documentation": [".md", ".txt", ".rst", ".pdf"],
+    "tests": ["glob:*.test.*", "glob:*.spec.*", "glob:*_test.*", "glob:*_spec.*"],
+    "configs": [".yaml", ".yml", ".json", ".toml", ".ini"],
+}
+
+
+class FileClassifier:
+    """Classifies file names into organize categories."""
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        """
+        Compile classification rules.
+
+        Args:
+            categories: Mapping of category name to rule list
+
+        Raises:
+            ValueError: If a regex rule does not compile
+        """
+        self.categories: List[str] = list(categories)
+        if FALLBACK_CATEGORY not in self.categories:
+            self.categories.append(FALLBACK_CATEGORY)
+
+        self._suffixes: Dict[str, str] = {}
+        pattern_rules: List[Tuple[str, str]] = []
+        for category, rules in categories.items():
+            for rule in rules or []:
+                rule = str(rule)
+                if rule.startswith((GLOB_PREFIX, REGEX_PREFIX)):
+                    pattern_rules.append((self._pattern_source(category, rule), category))
+                else:
+                    suffix = rule.lower() if rule.startswith('.') else f'.{rule.lower()}'
+                    # First category listing a suffix keeps it.
+                    self._suffixes.setdefault(suffix, category)
+
+        # Consecutive pattern rules of one category share a single compiled
+        # alternation, so the common case costs one regex search.
+        self._patterns: List[Tuple[Callable[[str], Any], str]] = []
+        for category, group in itertools.groupby(pattern_rules, key=lambda rule: rule[1]):
+            alternation = '|'.join(f'(?:{source})' for source, _ in group)
+            self._patterns.append((re.compile(alternation).search, category))
+
+        # Final components of multi-part suffixes (".py" for ".test.py"); only
+        # names ending in one of these need more than one lookup.
+        self._multi_tails = {'.' + suffix.rsplit('.', 1)[1]
+                             for suffix in self._suffixes if suffix.count('.') > 1}
+        self._max_suffix_dots = max(
+            (suffix.count('.') for suffix in self._suffixes), default=0)
+        self.fingerprint = hashlib.sha1(
+            json.dumps(categories, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _pattern_source(category: str, rule: str) -> str:
+        """
+        Translate a glob or regex rule into regex source for ``re.search``.
+
+        Globs of literals with ``*`` only at the ends (``*x*``, ``x*``,
+        ``*x``) become bare or anchored literals, which search much faster
+        than the ``.*`` produced by ``fnmatch.translate``.
+
+        Raises:
+            ValueError: If a regex rule does not compile
+        """
+        if rule.startswith(REGEX_PREFIX):
+            source = rule[len(REGEX_PREFIX):]
+            try:
+                re.compile(source)
+            except re.error as e:
+                raise ValueError(f"Invalid regex rule for {category!r}: {rule!r}: {e}")
+            return source
+
+        glob = rule[len(GLOB_PREFIX):].lower()
+        if not any(char in glob for char in '?['):
+            starts, ends = glob.startswith('*'), glob.endswith('*')
+            literal = glob.strip('*')
+            if '*' not in literal:
+                return (('' if starts else '^') + re.escape(literal)
+                        + ('' if ends else r'\Z'))
+        return '^' + fnmatch.translate(glob)
+
+    @classmethod
+    def from_config(cls, organize_config: Optional[Dict[str, Any]]) -> 'FileClassifier':
+        """
+        Build a classifier from the ``tasks.organize`` configuration section.
+
+        Args:
+            organize_config: Section dictionary (may be empty or None)
+        """
+        categories = (organize_config or {}).get('categories') or DEFAULT_CATEGORIES
+        return cls(categories)
+
+    def classify(self, name: str) -> str:
+        """
+        Classify a file by name.
+
+        Args:
+            name: File name (without directory)
+
+        Returns:
+            Category name
+        """
+        lower = name.lower()
+        for matches, category in self._patterns:
+            if matches(lower):
+                return category
+
+        # Leading dots mark hidden files, not suffixes (as in os.path.splitext).
+        start = len(lower) - len(lower.lstrip('.'))
+        pos = lower.rfind('.', start + 1)
+        if pos == -1:
+            return FALLBACK_CATEGORY
+        if lower[pos:] not in self._multi_tails:
+            return self._suffixes.get(lower[pos:], FALLBACK_CATEGORY)
+
+        positions = [pos]
+        while len(positions) < self._max_suffix_dots:
+            pos = lower.rfind('.', start + 1, pos)
+            if pos == -1:
+                break
+            positions.append(pos)
+        # Longest suffix first.
+        for pos in reversed(positions):
+            category = self._suffixes.get(lower[pos:])
+            if category is not None:
+                return category
+        return FALLBACK_CATEGORY
@@ -0,0 +1,232 @@
+"""
+Persistent Organize State
+
+Stores the result of an organize run in a small SQLite database: every
+directory's mtime and every file's size, mtime and category. A later run
+loads only the directory table, stats those directories and rescans the
+ones whose mtime changed; file rows are read just for those directories.
+The cost of a re-run therefore grows with the number of directories and
+changes, not with the number of files.
+"""
+
+import os
+import sqlite3
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..fs.entry import FileEntry
+from ..fs.file_index import ChangeSet, DirRecord, FileIndex
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    root TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (root, dir)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (root, dir, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_by_category ON files (root, category);
+CREATE TABLE IF NOT EXISTS roots (
+    root TEXT PRIMARY KEY,
+    rules TEXT NOT NULL
+);
+"""
+
+
+class _StoredDirRecord(DirRecord):
+    """Directory record whose file list is read from the database on demand."""
+
+    __slots__ = ('_load_files', '_files')
+
+    def __init__(self, mtime_ns: int, subdirs: List[str],
+                 load_files: Callable[[], List[FileEntry]]):
+        self.mtime_ns = mtime_ns
+        self.subdirs = subdirs
+        self._load_files = load_files
+        self._files: Optional[List[FileEntry]] = None
+
+    @property
+    def files(self) -> List[FileEntry]:
+        if self._files is None:
+            self._files = self._load_files()
+        return self._files
+
+
+class OrganizeStateStore:
+    """SQLite-backed store of per-file classification state."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the state database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self.db_path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _key(root: str) -> str:
+        return os.path.abspath(root)
+
+    @staticmethod
+    def _split(root: str, path: str) -> Tuple[str, str]:
+        """Split a file path into (directory relative to root, name)."""
+        rel = os.path.relpath(path, root)
+        rel_dir, name = os.path.split(rel)
+        return rel_dir, name
+
+    @staticmethod
+    def _join(root: str, rel_dir: str) -> str:
+        return os.path.join(root, rel_dir) if rel_dir else root
+
+    def rules_fingerprint(self, root: str) -> Optional[str]:
+        """Return the classifier fingerprint recorded for ``root``, if any."""
+        row = self._conn.execute("SELECT rules FROM roots WHERE root = ?",
+                                 (self._key(root),)).fetchone()
+        return row[0] if row else None
+
+    def load_index(self, root: str) -> Optional[FileIndex]:
+        """
+        Rebuild the saved index of ``root`` without reading file rows.
+
+        Args:
+            root: Organized directory
+
+        Returns:
+            Index with lazily-loaded file lists, or None if never organized
+        """
+        key = self._key(root)
+        rows = self._conn.execute("SELECT dir, mtime_ns FROM dirs WHERE root = ?",
+                                  (key,)).fetchall()
+        if not rows:
+            return None
+
+        subdirs: Dict[str, List[str]] = {rel_dir: [] for rel_dir, _ in rows}
+        for rel_dir, _ in rows:
+            if rel_dir:
+                parent = os.path.dirname(rel_dir)
+                subdirs.setdefault(parent, []).append(self._join(root, rel_dir))
+
+        def loader(rel_dir: str) -> Callable[[], List[FileEntry]]:
+            directory = self._join(root, rel_dir)
+
+            def load() -> List[FileEntry]:
+                cursor = self._conn.execute(
+                    "SELECT name, size, mtime_ns FROM files WHERE root = ? AND dir = ?",
+                    (key, rel_dir))
+                return [FileEntry(os.path.join(directory, name), name, size, mtime_ns)
+                        for name, size, mtime_ns in cursor]
+            return load
+
+        dirs = {
+            self._join(root, rel_dir): _StoredDirRecord(mtime_ns, subdirs[rel_dir],
+                                                        loader(rel_dir))
+            for rel_dir, mtime_ns in rows
+        }
+        return FileIndex(root, dirs)
+
+    def categories(self, root: str, entries: Iterable[FileEntry]) -> Dict[str, str]:
+        """
+        Look up the stored category of each entry.
+
+        Args:
+            root: Organized directory
+            entries: Files to look up
+
+        Returns:
+            Mapping of file path to stored category (missing files omitted)
+        """
+        key = self._key(root)
+        found = {}
+        for entry in entries:
+            rel_dir, name = self._split(root, entry.path)
+            row = self._conn.execute(
+                "SELECT category FROM files WHERE root = ? AND dir = ? AND name = ?",
+                (key, rel_dir, name)).fetchone()
+            if row:
+                found[entry.path] = row[0]
+        return found
+
+    def iter_files(self, root: str) -> Iterator[Tuple[str, str, str]]:
+        """
+        Yield every stored file of ``root``.
+
+        Yields:
+            (path, name, category)
+        """
+        cursor = self._conn.execute(
+            "SELECT dir, name, category FROM files WHERE root = ?", (self._key(root),))
+        for rel_dir, name, category in cursor:
+            yield os.path.join(self._join(root, rel_dir), name), name, category
+
+    def save(self, root: str, index: FileIndex, changes: ChangeSet,
+             categories: Dict[str, str], rules: str) -> None:
+        """
+        Persist a refreshed index and the categories of changed files.
+
+        Args:
+            root: Organized directory
+            index: Index after refresh
+            changes: Changes applied by the refresh
+            categories: Category of every added or modified file, plus any
+                unchanged file that was reclassified
+            rules: Fingerprint of the classifier that produced the categories
+        """
+        key = self._key(root)
+        with self._conn:
+            self._conn.execute("DELETE FROM dirs WHERE root = ?", (key,))
+            self._conn.executemany(
+                "INSERT INTO dirs (root, dir, mtime_ns) VALUES (?, ?, ?)",
+                ((key, os.path.relpath(path, root) if path != root else '', record.mtime_ns)
+                 for path, record in index.dirs.items()))
+            self._conn.executemany(
+                "DELETE FROM files WHERE root = ? AND dir = ? AND name = ?",
+                ((key,) + self._split(root, entry.path) for entry in changes.removed))
+
+            sizes = {entry.path: entry for entry in changes.added + changes.modified}
+            rows = []
+            for path, category in categories.items():
+                rel_dir, name = self._split(root, path)
+                entry = sizes.get(path)
+                if entry is None:
+                    self._conn.execute(
+                        "UPDATE files SET category = ? WHERE root = ? AND dir = ? AND name = ?",
+                        (category, key, rel_dir, name))
+                else:
+                    rows.append((key, rel_dir, name, entry.size, entry.mtime_ns, category))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (root, dir, name, size, mtime_ns, category) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO roots (root, rules) VALUES (?, ?)",
+                               (key, rules))
+
+    def category_counts(self, root: str) -> Dict[str, int]:
+        """Return the number of stored files per category."""
+        cursor = self._conn.execute(
+            "SELECT category, COUNT(*) FROM files WHERE root = ? GROUP BY category",
+            (self._key(root),))
+        return dict(cursor.fetchall())
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> 'OrganizeStateStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
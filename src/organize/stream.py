@@ -0,0 +1,63 @@
+"""
+Streaming Classification
+
+Generator pipeline that classifies files as they are discovered and writes
+one JSON record per file (NDJSON). Only per-category counts are kept in
+memory, so memory use does not grow with the size of the tree.
+"""
+
+import json
+from typing import Dict, IO, Iterable, Iterator, Tuple
+
+from ..fs.entry import FileEntry
+from .classifier import FileClassifier
+
+# Records are joined and written in batches of this many lines.
+WRITE_BATCH_SIZE = 1024
+
+
+def classify_entries(entries: Iterable[FileEntry],
+                     classifier: FileClassifier) -> Iterator[Tuple[FileEntry, str]]:
+    """
+    Lazily pair each entry with its category.
+
+    Args:
+        entries: Files to classify
+        classifier: Compiled classifier
+
+    Yields:
+        (entry, category)
+    """
+    classify = classifier.classify
+    for entry in entries:
+        yield entry, classify(entry.name)
+
+
+def write_ndjson(classified: Iterable[Tuple[FileEntry, str]], out: IO[str],
+                 categories: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Write classified entries as NDJSON records and count them.
+
+    Each line is ``{"path": ..., "category": ..., "size": ...}``.
+
+    Args:
+        classified: Output of ``classify_entries``
+        out: Text stream to write to
+        categories: Category names to report even when empty
+
+    Returns:
+        Number of files per category
+    """
+    counts = {category: 0 for category in categories}
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    batch = []
+    for entry, category in classified:
+        counts[category] = counts.get(category, 0) + 1
+        batch.append(encode({"path": entry.path, "category": category, "size": entry.size}))
+        if len(batch) >= WRITE_BATCH_SIZE:
+            out.write('\n'.join(batch) + '\n')
+            batch.clear()
+    if batch:
+        out.write('\n'.join(batch) + '\n')
+    out.flush()
+    return counts
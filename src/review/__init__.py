@@ -0,0 +1,7 @@
+"""Code review module"""
+
+from .cache import ReviewCache
+from .checks import ALL_CHECKS, analyze_source
+from .engine import ReviewEngine, ReviewReport
+
+__all__ = ['ALL_CHECKS', 'ReviewCache', 'ReviewEngine', 'ReviewReport', 'analyze_source']
@@ -0,0 +1,111 @@
+"""
+Review Result Cache
+
+Persists review findings in SQLite keyed by a hash of the file contents and
+the analyzer configuration, so a file is parsed at most once per distinct
+content. A second table maps each reviewed path to its last known size,
+mtime and content hash: a file whose size and mtime are unchanged is not
+even read on the next run.
+
+Like any stat-based cache, a rewrite that preserves both size and mtime is
+not detected.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_stats (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (root, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    analyzer TEXT NOT NULL,
+    findings TEXT NOT NULL,
+    PRIMARY KEY (digest, analyzer)
+) WITHOUT ROWID;
+"""
+
+
+class ReviewCache:
+    """SQLite store of per-content review findings."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        self.db_path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load_stats(self, root: str) -> Dict[str, Tuple[int, int, str]]:
+        """
+        Return the recorded stat signature of every file reviewed under ``root``.
+
+        Returns:
+            Mapping of path to (size, mtime_ns, digest)
+        """
+        cursor = self._conn.execute(
+            "SELECT path, size, mtime_ns, digest FROM file_stats WHERE root = ?", (root,))
+        return {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in cursor}
+
+    def load_results(self, analyzer: str) -> Dict[str, str]:
+        """
+        Return the stored findings produced by ``analyzer``, still JSON-encoded.
+
+        Returns:
+            Mapping of digest to encoded findings
+        """
+        cursor = self._conn.execute(
+            "SELECT digest, findings FROM results WHERE analyzer = ?", (analyzer,))
+        return dict(cursor.fetchall())
+
+    def save(self, root: str, stats: Iterable[Tuple[str, int, int, str]],
+             removed: Iterable[str], analyzer: str,
+             results: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Record new stat signatures and findings.
+
+        Args:
+            root: Reviewed root (directory or archive)
+            stats: (path, size, mtime_ns, digest) of every file that was read
+            removed: Paths under ``root`` that no longer exist
+            analyzer: Analyzer configuration key
+            results: Findings of every newly parsed digest
+        """
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_stats (root, path, size, mtime_ns, digest) "
+                "VALUES (?, ?, ?, ?, ?)", ((root,) + row for row in stats))
+            self._conn.executemany(
+                "DELETE FROM file_stats WHERE root = ? AND path = ?",
+                ((root, path) for path in removed))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (digest, analyzer, findings) VALUES (?, ?, ?)",
+                ((digest, analyzer, json.dumps(findings, separators=(',', ':')))
+                 for digest, findings in results.items()))
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> 'ReviewCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
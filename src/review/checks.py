@@ -0,0 +1,281 @@
+"""
+Python Source Checks
+
+Single-pass AST analysis of a Python module. Every rule belongs to one of
+the check categories listed under ``tasks.review.enabled_checks`` in the
+agent configuration; rules of disabled categories are not reported.
+Syntax errors are always reported.
+"""
+
+import ast
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CODE_QUALITY = "code_quality"
+SECURITY = "security"
+PERFORMANCE = "performance"
+DOCUMENTATION = "documentation"
+ALL_CHECKS: Tuple[str, ...] = (CODE_QUALITY, SECURITY, PERFORMANCE, DOCUMENTATION)
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+SEVERITY_ORDER = {ERROR: 0, WARNING: 1, INFO: 2}
+
+MAX_FUNCTION_LINES = 80
+MAX_ARGUMENTS = 7
+
+# Bump whenever rules change so cached results are not reused.
+ANALYZER_VERSION = 1
+
+# Rule -> (category, severity, hint used in review suggestions).
+RULES: Dict[str, Tuple[str, str, str]] = {
+    "syntax-error": (CODE_QUALITY, ERROR, "Fix syntax errors so the module can be imported"),
+    "bare-except": (CODE_QUALITY, WARNING, "Catch specific exceptions instead of using bare except"),
+    "mutable-default-argument": (CODE_QUALITY, WARNING,
+                                 "Use None instead of mutable default arguments"),
+    "too-many-arguments": (CODE_QUALITY, INFO,
+                           f"Keep functions to {MAX_ARGUMENTS} arguments or fewer"),
+    "function-too-long": (CODE_QUALITY, INFO,
+                          f"Split functions longer than {MAX_FUNCTION_LINES} lines"),
+    "wildcard-import": (CODE_QUALITY, WARNING, "Import names explicitly instead of using *"),
+    "none-comparison": (CODE_QUALITY, INFO, "Compare to None with 'is' / 'is not'"),
+    "eval-used": (SECURITY, ERROR, "Avoid eval/exec on data that may be untrusted"),
+    "shell-command": (SECURITY, WARNING, "Use subprocess with an argument list instead of os.system"),
+    "subprocess-shell": (SECURITY, ERROR, "Avoid shell=True in subprocess calls"),
+    "unsafe-deserialization": (SECURITY, ERROR,
+                               "Do not unpickle or yaml.load data from untrusted sources"),
+    "hardcoded-secret": (SECURITY, WARNING, "Load secrets from the environment or a vault"),
+    "insecure-temp-file": (SECURITY, WARNING, "Use tempfile.mkstemp or NamedTemporaryFile"),
+    "weak-hash": (SECURITY, INFO, "Use SHA-256 or better for security-sensitive hashing"),
+    "string-concat-in-loop": (PERFORMANCE, INFO, "Collect strings in a list and join them once"),
+    "range-len-loop": (PERFORMANCE, INFO, "Iterate directly or use enumerate()"),
+    "keys-membership": (PERFORMANCE, INFO, "Test membership on the dict, not dict.keys()"),
+    "compile-in-loop": (PERFORMANCE, INFO, "Compile regular expressions once, outside the loop"),
+    "missing-module-docstring": (DOCUMENTATION, INFO, "Add module docstrings"),
+    "missing-docstring": (DOCUMENTATION, INFO, "Document public classes and functions"),
+}
+
+_SECRET_WORDS = ("password", "passwd", "secret", "api_key", "apikey", "token")
+_UNSAFE_LOADERS = {"pickle.load", "pickle.loads", "marshal.load", "marshal.loads",
+                   "cPickle.load", "cPickle.loads", "shelve.open"}
+_WEAK_HASHES = {"hashlib.md5", "hashlib.sha1"}
+_SHELL_CALLS = {"os.system", "os.popen"}
+_MUTABLE_FACTORIES = {"list", "dict", "set"}
+
+
+def make_finding(rule: str, line: int, message: str) -> Dict[str, Any]:
+    """
+    Build a finding record for ``rule``.
+
+    Args:
+        rule: Rule name (a key of ``RULES``)
+        line: 1-based source line
+        message: Human-readable description
+
+    Returns:
+        Finding dictionary
+    """
+    category, severity, _ = RULES[rule]
+    return {"rule": rule, "category": category, "severity": severity,
+            "line": line, "message": message}
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Return ``a.b.c`` for a Name/Attribute chain, or None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _target_name(node: ast.AST) -> Optional[str]:
+    """Return the assigned name of a Name or Attribute target."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+class _Analyzer(ast.NodeVisitor):
+    """Collects findings while walking a module once."""
+
+    def __init__(self, checks: Iterable[str]):
+        self.checks = set(checks)
+        self.findings: List[Dict[str, Any]] = []
+        self._loop_depth = 0
+        self._function_depth = 0
+
+    def _report(self, rule: str, node: ast.AST, message: str) -> None:
+        if RULES[rule][0] in self.checks:
+            self.findings.append(make_finding(rule, getattr(node, 'lineno', 1), message))
+
+    # Structure
+
+    def visit_Module(self, node: ast.Module) -> None:
+        if node.body and ast.get_docstring(node) is None:
+            self._report("missing-module-docstring", node, "Module has no docstring")
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if (self._function_depth == 0 and not node.name.startswith('_')
+                and ast.get_docstring(node) is None):
+            self._report("missing-docstring", node, f"Class '{node.name}' has no docstring")
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._check_function(node)
+        # A loop around a definition does not make its body run in the loop.
+        loop_depth, self._loop_depth = self._loop_depth, 0
+        self._function_depth += 1
+        self.generic_visit(node)
+        self._function_depth -= 1
+        self._loop_depth = loop_depth
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _check_function(self, node: ast.FunctionDef) -> None:
+        args = node.args
+        positional = args.posonlyargs + args.args
+        names = [arg.arg for arg in positional + args.kwonlyargs]
+        if names and names[0] in ('self', 'cls'):
+            names = names[1:]
+        if len(names) > MAX_ARGUMENTS:
+            self._report("too-many-arguments", node,
+                         f"Function '{node.name}' takes {len(names)} arguments")
+
+        length = (node.end_lineno or node.lineno) - node.lineno + 1
+        if length > MAX_FUNCTION_LINES:
+            self._report("function-too-long", node,
+                         f"Function '{node.name}' is {length} lines long")
+
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)) or (
+                    isinstance(default, ast.Call) and isinstance(default.func, ast.Name)
+                    and default.func.id in _MUTABLE_FACTORIES):
+                self._report("mutable-default-argument", default,
+                             f"Function '{node.name}' has a mutable default argument")
+
+        if (self._function_depth == 0 and not node.name.startswith('_')
+                and ast.get_docstring(node) is None):
+            self._report("missing-docstring", node, f"Function '{node.name}' has no docstring")
+
+    # Statements
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is None:
+            self._report("bare-except", node, "Bare 'except:' also catches SystemExit")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if any(alias.name == '*' for alias in node.names):
+            self._report("wildcard-import", node, f"Wildcard import from '{node.module}'")
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self._check_secret(node.targets, node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self._check_secret([node.target], node.value)
+        self.generic_visit(node)
+
+    def _check_secret(self, targets: List[ast.AST], value: ast.AST) -> None:
+        if not (isinstance(value, ast.Constant) and isinstance(value.value, str)
+                and value.value):
+            return
+        for target in targets:
+            name = _target_name(target)
+            if name and any(word in name.lower() for word in _SECRET_WORDS):
+                self._report("hardcoded-secret", target,
+                             f"'{name}' is assigned a string literal")
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if (self._loop_depth and isinstance(node.op, ast.Add)
+                and (isinstance(node.value, ast.JoinedStr)
+                     or (isinstance(node.value, ast.Constant)
+                         and isinstance(node.value.value, str)))):
+            self._report("string-concat-in-loop", node, "String built with += inside a loop")
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For) -> None:
+        iterator = node.iter
+        if (isinstance(iterator, ast.Call) and _dotted_name(iterator.func) == 'range'
+                and len(iterator.args) == 1 and isinstance(iterator.args[0], ast.Call)
+                and _dotted_name(iterator.args[0].func) == 'len'):
+            self._report("range-len-loop", node, "Loop over range(len(...))")
+        self._visit_loop(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop(node)
+
+    def _visit_loop(self, node: ast.AST) -> None:
+        self._loop_depth += 1
+        self.generic_visit(node)
+        self._loop_depth -= 1
+
+    # Expressions
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        for op, right in zip(node.ops, node.comparators):
+            if (isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant)
+                    and right.value is None):
+                self._report("none-comparison", node, "Comparison to None with ==/!=")
+            elif (isinstance(op, (ast.In, ast.NotIn)) and isinstance(right, ast.Call)
+                  and isinstance(right.func, ast.Attribute) and right.func.attr == 'keys'
+                  and not right.args):
+                self._report("keys-membership", node, "Membership test on .keys()")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _dotted_name(node.func)
+        if name in ('eval', 'exec'):
+            self._report("eval-used", node, f"Call to {name}()")
+        elif name in _SHELL_CALLS:
+            self._report("shell-command", node, f"Call to {name}()")
+        elif name in _UNSAFE_LOADERS:
+            self._report("unsafe-deserialization", node, f"Call to {name}()")
+        elif name == 'yaml.load' and not any(k.arg == 'Loader' for k in node.keywords) \
+                and len(node.args) < 2:
+            self._report("unsafe-deserialization", node, "yaml.load() without a Loader")
+        elif name == 'tempfile.mktemp':
+            self._report("insecure-temp-file", node, "Call to tempfile.mktemp()")
+        elif name in _WEAK_HASHES and not any(
+                k.arg == 'usedforsecurity' for k in node.keywords):
+            self._report("weak-hash", node, f"Call to {name}()")
+        elif name == 're.compile' and self._loop_depth:
+            self._report("compile-in-loop", node, "re.compile() inside a loop")
+
+        for keyword in node.keywords:
+            if (keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant)
+                    and keyword.value.value is True):
+                self._report("subprocess-shell", node, f"Call to {name or 'function'} with shell=True")
+        self.generic_visit(node)
+
+
+def analyze_source(source: bytes, checks: Iterable[str] = ALL_CHECKS) -> List[Dict[str, Any]]:
+    """
+    Analyze one Python module.
+
+    Args:
+        source: Module source (encoding declarations are honoured)
+        checks: Enabled check categories
+
+    Returns:
+        Findings ordered by line
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        line = getattr(e, 'lineno', None) or 1
+        return [make_finding("syntax-error", line, f"Cannot parse module: {e}")]
+    analyzer = _Analyzer(checks)
+    analyzer.visit(tree)
+    analyzer.findings.sort(key=lambda finding: finding['line'])
+    return analyzer.findings
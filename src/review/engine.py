@@ -0,0 +1,277 @@
+"""
+Parallel Review Engine
+
+Reviews the Python files of a tree. Files whose size and mtime match the
+cache are not read at all; the rest are read and hashed, and only contents
+that were never analyzed before are parsed, in batches spread across a
+process pool. Batches are submitted while files are still being read, and
+the number in flight is bounded, so memory use does not grow with the size
+of the tree.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..fs.entry import FileEntry
+from .cache import ReviewCache
+from .checks import ALL_CHECKS, ANALYZER_VERSION, RULES, SEVERITY_ORDER, analyze_source
+
+PYTHON_SUFFIXES = ('.py', '.pyw')
+
+# A batch is closed once it holds this many files or bytes of source.
+BATCH_FILES = 128
+BATCH_BYTES = 4 * 1024 * 1024
+
+# Batches queued per worker before reading pauses.
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+
+# Files read per round when filling batches.
+READ_CHUNK = 256
+
+MAX_REPORTED_ISSUES = 500
+MAX_SUGGESTIONS = 5
+
+Job = Tuple[str, bytes]
+Findings = List[Dict[str, Any]]
+
+
+def content_digest(data: bytes) -> str:
+    """Return the cache key of a file's contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def analyzer_key(checks: Iterable[str]) -> str:
+    """Identify an analyzer configuration, so results of other rule sets are not reused."""
+    return f"v{ANALYZER_VERSION}:" + ','.join(sorted(set(checks)))
+
+
+def analyze_batch(jobs: List[Job], checks: Tuple[str, ...]) -> List[Tuple[str, Findings]]:
+    """
+    Analyze a batch of sources; runs inside pool workers and in-process.
+
+    Args:
+        jobs: (digest, source) pairs
+        checks: Enabled check categories
+
+    Returns:
+        (digest, findings) pairs
+    """
+    return [(digest, analyze_source(source, checks)) for digest, source in jobs]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class ReviewReport:
+    """Findings and cache statistics of one review run."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.files_reviewed = 0
+        self.findings: Findings = []
+        self.unchanged = 0
+        self.content_hits = 0
+        self.parsed = 0
+        self.read_errors: List[str] = []
+        self.elapsed = 0.0
+
+    def to_dict(self, max_issues: int = MAX_REPORTED_ISSUES) -> Dict[str, Any]:
+        """
+        Summarize the report for a task result.
+
+        Args:
+            max_issues: Maximum number of individual findings to include
+
+        Returns:
+            Report dictionary
+        """
+        by_category = Counter(finding['category'] for finding in self.findings)
+        by_severity = Counter(finding['severity'] for finding in self.findings)
+        by_rule = Counter(finding['rule'] for finding in self.findings)
+        ordered = sorted(self.findings, key=lambda finding: (
+            SEVERITY_ORDER[finding['severity']], finding['path'], finding['line']))
+        return {
+            "files_reviewed": self.files_reviewed,
+            "issue_count": len(self.findings),
+            "issues": ordered[:max_issues],
+            "summary": {
+                "by_category": dict(by_category),
+                "by_severity": dict(by_severity),
+            },
+            "suggestions": [f"{RULES[rule][2]} ({count}x {rule})"
+                            for rule, count in by_rule.most_common(MAX_SUGGESTIONS)],
+            "cache": {
+                "unchanged": self.unchanged,
+                "content_hits": self.content_hits,
+                "parsed": self.parsed,
+            },
+            "read_errors": self.read_errors[:max_issues],
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class _BatchRunner:
+    """Runs analysis batches, starting a process pool only when there is more than one."""
+
+    def __init__(self, checks: Tuple[str, ...], workers: int,
+                 executor: Optional[Executor]):
+        self.checks = checks
+        self.workers = workers
+        self.executor = executor
+        self.results: Dict[str, Findings] = {}
+        self._held: Optional[List[Job]] = None
+        self._pool: Optional[Executor] = None
+        self._futures: Set[Future] = set()
+
+    def submit(self, batch: List[Job]) -> None:
+        if self.workers <= 1:
+            self.results.update(analyze_batch(batch, self.checks))
+            return
+        if self._pool is None:
+            if self._held is None:
+                self._held = batch
+                return
+            self._pool = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+            held, self._held = self._held, None
+            self._futures.add(self._pool.submit(analyze_batch, held, self.checks))
+        while len(self._futures) >= self.workers * BATCHES_IN_FLIGHT_PER_WORKER:
+            self._collect(FIRST_COMPLETED)
+        self._futures.add(self._pool.submit(analyze_batch, batch, self.checks))
+
+    def _collect(self, return_when: str) -> None:
+        done, self._futures = wait(self._futures, return_when=return_when)
+        for future in done:
+            self.results.update(future.result())
+
+    def finish(self) -> Dict[str, Findings]:
+        try:
+            if self._held is not None:
+                self.results.update(analyze_batch(self._held, self.checks))
+                self._held = None
+            if self._futures:
+                self._collect('ALL_COMPLETED')
+        finally:
+            if self._pool is not None and self.executor is None:
+                self._pool.shutdown()
+        return self.results
+
+
+class ReviewEngine:
+    """Reviews Python sources in parallel, reusing cached results."""
+
+    def __init__(self, checks: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None,
+                 cache: Optional[ReviewCache] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            checks: Enabled check categories (default: all)
+            workers: Number of worker processes (default: CPU count)
+            cache: Optional result cache
+            executor: Optional existing process pool to submit batches to
+        """
+        self.checks = tuple(sorted(set(checks or ALL_CHECKS)))
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.executor = executor
+        self.analyzer = analyzer_key(self.checks)
+
+    def review(self, root: str, entries: Iterable[FileEntry],
+               read_bytes: Callable[[str], bytes] = _read_file,
+               io_executor: Optional[Executor] = None) -> ReviewReport:
+        """
+        Review every Python file among ``entries``.
+
+        Args:
+            root: Reviewed directory or archive (scopes the stat cache)
+            entries: Files of the tree
+            read_bytes: Reads a file's contents by entry path
+            io_executor: Optional thread pool used to read files concurrently
+
+        Returns:
+            Report with the findings of every file
+        """
+        start = time.perf_counter()
+        report = ReviewReport()
+        files = [entry for entry in entries if entry.name.lower().endswith(PYTHON_SUFFIXES)]
+
+        known = self.cache.load_stats(root) if self.cache else {}
+        encoded = self.cache.load_results(self.analyzer) if self.cache else {}
+
+        digests: Dict[str, str] = {}
+        to_read: List[FileEntry] = []
+        for entry in files:
+            signature = known.get(entry.path)
+            if (signature is not None and signature[:2] == (entry.size, entry.mtime_ns)
+                    and signature[2] in encoded):
+                digests[entry.path] = signature[2]
+                report.unchanged += 1
+            else:
+                to_read.append(entry)
+
+        def load(entry: FileEntry) -> Tuple[FileEntry, Optional[bytes], Optional[str]]:
+            try:
+                return entry, read_bytes(entry.path), None
+            except (OSError, KeyError) as e:
+                return entry, None, str(e)
+
+        runner = _BatchRunner(self.checks, self.workers, self.executor)
+        new_stats: List[Tuple[str, int, int, str]] = []
+        queued: Set[str] = set()
+        batch: List[Job] = []
+        batch_bytes = 0
+        try:
+            for offset in range(0, len(to_read), READ_CHUNK):
+                chunk = to_read[offset:offset + READ_CHUNK]
+                loaded = io_executor.map(load, chunk) if io_executor else map(load, chunk)
+                for entry, data, error in loaded:
+                    if data is None:
+                        report.read_errors.append(f"{entry.path}: {error}")
+                        continue
+                    digest = content_digest(data)
+                    digests[entry.path] = digest
+                    new_stats.append((entry.path, entry.size, entry.mtime_ns, digest))
+                    if digest in encoded or digest in queued:
+                        report.content_hits += 1
+                        continue
+                    queued.add(digest)
+                    batch.append((digest, data))
+                    batch_bytes += len(data)
+                    if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+                        runner.submit(batch)
+                        batch, batch_bytes = [], 0
+            if batch:
+                runner.submit(batch)
+        finally:
+            parsed = runner.finish()
+        report.parsed = len(parsed)
+
+        decoded: Dict[str, Findings] = {}
+        for entry in files:
+            digest = digests.get(entry.path)
+            if digest is None:
+                continue
+            findings = parsed.get(digest)
+            if findings is None:
+                findings = decoded.get(digest)
+                if findings is None:
+                    findings = decoded[digest] = json.loads(encoded[digest])
+            report.files_reviewed += 1
+            report.findings.extend(dict(finding, path=entry.path) for finding in findings)
+
+        if self.cache is not None:
+            seen = {entry.path for entry in files}
+            removed = [path for path in known if path not in seen]
+            self.cache.save(root, new_stats, removed, self.analyzer, parsed)
+
+        report.elapsed = time.perf_counter() - start
+        return report
@@ -0,0 +1,5 @@
+"""Delegation server module"""
+
+from .delegation_server import DelegationServer, RequestError
+
+__all__ = ['DelegationServer', 'RequestError']
@@ -0,0 +1,329 @@
+"""
+Delegation Server
+
+Serves the delegation API of ``cloud-agent-config.json`` from a long-running
+process, so small tasks skip interpreter startup and reuse warm agents,
+indexes and caches:
+
+- ``POST /api/delegate`` with ``{"task", "agent_id", "priority", "wait"}``
+  queues a task and answers ``{"task_id"}``; with ``"wait": true`` the
+  answer also carries the ``result``
+- ``POST /api/results`` with ``{"task_ids": [...]}`` answers
+  ``{"results": {task_id: result or null}}``, null while a task still runs
+- ``GET /api/status`` answers queue and task counters
+
+This is the protocol ``HttpAgent`` speaks, so one server can be a remote
+agent of another delegator.
+
+Tasks are queued on a ``TaskScheduler`` and run concurrently; a task whose
+``agent_id`` names a registered agent goes straight to that agent. Results
+of the last ``max_results`` finished tasks are kept for retrieval by id.
+
+The HTTP/1.1 handling is a small keep-alive server on ``asyncio`` streams,
+so accepting a task costs a request parse and a queue insert on the event
+loop. Request bodies may be gzip-compressed and larger responses are
+compressed for clients that accept gzip.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.delegator import QueueFullError, TaskScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINTS = {
+    "delegation": "/api/delegate",
+    "status": "/api/status",
+    "results": "/api/results",
+}
+DEFAULT_MAX_RESULTS = 10000
+DEFAULT_COMPRESS_THRESHOLD = 1024
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class RequestError(Exception):
+    """A request the server answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class DelegationServer:
+    """Accepts tasks over HTTP and runs them through a ``TaskScheduler``."""
+
+    def __init__(self, scheduler: TaskScheduler, endpoints: Optional[Dict[str, str]] = None,
+                 max_results: int = DEFAULT_MAX_RESULTS,
+                 compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD):
+        """
+        Initialize the server.
+
+        Args:
+            scheduler: Scheduler the tasks are queued on
+            endpoints: ``delegation``, ``status`` and ``results`` paths
+            max_results: Finished results kept for retrieval by id
+            compress_threshold: Responses larger than this many bytes are
+                gzip-compressed for clients that accept it
+        """
+        self.scheduler = scheduler
+        self.delegator = scheduler.delegator
+        self.endpoints = dict(DEFAULT_ENDPOINTS, **(endpoints or {}))
+        self.max_results = max_results
+        self.compress_threshold = compress_threshold
+        self._routes = {
+            ("POST", self.endpoints['delegation']): self._delegate,
+            ("POST", self.endpoints['results']): self._results,
+            ("GET", self.endpoints['status']): self._status,
+        }
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._results: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        self.started_at = time.time()
+        self.submitted = 0
+        self.completed = 0
+        self.requests = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Start listening.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one; see ``port``)
+        """
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        self.started_at = time.time()
+
+    @property
+    def port(self) -> Optional[int]:
+        """Port the server listens on."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled or ``close`` is called."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self) -> None:
+        """Stop accepting connections and close the open ones."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._connections):
+            writer.close()
+
+    async def submit(self, task: Dict[str, Any], agent_id: Optional[str] = None,
+                     priority: Optional[str] = None, wait: bool = False) -> str:
+        """
+        Queue a task and return its id.
+
+        Args:
+            task: Task specification dictionary
+            agent_id: Registered agent to run the task on (default: routed)
+            priority: Scheduling priority (default: the task's or the
+                scheduler's)
+            wait: Wait for room when the queue is full instead of raising
+
+        Raises:
+            QueueFullError: If the queue is full and ``wait`` is False
+            ValueError: If the priority is unknown
+        """
+        if agent_id is not None and agent_id in self.delegator.agents:
+            future = asyncio.ensure_future(self.delegator.delegate(task, agent_id))
+        else:
+            future = await self.scheduler.submit(task, priority, wait=wait)
+        task_id = uuid.uuid4().hex
+        self._pending[task_id] = future
+        self.submitted += 1
+        future.add_done_callback(lambda done: self._finish(task_id, done))
+        return task_id
+
+    def _finish(self, task_id: str, future: asyncio.Future) -> None:
+        """Move a finished task's result to the result store."""
+        self._pending.pop(task_id, None)
+        if future.cancelled():
+            result = {"status": "cancelled", "message": "Task was cancelled"}
+        elif future.exception() is not None:
+            result = {"status": "error", "message": str(future.exception())}
+        else:
+            result = future.result()
+        self._results[task_id] = result
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        self.completed += 1
+
+    def result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a task's result, None while it runs.
+
+        Unknown ids (never submitted, or evicted from the result store)
+        answer an error result so clients stop waiting for them.
+        """
+        if task_id in self._pending:
+            return None
+        result = self._results.get(task_id)
+        if result is None:
+            return {"status": "error", "message": f"Unknown task id: {task_id}"}
+        return result
+
+    async def wait(self, task_id: str) -> Dict[str, Any]:
+        """Wait for a task to finish and return its result."""
+        pending = self._pending.get(task_id)
+        if pending is not None:
+            await asyncio.wait([pending])
+        return self.result(task_id)
+
+    async def _delegate(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        task = payload.get('task')
+        if not isinstance(task, dict):
+            raise RequestError(400, "Request needs a 'task' object")
+        try:
+            task_id = await self.submit(task, payload.get('agent_id'),
+                                        payload.get('priority'), wait=False)
+        except QueueFullError as e:
+            raise RequestError(503, str(e))
+        except ValueError as e:
+            raise RequestError(400, str(e))
+        if payload.get('wait'):
+            return 200, {"task_id": task_id, "result": await self.wait(task_id)}
+        return 202, {"task_id": task_id}
+
+    async def _results(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        task_ids = payload.get('task_ids')
+        if not isinstance(task_ids, list):
+            raise RequestError(400, "Request needs a 'task_ids' list")
+        return 200, {"results": {str(task_id): self.result(str(task_id))
+                                 for task_id in task_ids}}
+
+    async def _status(self, payload: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+        return 200, self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return task counters, queue state and per-agent metrics."""
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.started_at, 3),
+            "agents": len(self.delegator.agents),
+            "submitted": self.submitted,
+            "running": len(self._pending),
+            "completed": self.completed,
+            "stored_results": len(self._results),
+            "requests": self.requests,
+            "scheduler": self.scheduler.stats(),
+            "metrics": self.delegator.metrics.snapshot(),
+        }
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Answer requests on one keep-alive connection until it closes."""
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, headers, body)
+                self._write_response(writer, status, payload, headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except RequestError as e:
+            # The request could not be framed; answer and drop the connection
+            self._write_response(writer, e.status, {"error": str(e)}, {}, False)
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Read one request, or return None when the client closed the connection."""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise RequestError(400, "Malformed request line")
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise RequestError(400, "Malformed Content-Length")
+        if length < 0:
+            raise RequestError(400, "Negative Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get('connection', '').lower()
+        keep_alive = (connection != 'close' if version == "HTTP/1.1"
+                      else connection == 'keep-alive')
+        return method, target.split('?', 1)[0], headers, body, keep_alive
+
+    async def _dispatch(self, method: str, path: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Route a request to its handler and turn failures into error answers."""
+        self.requests += 1
+        handler = self._routes.get((method, path))
+        if handler is None:
+            known = any(route_path == path for _, route_path in self._routes)
+            return (405, {"error": f"{method} not allowed"}) if known else (
+                404, {"error": f"No endpoint at {path}"})
+        try:
+            payload = None
+            if body:
+                if headers.get('content-encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                payload = json.loads(body)
+            if method == "POST" and not isinstance(payload, dict):
+                raise RequestError(400, "Request body must be a JSON object")
+            return await handler(payload)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except (ValueError, OSError) as e:
+            return 400, {"error": f"Invalid request body: {e}"}
+        except Exception as e:
+            logger.exception("Request to %s failed", path)
+            return 500, {"error": str(e)}
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int,
+                        payload: Dict[str, Any], request_headers: Dict[str, str],
+                        keep_alive: bool) -> None:
+        body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}",
+                 "Content-Type: application/json"]
+        if (len(body) > self.compress_threshold
+                and 'gzip' in request_headers.get('accept-encoding', '')):
+            body = gzip.compress(body, compresslevel=5)
+            lines.append("Content-Encoding: gzip")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
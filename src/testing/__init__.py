@@ -0,0 +1,6 @@
+"""Test execution module"""
+
+from .durations import DurationStore
+from .runner import ShardedTestRunner, TestRunnerError, TestRunReport, plan_shards
+
+__all__ = ['DurationStore', 'ShardedTestRunner', 'TestRunReport', 'TestRunnerError', 'plan_shards']
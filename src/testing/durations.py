@@ -0,0 +1,60 @@
+"""
+Recorded Test Durations
+
+Keeps the wall time of every test file from earlier runs in a JSON file, so
+the next run can balance shards by expected duration rather than by count.
+"""
+
+import json
+import os
+from typing import Dict
+
+DURATIONS_VERSION = 1
+
+
+class DurationStore:
+    """Per-root mapping of test file to its last measured duration."""
+
+    def __init__(self, path: str):
+        """
+        Load recorded durations.
+
+        A missing or unreadable file starts an empty store.
+
+        Args:
+            path: JSON file path
+        """
+        self.path = path
+        self._roots: Dict[str, Dict[str, float]] = {}
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == DURATIONS_VERSION:
+            self._roots = data.get('roots', {})
+
+    def get(self, root: str) -> Dict[str, float]:
+        """Return the recorded durations of the test files under ``root``."""
+        return dict(self._roots.get(os.path.abspath(root), {}))
+
+    def update(self, root: str, durations: Dict[str, float]) -> None:
+        """
+        Record new measurements, keeping entries of files that did not run.
+
+        Args:
+            root: Test root directory
+            durations: Mapping of test file to seconds
+        """
+        self._roots.setdefault(os.path.abspath(root), {}).update(durations)
+
+    def save(self) -> None:
+        """Write the store atomically."""
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': DURATIONS_VERSION, 'roots': self._roots}, f,
+                      indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,342 @@
+"""
+Sharded Test Runner
+
+Collects a pytest suite once, splits its test files into shards balanced by
+the durations recorded on earlier runs, and runs every shard in its own
+pytest process. The JUnit XML reports of the shards are merged into a single
+result.
+
+Test files are the unit of sharding, so module- and class-scoped fixtures
+are set up once per file, as in a serial run.
+
+Collection and shards run with the suite's directory as pytest's rootdir
+and conftest cut-off, so test ids are relative to it even when an ancestor
+directory holds a project marker such as ``setup.py``.
+"""
+
+import heapq
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, List, Optional, Tuple
+
+from .durations import DurationStore
+
+# Estimated seconds per test for files that were never timed, used until
+# some file of the suite has been measured.
+DEFAULT_TEST_SECONDS = 0.05
+
+# pytest exit code when no tests were collected.
+NO_TESTS_COLLECTED = 5
+
+MAX_REPORTED_FAILURES = 50
+SLOW_TEST_COUNT = 10
+OUTPUT_TAIL_CHARS = 4000
+
+_PYTEST_ARGS = ['-m', 'pytest', '-p', 'no:cacheprovider']
+
+
+def _pytest_command(python: str, root: str) -> List[str]:
+    """Return the pytest command line rooted at ``root``."""
+    root = os.path.abspath(root)
+    return [python] + _PYTEST_ARGS + [f'--rootdir={root}', f'--confcutdir={root}']
+
+
+class TestRunnerError(Exception):
+    """Raised when a suite cannot be collected."""
+
+
+def _tail(text: str) -> str:
+    return text[-OUTPUT_TAIL_CHARS:]
+
+
+def collect_tests(root: str, python: str = sys.executable,
+                  timeout: Optional[float] = None) -> Dict[str, int]:
+    """
+    Collect the suite under ``root`` without running it.
+
+    Args:
+        root: Directory pytest is run from
+        python: Interpreter used to run pytest
+        timeout: Seconds allowed for collection
+
+    Returns:
+        Mapping of test file (relative to ``root``) to its number of tests
+
+    Raises:
+        TestRunnerError: If collection fails or times out
+    """
+    try:
+        proc = subprocess.run(_pytest_command(python, root) + ['--collect-only', '-q'],
+                              cwd=root, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise TestRunnerError(f"Test collection timed out after {timeout}s")
+    if proc.returncode not in (0, NO_TESTS_COLLECTED):
+        raise TestRunnerError("Test collection failed:\n" + _tail(proc.stdout + proc.stderr))
+
+    counts: Dict[str, int] = {}
+    for line in proc.stdout.splitlines():
+        if '::' in line:
+            path = line.split('::', 1)[0]
+            counts[path] = counts.get(path, 0) + 1
+    return counts
+
+
+def plan_shards(counts: Dict[str, int], durations: Dict[str, float],
+                shard_count: int) -> List[Tuple[List[str], float]]:
+    """
+    Split test files into shards of roughly equal expected duration.
+
+    Uses longest-processing-time-first assignment. Files without a recorded
+    duration are estimated from their number of tests and the mean
+    per-test time of the files that were measured.
+
+    Args:
+        counts: Mapping of test file to number of tests
+        durations: Recorded seconds per test file
+        shard_count: Number of shards to produce
+
+    Returns:
+        List of (files, expected seconds) for every non-empty shard
+    """
+    measured = [(durations[path], count) for path, count in counts.items()
+                if path in durations]
+    total_tests = sum(count for _, count in measured)
+    per_test = (sum(seconds for seconds, _ in measured) / total_tests
+                if total_tests else DEFAULT_TEST_SECONDS)
+
+    estimates = sorted(((durations.get(path, count * per_test), path)
+                        for path, count in counts.items()), reverse=True)
+    shards: List[List[str]] = [[] for _ in range(max(1, shard_count))]
+    loads = [(0.0, slot) for slot in range(len(shards))]
+    for estimate, path in estimates:
+        load, slot = loads[0]
+        shards[slot].append(path)
+        heapq.heapreplace(loads, (load + estimate, slot))
+    expected = {slot: load for load, slot in loads}
+    return [(sorted(files), expected[slot]) for slot, files in enumerate(shards) if files]
+
+
+class TestRunReport:
+    """Merged results of all shards."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.total_tests = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.shards: List[Dict[str, Any]] = []
+        self.failures: List[Dict[str, str]] = []
+        self.file_durations: Dict[str, float] = {}
+        self._slowest: List[Tuple[float, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        """True if nothing failed or errored."""
+        return not (self.failed or self.errors)
+
+    def add_case(self, test_id: str, path: Optional[str], seconds: float,
+                 outcome: str, message: str = "") -> None:
+        """
+        Record one test case.
+
+        Args:
+            test_id: Readable test identifier
+            path: Test file, if known
+            seconds: Time taken
+            outcome: ``passed``, ``failed``, ``error`` or ``skipped``
+            message: Failure message
+        """
+        self.total_tests += 1
+        if outcome == 'passed':
+            self.passed += 1
+        elif outcome == 'skipped':
+            self.skipped += 1
+        else:
+            if outcome == 'failed':
+                self.failed += 1
+            else:
+                self.errors += 1
+            if len(self.failures) < MAX_REPORTED_FAILURES:
+                self.failures.append({"test": test_id, "outcome": outcome,
+                                      "message": message})
+        if path:
+            self.file_durations[path] = self.file_durations.get(path, 0.0) + seconds
+        if len(self._slowest) < SLOW_TEST_COUNT:
+            heapq.heappush(self._slowest, (seconds, test_id))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, test_id))
+
+    def slow_tests(self) -> List[Dict[str, Any]]:
+        """Return the slowest tests, slowest first."""
+        return [{"test": test_id, "duration": round(seconds, 3)}
+                for seconds, test_id in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the report in the ``test_results`` shape."""
+        return {
+            "total_tests": self.total_tests,
+            "passed": self.passed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "duration": round(self.duration, 3),
+            "shards": self.shards,
+            "slow_tests": self.slow_tests(),
+            "failures": self.failures,
+        }
+
+
+def _test_id(case: ElementTree.Element, path: Optional[str]) -> str:
+    """Rebuild a ``file::Class::test`` identifier from a JUnit test case."""
+    classname = case.get('classname', '')
+    name = case.get('name', '')
+    if not path:
+        return f"{classname}.{name}" if classname else name
+    module = os.path.splitext(path)[0].replace('/', '.').replace(os.sep, '.')
+    if classname.startswith(module + '.'):
+        return f"{path}::{classname[len(module) + 1:].replace('.', '::')}::{name}"
+    return f"{path}::{name}"
+
+
+def merge_junit(report: TestRunReport, junit_path: str) -> int:
+    """
+    Add the test cases of one JUnit XML file to ``report``.
+
+    Args:
+        report: Report to update
+        junit_path: JUnit XML written by ``pytest --junitxml``
+
+    Returns:
+        Number of test cases read
+    """
+    count = 0
+    for case in ElementTree.parse(junit_path).iter('testcase'):
+        path = case.get('file')
+        outcome, message = 'passed', ''
+        for child in case:
+            if child.tag in ('failure', 'error', 'skipped'):
+                outcome = {'failure': 'failed', 'error': 'error'}.get(child.tag, 'skipped')
+                message = child.get('message', '')
+                if outcome != 'skipped':
+                    break
+        report.add_case(_test_id(case, path), path, float(case.get('time') or 0),
+                        outcome, message)
+        count += 1
+    return count
+
+
+class ShardedTestRunner:
+    """Runs a pytest suite as parallel, duration-balanced shards."""
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 durations: Optional[DurationStore] = None,
+                 python: str = sys.executable):
+        """
+        Initialize the runner.
+
+        Args:
+            workers: Number of shards run at once (default: CPU count)
+            timeout: Seconds allowed for the whole run, collection included
+            durations: Store of recorded file durations, updated after the run
+            python: Interpreter used to run pytest
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.durations = durations
+        self.python = python
+
+    def run(self, root: str) -> TestRunReport:
+        """
+        Collect and run the suite under ``root``.
+
+        Args:
+            root: Directory pytest is run from
+
+        Returns:
+            Merged report
+
+        Raises:
+            TestRunnerError: If the suite cannot be collected
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout if self.timeout else None
+        report = TestRunReport()
+
+        counts = collect_tests(root, self.python, self.timeout)
+        if not counts:
+            report.duration = time.monotonic() - start
+            return report
+
+        recorded = self.durations.get(root) if self.durations else {}
+        plan = plan_shards(counts, recorded, min(self.workers, len(counts)))
+
+        with tempfile.TemporaryDirectory(prefix="ymera-tests-") as tmp_dir:
+            running = []
+            for number, (files, expected) in enumerate(plan):
+                junit_path = os.path.join(tmp_dir, f"shard-{number}.xml")
+                log = open(os.path.join(tmp_dir, f"shard-{number}.log"), 'w+')
+                cmd = (_pytest_command(self.python, root)
+                       + ['-q', '-o', 'junit_family=xunit1', f'--junitxml={junit_path}']
+                       + files)
+                proc = subprocess.Popen(cmd, cwd=root, stdout=log, stderr=subprocess.STDOUT)
+                running.append((number, files, expected, junit_path, log, proc,
+                                time.monotonic()))
+
+            try:
+                for number, files, expected, junit_path, log, proc, started in running:
+                    self._finish_shard(report, number, files, expected, junit_path,
+                                       log, proc, started, deadline)
+            finally:
+                for _, _, _, _, log, proc, _ in running:
+                    if proc.poll() is None:
+                        proc.kill()
+                        proc.wait()
+                    log.close()
+
+        if self.durations is not None and report.file_durations:
+            self.durations.update(root, report.file_durations)
+            self.durations.save()
+        report.duration = time.monotonic() - start
+        return report
+
+    def _finish_shard(self, report: TestRunReport, number: int, files: List[str],
+                      expected: float, junit_path: str, log, proc: subprocess.Popen,
+                      started: float, deadline: Optional[float]) -> None:
+        """Wait for one shard and merge its results."""
+        timed_out = False
+        try:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            proc.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            proc.kill()
+            proc.wait()
+
+        shard = {
+            "shard": number,
+            "files": len(files),
+            "expected_duration": round(expected, 3),
+            "duration": round(time.monotonic() - started, 3),
+            "exit_code": proc.returncode,
+            "tests": 0,
+        }
+        try:
+            shard["tests"] = merge_junit(report, junit_path)
+        except (OSError, ElementTree.ParseError):
+            pass
+
+        if timed_out or shard["tests"] == 0:
+            log.seek(0)
+            message = "timed out" if timed_out else "produced no results"
+            report.errors += 1
+            report.failures.append({"test": f"shard {number}", "outcome": "error",
+                                    "message": f"Shard {message}:\n{_tail(log.read())}"})
+            shard["timed_out"] = timed_out
+        report.shards.append(shard)
@@ -0,0 +1,6 @@
+"""Workflow execution module"""
+
+from .executor import StepResult, WorkflowExecutor, WorkflowResult
+from .graph import Workflow, WorkflowStep
+
+__all__ = ['StepResult', 'Workflow', 'WorkflowExecutor', 'WorkflowResult', 'WorkflowStep']
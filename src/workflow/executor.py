@@ -0,0 +1,154 @@
+"""
+Workflow Executor
+
+Runs a workflow through a ``TaskDelegator``. Every step starts as soon as
+all of its dependencies have succeeded, so independent steps run
+concurrently; a step whose dependency failed is skipped. The result reports
+the wall time of the run next to the duration of its critical path, the
+lower bound for any schedule of the same steps.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from ..delegator.scheduler import TaskScheduler
+from ..delegator.task_delegator import TaskDelegator
+from .graph import Workflow, WorkflowStep
+
+
+class StepResult:
+    """Outcome and timing of one step."""
+
+    def __init__(self, step: WorkflowStep, depends_on: List[int]):
+        """
+        Initialize a pending step result.
+
+        Args:
+            step: Step being run
+            depends_on: Step numbers it waited for
+        """
+        self.step = step
+        self.depends_on = depends_on
+        self.status = "pending"
+        self.started = 0.0
+        self.duration = 0.0
+        self.result: Dict[str, Any] = {}
+
+    @property
+    def succeeded(self) -> bool:
+        """True if the step ran and reported success."""
+        return self.status == "success"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the step for a task result."""
+        return {
+            "step": self.step.step_id,
+            "action": self.step.action,
+            "agent": self.step.agent,
+            "depends_on": self.depends_on,
+            "status": self.status,
+            "message": self.result.get("message", ""),
+            "started": round(self.started, 3),
+            "duration": round(self.duration, 3),
+        }
+
+
+class WorkflowResult:
+    """Step results and timings of a workflow run."""
+
+    def __init__(self, workflow: Workflow, steps: List[StepResult], wall_time: float):
+        """
+        Initialize a workflow result.
+
+        Args:
+            workflow: Workflow that was run
+            steps: Step results in workflow order
+            wall_time: Seconds from start to the last step finishing
+        """
+        self.workflow = workflow
+        self.steps = steps
+        self.wall_time = wall_time
+        durations = {result.step.step_id: result.duration for result in steps}
+        self.critical_path, self.critical_path_time = workflow.critical_path(durations)
+        self.serial_time = sum(durations.values())
+
+    @property
+    def succeeded(self) -> bool:
+        """True if every step succeeded."""
+        return all(result.succeeded for result in self.steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the run for a task result."""
+        return {
+            "workflow_id": self.workflow.workflow_id,
+            "steps": [result.to_dict() for result in self.steps],
+            "wall_time": round(self.wall_time, 3),
+            "critical_path": self.critical_path,
+            "critical_path_time": round(self.critical_path_time, 3),
+            "serial_time": round(self.serial_time, 3),
+        }
+
+
+class WorkflowExecutor:
+    """Executes workflow steps concurrently as their dependencies complete."""
+
+    def __init__(self, delegator: TaskDelegator, scheduler: Optional[TaskScheduler] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            delegator: Delegator the steps are sent through
+            scheduler: Queue steps at the workflow's priority instead of
+                dispatching them directly (steps pinned to an agent always
+                go directly)
+        """
+        self.delegator = delegator
+        self.scheduler = scheduler
+
+    async def run(self, workflow: Workflow) -> WorkflowResult:
+        """
+        Run every step of ``workflow``.
+
+        Args:
+            workflow: Workflow to run
+
+        Returns:
+            Results of all steps with wall and critical-path times
+        """
+        start = time.perf_counter()
+        results: List[StepResult] = []
+        pending: Dict[int, asyncio.Task] = {}
+        for step in workflow.steps:
+            depends_on = workflow.dependencies[step.step_id]
+            result = StepResult(step, depends_on)
+            results.append(result)
+            pending[step.step_id] = asyncio.create_task(
+                self._run_step(result, [pending[step_id] for step_id in depends_on], start,
+                               workflow.priority))
+        await asyncio.gather(*pending.values())
+        return WorkflowResult(workflow, results, time.perf_counter() - start)
+
+    async def _run_step(self, result: StepResult, dependencies: List[asyncio.Task],
+                        start: float, priority: Optional[str]) -> StepResult:
+        """Wait for the dependencies of a step, then delegate it."""
+        finished = await asyncio.gather(*dependencies)
+        failed = [dependency.step.step_id for dependency in finished
+                  if not dependency.succeeded]
+        if failed:
+            result.status = "skipped"
+            result.result = {"message": f"Skipped: step {failed[0]} did not succeed"}
+            return result
+
+        step = result.step
+        result.started = time.perf_counter() - start
+        try:
+            if self.scheduler is not None and not step.agent:
+                result.result = await self.scheduler.run(step.to_task(), priority)
+            else:
+                result.result = await self.delegator.delegate(step.to_task(), agent_id=step.agent)
+        except Exception as e:
+            result.result = {"status": "error", "message": str(e)}
+        result.duration = time.perf_counter() - start - result.started
+        result.status = result.result.get("status", "error")
+        return result
@@ -0,0 +1,199 @@
+"""
+Workflow Graph
+
+Loads a task file's ``workflow`` list and derives the dependencies between
+its steps from their ``input`` and ``output`` paths. A step depends on an
+earlier step when it reads a path the earlier step writes, writes a path the
+earlier step reads, or writes the same path; paths overlap when one equals
+or contains the other. Steps may also name extra predecessors in
+``depends_on``. Edges only point to earlier steps, so the graph is acyclic.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _normalize(path: Optional[str], base_dir: str) -> Optional[str]:
+    if not path:
+        return None
+    return os.path.normpath(os.path.join(base_dir, path))
+
+
+def paths_overlap(first: Optional[str], second: Optional[str]) -> bool:
+    """Return True if either normalized path equals or contains the other."""
+    if first is None or second is None:
+        return False
+    return (first == second or first.startswith(second.rstrip(os.sep) + os.sep)
+            or second.startswith(first.rstrip(os.sep) + os.sep))
+
+
+class WorkflowStep:
+    """One action of a workflow."""
+
+    def __init__(self, step_id: int, action: str, input_path: Optional[str] = None,
+                 output_path: Optional[str] = None, agent: Optional[str] = None,
+                 depends_on: Optional[List[int]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a step.
+
+        Args:
+            step_id: Step number, unique within the workflow
+            action: Task type to delegate (``unzip``, ``review``, ...)
+            input_path: Path the step reads
+            output_path: Path the step writes
+            agent: Agent to delegate to (optional)
+            depends_on: Explicit predecessor step numbers
+            options: Extra task parameters passed through to the agent
+        """
+        self.step_id = step_id
+        self.action = action
+        self.input_path = input_path
+        self.output_path = output_path
+        self.agent = agent
+        self.depends_on = list(depends_on or [])
+        self.options = dict(options or {})
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], position: int) -> 'WorkflowStep':
+        """
+        Build a step from its task-file entry.
+
+        Args:
+            data: Step dictionary
+            position: 1-based position, used when ``step`` is missing
+
+        Raises:
+            ValueError: If the step has no action
+        """
+        if not data.get('action'):
+            raise ValueError(f"Workflow step {position} has no action")
+        known = {'step', 'action', 'input', 'output', 'agent', 'depends_on'}
+        return cls(
+            step_id=int(data.get('step', position)),
+            action=data['action'],
+            input_path=data.get('input'),
+            output_path=data.get('output'),
+            agent=data.get('agent'),
+            depends_on=[int(step) for step in data.get('depends_on', [])],
+            options={key: value for key, value in data.items() if key not in known},
+        )
+
+    def to_task(self) -> Dict[str, Any]:
+        """Return the task dictionary delegated to an agent."""
+        task = dict(self.options)
+        task.update({"step": self.step_id, "action": self.action,
+                     "input": self.input_path, "output": self.output_path})
+        return task
+
+
+class Workflow:
+    """Steps of a task file and the dependencies between them."""
+
+    def __init__(self, workflow_id: str, steps: List[WorkflowStep],
+                 base_dir: Optional[str] = None, priority: Optional[str] = None):
+        """
+        Initialize a workflow and derive its dependency graph.
+
+        Args:
+            workflow_id: Identifier of the task file
+            steps: Steps in file order
+            base_dir: Directory relative paths are resolved against (default: cwd)
+            priority: Scheduling priority of its steps (``high``, ``normal``, ``low``)
+
+        Raises:
+            ValueError: If step numbers repeat or ``depends_on`` is invalid
+        """
+        self.workflow_id = workflow_id
+        self.steps = steps
+        self.base_dir = base_dir or os.getcwd()
+        self.priority = priority
+        self.dependencies = self._build_dependencies()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base_dir: Optional[str] = None) -> 'Workflow':
+        """
+        Build a workflow from a parsed task file.
+
+        Raises:
+            ValueError: If the task file has no workflow or a step is invalid
+        """
+        entries = data.get('workflow')
+        if not entries:
+            raise ValueError("Task file has no workflow steps")
+        steps = [WorkflowStep.from_dict(entry, position)
+                 for position, entry in enumerate(entries, start=1)]
+        return cls(str(data.get('task_id', 'workflow')), steps, base_dir, data.get('priority'))
+
+    @classmethod
+    def load(cls, path: str, base_dir: Optional[str] = None) -> 'Workflow':
+        """
+        Load a task file.
+
+        Args:
+            path: JSON task file
+            base_dir: Directory step paths are relative to (default: cwd)
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid workflow
+        """
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f), base_dir)
+
+    def _build_dependencies(self) -> Dict[int, List[int]]:
+        """Map each step number to the numbers of the steps it waits for."""
+        positions = {}
+        for position, step in enumerate(self.steps):
+            if step.step_id in positions:
+                raise ValueError(f"Duplicate workflow step number: {step.step_id}")
+            positions[step.step_id] = position
+
+        paths = [(_normalize(step.input_path, self.base_dir),
+                  _normalize(step.output_path, self.base_dir)) for step in self.steps]
+        dependencies: Dict[int, List[int]] = {}
+        for position, step in enumerate(self.steps):
+            reads, writes = paths[position]
+            found = []
+            for earlier in range(position):
+                earlier_reads, earlier_writes = paths[earlier]
+                if (paths_overlap(reads, earlier_writes) or paths_overlap(writes, earlier_reads)
+                        or paths_overlap(writes, earlier_writes)):
+                    found.append(self.steps[earlier].step_id)
+            for step_id in step.depends_on:
+                if positions.get(step_id, len(self.steps)) >= position:
+                    raise ValueError(f"Step {step.step_id} can only depend on earlier "
+                                     f"steps, not {step_id}")
+                if step_id not in found:
+                    found.append(step_id)
+            dependencies[step.step_id] = sorted(found, key=positions.get)
+        return dependencies
+
+    def critical_path(self, durations: Dict[int, float]) -> Tuple[List[int], float]:
+        """
+        Find the longest chain of dependent steps.
+
+        Args:
+            durations: Seconds taken by each step (missing steps count as 0)
+
+        Returns:
+            Tuple of (step numbers along the path, total seconds)
+        """
+        finish: Dict[int, float] = {}
+        previous: Dict[int, Optional[int]] = {}
+        for step in self.steps:
+            before = max(self.dependencies[step.step_id], key=lambda s: finish[s], default=None)
+            start = finish[before] if before is not None else 0.0
+            finish[step.step_id] = start + durations.get(step.step_id, 0.0)
+            previous[step.step_id] = before
+        if not finish:
+            return [], 0.0
+
+        last: Optional[int] = max(finish, key=finish.get)
+        total = finish[last]
+        path = []
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        return path[::-1], total
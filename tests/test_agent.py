@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local agents
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import HttpAgent, HttpAgentError, LocalProcessAgent, WorkerTimeoutError, pool_size
+from src.delegator import TaskDelegator
+
+_worker_state = {}
+
+
+def remember_setup(value):
+    _worker_state['setup'] = value
+
+
+def report_worker(task):
+    if task.get('sleep'):
+        time.sleep(task['sleep'])
+    return {"status": "success", "pid": os.getpid(), "setup": _worker_state.get('setup'),
+            "n": task.get('n')}
+
+
+class StandInService(BaseHTTPRequestHandler):
+    """Stand-in for the delegation service; results are ready on the second poll."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(200, {"status": "ok"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            self.server.gzipped += 1
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        with self.server.lock:
+            if self.path == "/api/delegate":
+                if payload["task"].get("reject"):
+                    return self._reply(400, {"error": "rejected"})
+                task_id = f"t{len(self.server.tasks)}"
+                self.server.tasks[task_id] = payload["task"]
+                return self._reply(202, {"task_id": task_id})
+            self.server.result_calls += 1
+            ready = self.server.result_calls > 1
+            results = {task_id: ({"status": "success", "n": self.server.tasks[task_id]["n"]}
+                                 if ready else None)
+                       for task_id in payload["task_ids"]}
+            self._reply(200, {"results": results})
+
+
+class TestHttpAgent(unittest.TestCase):
+    """Test cases for HttpAgent against a local stand-in service."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInService)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = self.server.gzipped = self.server.result_calls = 0
+        self.server.tasks = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_pooled_requests_and_bulk_results(self):
+        """Test connection reuse, gzip bodies and one results call per poll."""
+        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "cloud-agent-config.json")) as f:
+            cloud_config = json.load(f)
+
+        async def run():
+            agent = HttpAgent.from_config("remote", self.url, cloud_config,
+                                          max_connections=2, poll_interval=0.01)
+            try:
+                tasks = [{"n": n, "blob": "x" * (2048 if n == 0 else 10)} for n in range(20)]
+                results = await asyncio.gather(*(agent.execute(task) for task in tasks))
+                with self.assertRaises(HttpAgentError):
+                    await agent.execute({"n": 99, "reject": True})
+                return results, agent.pool.opened, agent.health_check(), agent.config
+            finally:
+                agent.close()
+
+        results, opened, healthy, config = asyncio.run(run())
+        self.assertEqual([result["n"] for result in results], list(range(20)))
+        self.assertTrue(healthy)
+        self.assertEqual(config["timeout"], 3600)
+        self.assertLessEqual(opened, 2)
+        self.assertLessEqual(self.server.connections, 2)
+        self.assertEqual(self.server.gzipped, 1)
+        self.assertLess(self.server.result_calls, len(results))
+
+    def test_unreachable_service_is_unhealthy(self):
+        """Test that health_check reports a closed port as unavailable."""
+        agent = HttpAgent("remote", "http://127.0.0.1:1", request_timeout=1)
+        try:
+            self.assertFalse(agent.health_check())
+        finally:
+            agent.close()
+
+
+class TestLocalProcessAgent(unittest.TestCase):
+    """Test cases for LocalProcessAgent."""
+
+    def test_pool_size_from_memory(self):
+        """Test that the pool is capped by cores and by memory per task."""
+        self.assertEqual(pool_size({}, cpu_count=8, memory_mb=4096), 8)
+        self.assertEqual(pool_size({"memory": 1024}, cpu_count=8, memory_mb=4096), 4)
+        self.assertEqual(pool_size({"memory": 8192}, cpu_count=8, memory_mb=4096), 1)
+
+    def test_runs_tasks_in_warm_workers(self):
+        """Test that tasks run in initialized worker processes in parallel."""
+        async def run():
+            agent = LocalProcessAgent("procs", report_worker, {"capabilities": ["work"]},
+                                      workers=2, initializer=remember_setup,
+                                      initargs=("warm",))
+            try:
+                await agent.start()
+                delegator = TaskDelegator()
+                await delegator.register_agent(agent)
+                tasks = ({"action": "work", "n": n, "sleep": 0.05} for n in range(6))
+                return [result async for _, result in delegator.delegate_many(tasks)]
+            finally:
+                agent.close()
+
+        results = asyncio.run(run())
+        self.assertEqual(sorted(result["n"] for result in results), list(range(6)))
+        self.assertTrue(all(result["setup"] == "warm" for result in results))
+        pids = {result["pid"] for result in results}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertLessEqual(len(pids), 2)
+
+    @unittest.skipUnless(hasattr(__import__('signal'), 'setitimer'), "needs POSIX timers")
+    def test_worker_timeout_frees_worker(self):
+        """Test that an overrunning task is interrupted inside its worker."""
+        async def run():
+            agent = LocalProcessAgent("procs", report_worker, {"timeout": 0.1}, workers=1)
+            try:
+                with self.assertRaises(WorkerTimeoutError):
+                    await agent.execute({"sleep": 5})
+                return await agent.execute({"n": 1})
+            finally:
+                agent.close()
+
+        start = time.perf_counter()
+        result = asyncio.run(run())
+        self.assertEqual(result["n"], 1)
+        self.assertLess(time.perf_counter() - start, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
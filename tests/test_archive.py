@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the archive extraction backends
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import io
+import tarfile
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.archive import (
+    ArchiveError,
+    IncrementalZipExtractor,
+    TarExtractor,
+    ZipExtractor,
+    detect_archive_format,
+)
+from src.archive import formats
+from src.archive.common import safe_member_path
+from src.archive.manifest import manifest_path_for
+
+
+def make_zip(path, members, compression=zipfile.ZIP_DEFLATED):
+    """Write a zip archive from a {name: bytes} mapping."""
+    with zipfile.ZipFile(path, 'w', compression) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+class TestZipExtractor(unittest.TestCase):
+    """Test cases for ZipExtractor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.test_dir, "archive.zip")
+        self.output_dir = os.path.join(self.test_dir, "out")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_in_process_extraction(self):
+        """Test extraction of a small archive without a pool."""
+        make_zip(self.zip_path, {"a.txt": b"alpha", "pkg/b.py": b"print(1)\n", "pkg/sub/": b""})
+
+        stats = ZipExtractor(workers=1).extract(self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 2)
+        self.assertEqual(stats.error_count, 0)
+        with open(os.path.join(self.output_dir, "pkg", "b.py"), 'rb') as f:
+            self.assertEqual(f.read(), b"print(1)\n")
+        self.assertTrue(os.path.isdir(os.path.join(self.output_dir, "pkg", "sub")))
+
+    def test_parallel_extraction(self):
+        """Test extraction across a process pool."""
+        members = {f"dir{i % 7}/file{i}.txt": (b"x" * i) for i in range(200)}
+        make_zip(self.zip_path, members)
+
+        stats = ZipExtractor(workers=2).extract(self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 200)
+        self.assertEqual(stats.bytes_written, sum(len(v) for v in members.values()))
+        self.assertIn('mb_per_s', stats.throughput())
+        self.assertEqual(os.path.getsize(os.path.join(self.output_dir, "dir3", "file199.txt")), 199)
+
+    def test_crc_mismatch_detected(self):
+        """Test that corrupted member data is reported, not written."""
+        make_zip(self.zip_path, {"data.bin": b"0123456789" * 10}, zipfile.ZIP_STORED)
+        with open(self.zip_path, 'r+b') as f:
+            raw = f.read()
+            offset = raw.index(b"0123456789")
+            f.seek(offset)
+            f.write(b"X")
+
+        stats = ZipExtractor(workers=1).extract(self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 0)
+        self.assertEqual(stats.error_count, 1)
+        self.assertIn('CRC', stats.errors[0])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "data.bin")))
+
+    def test_member_size_limit(self):
+        """Test that members above the size limit are rejected."""
+        make_zip(self.zip_path, {"big.bin": b"b" * 2048, "small.bin": b"s"})
+
+        stats = ZipExtractor(workers=1, max_member_bytes=1024).extract(
+            self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 1)
+        self.assertEqual(stats.error_count, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "big.bin")))
+
+    def test_safe_member_path(self):
+        """Test that member names cannot escape the output directory."""
+        self.assertEqual(safe_member_path("out", "../../etc/passwd"),
+                         os.path.join("out", "etc", "passwd"))
+        self.assertEqual(safe_member_path("out", "/abs/file"),
+                         os.path.join("out", "abs", "file"))
+        self.assertIsNone(safe_member_path("out", "../"))
+
+
+class TestIncrementalZipExtractor(unittest.TestCase):
+    """Test cases for manifest-driven incremental extraction."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.test_dir, "archive.zip")
+        self.output_dir = os.path.join(self.test_dir, "out")
+        self.extractor = IncrementalZipExtractor(ZipExtractor(workers=1))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_only_changes_are_applied(self):
+        """Test that unchanged members are skipped and vanished ones deleted."""
+        make_zip(self.zip_path, {"keep.txt": b"same", "edit.txt": b"v1", "gone/old.txt": b"bye"})
+        stats, summary = self.extractor.extract(self.zip_path, self.output_dir)
+        self.assertEqual(stats.files, 3)
+        self.assertTrue(os.path.exists(manifest_path_for(self.output_dir)))
+
+        make_zip(self.zip_path, {"keep.txt": b"same", "edit.txt": b"v2", "new.txt": b"hi"})
+        stats, summary = self.extractor.extract(self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 2)
+        self.assertEqual(summary, {'changed': 2, 'removed': 1, 'unchanged': 1})
+        with open(os.path.join(self.output_dir, "edit.txt"), 'rb') as f:
+            self.assertEqual(f.read(), b"v2")
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "gone")))
+
+    def test_rerun_without_changes_writes_nothing(self):
+        """Test that an identical archive produces no writes."""
+        make_zip(self.zip_path, {"a.txt": b"a", "b.txt": b"b"})
+        self.extractor.extract(self.zip_path, self.output_dir)
+
+        stats, summary = self.extractor.extract(self.zip_path, self.output_dir)
+
+        self.assertEqual(stats.files, 0)
+        self.assertEqual(summary['unchanged'], 2)
+
+
+def make_tar(path, members, mode='w'):
+    """Write a tar archive from a {name: bytes} mapping."""
+    with tarfile.open(path, mode) as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+class TestTarExtractor(unittest.TestCase):
+    """Test cases for TarExtractor and format detection."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.test_dir, "out")
+        self.members = {f"pkg/mod{i}.py": (f"value = {i}\n" * 1000).encode() for i in range(20)}
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_detect_by_magic_not_name(self):
+        """Test that detection ignores misleading file names."""
+        gz_path = os.path.join(self.test_dir, "looks_like.zip")
+        make_tar(gz_path, self.members, 'w:gz')
+        zip_path = os.path.join(self.test_dir, "looks_like.tar")
+        make_zip(zip_path, {"a": b"a"})
+        tar_path = os.path.join(self.test_dir, "plain")
+        make_tar(tar_path, self.members)
+
+        self.assertEqual(detect_archive_format(gz_path), formats.GZIP)
+        self.assertEqual(detect_archive_format(zip_path), formats.ZIP)
+        self.assertEqual(detect_archive_format(tar_path), formats.TAR)
+
+    def test_extract_compressed_tarballs(self):
+        """Test single-pass extraction of gzip, bzip2 and xz tarballs."""
+        for mode in ('w', 'w:gz', 'w:bz2', 'w:xz'):
+            with self.subTest(mode=mode):
+                tar_path = os.path.join(self.test_dir, "archive")
+                make_tar(tar_path, self.members, mode)
+                out = os.path.join(self.output_dir, mode.replace(':', '_'))
+
+                stats = TarExtractor().extract(tar_path, out)
+
+                self.assertEqual(stats.files, 20)
+                with open(os.path.join(out, "pkg", "mod7.py"), 'rb') as f:
+                    self.assertEqual(f.read(), self.members["pkg/mod7.py"])
+
+    def test_truncated_gzip_raises(self):
+        """Test that a truncated compressed stream is reported."""
+        tar_path = os.path.join(self.test_dir, "archive.tar.gz")
+        make_tar(tar_path, self.members, 'w:gz')
+        with open(tar_path, 'r+b') as f:
+            f.truncate(os.path.getsize(tar_path) // 2)
+
+        with self.assertRaises(ArchiveError):
+            TarExtractor().extract(tar_path, self.output_dir)
+
+    def test_links_are_skipped(self):
+        """Test that symlinks are not materialised."""
+        tar_path = os.path.join(self.test_dir, "links.tar")
+        with tarfile.open(tar_path, 'w') as archive:
+            link = tarfile.TarInfo("escape")
+            link.type = tarfile.SYMTYPE
+            link.linkname = "/etc/passwd"
+            archive.addfile(link)
+
+        stats = TarExtractor().extract(tar_path, self.output_dir)
+
+        self.assertEqual(stats.skipped, 1)
+        self.assertFalse(os.path.lexists(os.path.join(self.output_dir, "escape")))
+
+
+if __name__ == '__main__':
+    unittest.main()
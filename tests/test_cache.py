@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the result cache
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import CloudAgent
+from src.cache import ResultCache, cache_key, input_fingerprint, task_digest
+from src.delegator import TaskDelegator
+from src.fs import FileIndexCache
+
+
+class CountingAgent(CloudAgent):
+    """Agent that counts the tasks it runs."""
+
+    def __init__(self, agent_id):
+        super().__init__(agent_id)
+        self.calls = 0
+
+    async def execute(self, task):
+        self.calls += 1
+        return {"status": "success", "call": self.calls}
+
+    def health_check(self):
+        return True
+
+
+class TestCacheKeys(unittest.TestCase):
+    """Test cases for task digests and input fingerprints."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_task_digest_ignores_key_order(self):
+        """Test that equal tasks hash equally regardless of key order."""
+        self.assertEqual(task_digest({"a": 1, "b": [1, 2]}), task_digest({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(task_digest({"a": 1}), task_digest({"a": 2}))
+
+    def test_fingerprint_tracks_tree_changes(self):
+        """Test that adding or resizing a file changes the fingerprint."""
+        path = os.path.join(self.test_dir, "a.py")
+        with open(path, 'w') as f:
+            f.write("x = 1\n")
+        first = input_fingerprint(self.test_dir)
+        self.assertEqual(input_fingerprint(self.test_dir), first)
+
+        with open(path, 'w') as f:
+            f.write("x = 12\n")
+        second = input_fingerprint(self.test_dir)
+        self.assertNotEqual(second, first)
+
+        os.makedirs(os.path.join(self.test_dir, "pkg"))
+        with open(os.path.join(self.test_dir, "pkg", "b.py"), 'w') as f:
+            f.write("")
+        self.assertNotEqual(input_fingerprint(self.test_dir), second)
+        self.assertNotEqual(input_fingerprint(path), input_fingerprint(self.test_dir))
+        self.assertEqual(input_fingerprint(None), input_fingerprint("/no/such/path"))
+
+    def test_fingerprint_from_index_entries(self):
+        """Test that entries of an index give the same fingerprint as a scan."""
+        with open(os.path.join(self.test_dir, "a.py"), 'w') as f:
+            f.write("x = 1\n")
+        index_cache = FileIndexCache(workers=2)
+        try:
+            entries = index_cache.get(self.test_dir).iter_files()
+            self.assertEqual(input_fingerprint(self.test_dir, entries),
+                             input_fingerprint(self.test_dir))
+        finally:
+            index_cache.close()
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_lru_eviction_and_counters(self):
+        """Test LRU order, copies on lookup and hit/miss counters."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")["n"] = 99
+        cache.put("c", {"n": 3})
+        self.assertEqual(cache.get("a"), {"n": 1})
+        self.assertIsNone(cache.get("b"))
+        self.assertFalse(cache.put("d", {"bad": object()}))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+        self.assertEqual(stats["entries"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3, places=3)
+
+    def test_ttl_and_invalidation(self):
+        """Test expiry and invalidation by key, path and all."""
+        cache = ResultCache(ttl=0.05)
+        cache.put("short", {"n": 1})
+        cache.put("long", {"n": 2}, input_path=self.test_dir, ttl=60)
+        cache.put("other", {"n": 3}, ttl=60)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+        self.assertEqual(cache.invalidate_path(self.test_dir), 1)
+        self.assertIsNone(cache.get("long"))
+        self.assertEqual(cache.invalidate("other"), 1)
+        self.assertEqual(cache.invalidate(), 0)
+
+    def test_disk_tier_survives_restart(self):
+        """Test that a new cache on the same database serves stored results."""
+        db_path = os.path.join(self.test_dir, "results.sqlite")
+        with ResultCache(db_path=db_path) as cache:
+            cache.put("key", {"status": "success"}, input_path=self.test_dir)
+        with ResultCache(db_path=db_path) as cache:
+            self.assertEqual(cache.get("key"), {"status": "success"})
+            self.assertEqual(cache.get("key"), {"status": "success"})
+            stats = cache.stats()
+            self.assertEqual((stats["hits"], stats["disk_hits"]), (2, 1))
+            self.assertEqual(cache.invalidate_path(self.test_dir), 2)
+        with ResultCache(db_path=db_path) as cache:
+            self.assertIsNone(cache.get("key"))
+
+    def test_disk_tier_is_bounded(self):
+        """Test that stores drop expired rows and the oldest rows over the limit."""
+        db_path = os.path.join(self.test_dir, "results.sqlite")
+        with ResultCache(max_entries=1, db_path=db_path, max_disk_entries=3) as cache:
+            cache.put("expiring", {"n": 0}, ttl=0.01)
+            time.sleep(0.02)
+            for n in range(1, 5):
+                cache.put(f"key{n}", {"n": n})
+            cache.put("key4", {"n": 4})
+            stats = cache.stats()
+            self.assertEqual((stats["disk_entries"], stats["expirations"],
+                              stats["disk_evictions"]), (3, 1, 1))
+        with ResultCache(db_path=db_path) as cache:
+            self.assertIsNone(cache.get("key1"))
+            self.assertEqual(cache.get("key2"), {"n": 2})
+            self.assertEqual(cache.stats()["disk_entries"], 3)
+
+    def test_delegator_memoizes_listed_actions(self):
+        """Test that the delegator answers repeated cacheable tasks from cache."""
+        source = os.path.join(self.test_dir, "main.py")
+        with open(source, 'w') as f:
+            f.write("print(1)\n")
+
+        async def run():
+            cache = ResultCache(actions=["review"])
+            delegator = TaskDelegator(result_cache=cache)
+            agent = CountingAgent("worker")
+            await delegator.register_agent(agent)
+            review = {"action": "review", "input": self.test_dir}
+            first = await delegator.delegate(review)
+            second = await delegator.delegate(dict(review))
+            with open(source, 'a') as f:
+                f.write("print(2)\n")
+            third = await delegator.delegate(review)
+            await delegator.delegate({"action": "test", "input": self.test_dir})
+            await delegator.delegate({"action": "test", "input": self.test_dir})
+            return agent.calls, [first, second, third], cache.stats()
+
+        calls, results, stats = asyncio.run(run())
+        self.assertEqual(calls, 4)
+        self.assertEqual([result["call"] for result in results], [1, 1, 2])
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertNotEqual(cache_key({"a": 1}, self.test_dir), cache_key({"a": 1}, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
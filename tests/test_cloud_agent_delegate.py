@@ -3,17 +3,27 @@
 Unit tests for the Cloud Agent Delegation Framework
 """
 
+import asyncio
+import importlib.util
+import json
 import unittest
 import sys
 import os
 import tempfile
 import shutil
+import tarfile
+import zipfile
 from pathlib import Path
+from unittest import mock
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from cloud_agent_delegate import CloudAgentDelegate, TaskType
+from src.agent import HttpAgent
+from src.cache import ResultCache
+
+HAS_PYTEST = importlib.util.find_spec("pytest") is not None
 
 
 class TestCloudAgentDelegate(unittest.TestCase):
@@ -57,6 +67,55 @@ class TestCloudAgentDelegate(unittest.TestCase):
         self.assertIn('empty', result['message'].lower())
         self.assertIn('recommendation', result)
     
+    def test_unzip_valid_archive(self):
+        """Test unzip of a valid archive reports counts and throughput."""
+        zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr("src/main.py", "print('hi')\n")
+            archive.writestr("README.md", "# Project\n")
+        output_dir = os.path.join(self.test_dir, "extracted")
+        
+        result = self.delegate.delegate_task(
+            TaskType.UNZIP,
+            zip_path,
+            output_dir=output_dir
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertTrue(result['crc_verified'])
+        self.assertEqual(result['extraction']['files_extracted'], 2)
+        self.assertIn('files_per_s', result['extraction']['throughput'])
+        self.assertNotIn('files', result)
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "src", "main.py")))
+    
+    def test_unzip_tar_gz_archive(self):
+        """Test that tarballs are extracted through the same task."""
+        source = os.path.join(self.test_dir, "main.py")
+        with open(source, 'w') as f:
+            f.write("print('hi')\n")
+        tar_path = os.path.join(self.test_dir, "project.bin")
+        with tarfile.open(tar_path, 'w:gz') as archive:
+            archive.add(source, arcname="src/main.py")
+        output_dir = os.path.join(self.test_dir, "extracted")
+        
+        result = self.delegate.delegate_task(
+            TaskType.UNZIP,
+            tar_path,
+            output_dir=output_dir
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['format'], 'gzip')
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "src", "main.py")))
+    
+    def test_unzip_unrecognized_format(self):
+        """Test unzip with a file that is not an archive."""
+        bogus = os.path.join(self.test_dir, "bogus.zip")
+        with open(bogus, 'w') as f:
+            f.write("not an archive")
+        
+        result = self.delegate.delegate_task(TaskType.UNZIP, bogus)
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('invalid', result['message'].lower())
+    
     def test_organize_nonexistent_path(self):
         """Test organize with non-existent path."""
         result = self.delegate.delegate_task(
@@ -126,6 +185,80 @@ class TestCloudAgentDelegate(unittest.TestCase):
         self.assertEqual(categories['tests'], 4)  # 4 test files
         self.assertEqual(categories['source_code'], 1)  # Only main.py
     
+    def test_organize_incremental(self):
+        """Test that incremental organize reports only what changed."""
+        state_db = os.path.join(self.test_dir, "state", "organize.sqlite")
+        tree = os.path.join(self.test_dir, "tree")
+        os.makedirs(os.path.join(tree, "pkg"))
+        for rel in ["main.py", "README.md", os.path.join("pkg", "util.py")]:
+            Path(os.path.join(tree, rel)).touch()
+        
+        first = self.delegate.delegate_task(
+            TaskType.ORGANIZE, tree, incremental=True, state_db=state_db)
+        self.assertEqual(first['status'], 'success')
+        self.assertEqual(first['changes']['counts']['added'], 3)
+        self.assertEqual(first['categories']['source_code'], 2)
+        
+        os.remove(os.path.join(tree, "README.md"))
+        Path(os.path.join(tree, "pkg", "config.yaml")).touch()
+        for directory in [tree, os.path.join(tree, "pkg")]:
+            st = os.stat(directory)
+            os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        
+        second = CloudAgentDelegate().delegate_task(
+            TaskType.ORGANIZE, tree, incremental=True, state_db=state_db)
+        self.assertEqual(second['changes']['added'], [os.path.join(tree, "pkg", "config.yaml")])
+        self.assertEqual(second['changes']['removed'], [os.path.join(tree, "README.md")])
+        self.assertEqual(second['categories']['configs'], 1)
+        self.assertEqual(second['categories']['documentation'], 0)
+        self.assertNotIn('details', second)
+        
+        third = self.delegate.delegate_task(
+            TaskType.ORGANIZE, tree, incremental=True, state_db=state_db)
+        self.assertEqual(third['changes']['counts']['added'], 0)
+        self.assertEqual(sum(third['categories'].values()), 3)
+    
+    def test_organize_and_review_zip_in_place(self):
+        """Test that organize and review read a zip without extracting it."""
+        zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr("src/main.py", "print('hi')\n")
+            archive.writestr("src/main_test.py", "def test(): pass\n")
+            archive.writestr("README.md", "# Project\n")
+        
+        organized = self.delegate.delegate_task(TaskType.ORGANIZE, zip_path)
+        self.assertEqual(organized['status'], 'success')
+        self.assertEqual(organized['categories']['source_code'], 1)
+        self.assertEqual(organized['categories']['tests'], 1)
+        self.assertEqual(organized['categories']['documentation'], 1)
+        
+        reviewed = self.delegate.delegate_task(TaskType.REVIEW, zip_path)
+        self.assertEqual(reviewed['status'], 'success')
+        self.assertEqual(reviewed['review']['files_reviewed'], 2)
+        self.assertEqual(os.listdir(self.test_dir), ["project.zip"])
+    
+    def test_organize_ndjson_stream(self):
+        """Test that streaming organize writes one record per file and keeps only counts."""
+        tree = os.path.join(self.test_dir, "tree")
+        os.makedirs(os.path.join(tree, "pkg"))
+        for rel in ["main.py", "README.md", os.path.join("pkg", "util_test.py")]:
+            Path(os.path.join(tree, rel)).write_text("x")
+        ndjson_path = os.path.join(self.test_dir, "organize.ndjson")
+        
+        result = self.delegate.delegate_task(TaskType.ORGANIZE, tree, ndjson=ndjson_path)
+        self.assertEqual(result['status'], 'success')
+        self.assertNotIn('details', result)
+        self.assertEqual(result['categories']['source_code'], 1)
+        self.assertEqual(result['categories']['tests'], 1)
+        self.assertEqual(result['categories']['configs'], 0)
+        
+        with open(ndjson_path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 3)
+        by_path = {record['path']: record for record in records}
+        self.assertEqual(by_path[os.path.join(tree, "pkg", "util_test.py")]['category'], 'tests')
+        self.assertEqual(by_path[os.path.join(tree, "main.py")]['size'], 1)
+    
     def test_review_nonexistent_path(self):
         """Test review with non-existent path."""
         result = self.delegate.delegate_task(
@@ -161,6 +294,32 @@ class TestCloudAgentDelegate(unittest.TestCase):
         self.assertGreater(result['review']['files_reviewed'], 0)
         self.assertIn('suggestions', result['review'])
     
+    def test_review_result_is_cached(self):
+        """Test that an unchanged input is answered from the result cache."""
+        self.delegate.result_cache = ResultCache(actions=["review", "organize"])
+        py_file = os.path.join(self.test_dir, "app.py")
+        with open(py_file, 'w') as f:
+            f.write("def hello():\n    print('Hello')\n")
+        
+        # Keys are fingerprinted from the shared index, not a second tree walk
+        with mock.patch("src.cache.fingerprint.scan_tree", side_effect=AssertionError):
+            first = self.delegate.delegate_task(TaskType.REVIEW, self.test_dir)
+        second = self.delegate.delegate_task(TaskType.REVIEW, self.test_dir, workers=2)
+        self.assertEqual(second, first)
+        with open(py_file, 'a') as f:
+            f.write("\n\ndef other():\n    pass\n")
+        third = self.delegate.delegate_task(TaskType.REVIEW, self.test_dir)
+        self.assertEqual(third['review']['files_reviewed'], 1)
+        # The in-place edit is seen through the shared index and re-reviewed
+        self.assertEqual(third['review']['issue_count'], first['review']['issue_count'] + 1)
+        stats = self.delegate.result_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores']), (1, 2, 2))
+        
+        # Incremental runs have side effects and are never cached
+        self.delegate.delegate_task(TaskType.ORGANIZE, self.test_dir, incremental=True,
+                                    state_db=os.path.join(self.test_dir, "state.sqlite"))
+        self.assertEqual(self.delegate.result_cache.stats()['misses'], 2)
+    
     def test_test_nonexistent_path(self):
         """Test test execution with non-existent path."""
         result = self.delegate.delegate_task(
@@ -170,6 +329,7 @@ class TestCloudAgentDelegate(unittest.TestCase):
         self.assertEqual(result['status'], 'error')
         self.assertIn('not found', result['message'].lower())
     
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
     def test_test_task(self):
         """Test test execution."""
         result = self.delegate.delegate_task(
@@ -179,6 +339,258 @@ class TestCloudAgentDelegate(unittest.TestCase):
         self.assertEqual(result['status'], 'success')
         self.assertIn('test_results', result)
     
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+    def test_failing_tests_stop_a_chain(self):
+        """Test that failing tests end the test task, and a chain, with an error."""
+        with open(os.path.join(self.test_dir, "test_broken.py"), 'w') as f:
+            f.write("def test_broken():\n    assert False\n")
+        
+        result = self.delegate.run_pipeline([TaskType.TEST, TaskType.REPORT], self.test_dir)
+        self.assertEqual([stage['task'] for stage in result['stages']], ['test'])
+        failed = result['results']['test']
+        self.assertEqual(failed['status'], 'error')
+        self.assertEqual((failed['details']['failed'], failed['details']['errors']), (1, 0))
+    
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+    def test_crashed_shards_are_errors(self):
+        """Test that shards dying before reporting any test make the task fail."""
+        with open(os.path.join(self.test_dir, "test_crash.py"), 'w') as f:
+            f.write("import os\n\n\ndef test_crash():\n    os._exit(3)\n")
+        
+        result = self.delegate.delegate_task(TaskType.TEST, self.test_dir)
+        self.assertEqual(result['status'], 'error')
+        self.assertNotIn('note', result)
+        self.assertEqual(result['details']['errors'], 1)
+    
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+    def test_test_task_below_a_project_root(self):
+        """Test running a suite in a subdirectory of a project with a setup.py."""
+        Path(os.path.join(self.test_dir, "setup.py")).touch()
+        suite = os.path.join(self.test_dir, "extracted", "tests")
+        os.makedirs(suite)
+        with open(os.path.join(suite, "test_x.py"), 'w') as f:
+            f.write("def test_x():\n    pass\n")
+        
+        result = self.delegate.delegate_task(TaskType.TEST,
+                                             os.path.join(self.test_dir, "extracted"))
+        self.assertEqual(result['status'], 'success', result['message'])
+        self.assertEqual(result['test_results']['passed'], 1)
+    
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+    def test_workflow_task(self):
+        """Test running a task file's workflow through the delegate."""
+        zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr("pkg/main.py", "print('hi')\n")
+        extracted = os.path.join(self.test_dir, "extracted")
+        review_json = os.path.join(self.test_dir, "out", "review.json")
+        task_file = os.path.join(self.test_dir, "task.json")
+        with open(task_file, 'w') as f:
+            json.dump({"task_id": "wf", "workflow": [
+                {"step": 1, "action": "unzip", "input": zip_path, "output": extracted,
+                 "agent": "file_processor"},
+                {"step": 2, "action": "review", "input": extracted, "output": review_json,
+                 "agent": "code_reviewer"},
+            ]}, f)
+        
+        result = self.delegate.delegate_task(TaskType.WORKFLOW, task_file)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual([step['depends_on'] for step in result['workflow']['steps']], [[], [1]])
+        self.assertEqual(result['workflow']['critical_path'], [1, 2])
+        with open(review_json) as f:
+            self.assertEqual(json.load(f)['review']['files_reviewed'], 1)
+    
+    @unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+    def test_example_workflow_runs_end_to_end(self):
+        """Test that every step of the shipped example workflow succeeds."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        shutil.copy(os.path.join(root, "tasks", "example_task.json"), self.test_dir)
+        with zipfile.ZipFile(os.path.join(self.test_dir, "YmeraRefactor.zip"), 'w') as archive:
+            archive.writestr("app.py", "def add(a, b):\n    return a + b\n")
+            archive.writestr("tests/test_app.py",
+                             "from app import add\n\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.test_dir)
+        delegate = CloudAgentDelegate(os.path.join(root, "config", "agent_config.yaml"))
+        self.addCleanup(delegate.close)
+        
+        result = delegate.delegate_task(TaskType.WORKFLOW, "example_task.json")
+        self.assertEqual(result['status'], 'success', result['message'])
+        steps = result['workflow']['steps']
+        self.assertEqual([step['status'] for step in steps], ['success'] * 5)
+        for output in ("organize.json", "review.json", "test_results.json", "final_report.json"):
+            self.assertTrue(os.path.exists(os.path.join("reports", output)))
+    
+    def test_workflow_on_process_agents(self):
+        """Test running workflow steps on local process pools."""
+        self.delegate.config.set('routing', {'local_agent': 'process'})
+        self.delegate.config.set('agents', {'local': {'memory': 256}})
+        tree = os.path.join(self.test_dir, "src")
+        os.makedirs(tree)
+        with open(os.path.join(tree, "app.py"), 'w') as f:
+            f.write("print('hi')\n")
+        review_json = os.path.join(self.test_dir, "review.json")
+        task_file = os.path.join(self.test_dir, "task.json")
+        with open(task_file, 'w') as f:
+            json.dump({"task_id": "wf", "workflow": [
+                {"step": 1, "action": "review", "input": tree, "output": review_json},
+            ]}, f)
+        
+        result = self.delegate.delegate_task(TaskType.WORKFLOW, task_file)
+        self.assertEqual(result['status'], 'success')
+        with open(review_json) as f:
+            self.assertEqual(json.load(f)['review']['files_reviewed'], 1)
+    
+    def test_delegate_task_async(self):
+        """Test that async tasks run concurrently on the pool and match sync results."""
+        delegate = CloudAgentDelegate(task_workers=4)
+        delegate.result_cache = None
+        trees = []
+        for n in range(4):
+            tree = os.path.join(self.test_dir, f"tree{n}")
+            os.makedirs(tree)
+            for name in ("app.py", "README.md"):
+                Path(os.path.join(tree, name)).touch()
+            trees.append(tree)
+        
+        async def run():
+            ticks = 0
+            
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            
+            ticker = asyncio.ensure_future(tick())
+            results = await asyncio.gather(
+                *(delegate.delegate_task_async(TaskType.ORGANIZE, tree) for tree in trees),
+                delegate.delegate_task_async(TaskType.REVIEW, trees[0]),
+                delegate.delegate_task_async(TaskType.WORKFLOW, "missing.json"))
+            ticker.cancel()
+            return results, ticks
+        
+        try:
+            results, ticks = asyncio.run(run())
+        finally:
+            delegate.close()
+        self.assertGreater(ticks, 0)
+        for tree, result in zip(trees, results):
+            self.assertEqual(result['categories'],
+                             self.delegate.delegate_task(TaskType.ORGANIZE, tree)['categories'])
+        self.assertEqual(results[4]['review']['files_reviewed'], 1)
+        self.assertIn('not found', results[5]['message'])
+    
+    def test_delegate_task_async_on_processes(self):
+        """Test running async tasks on a process pool."""
+        zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr("src/main.py", "print('hi')\n")
+        delegate = CloudAgentDelegate(task_executor='process', task_workers=2)
+        try:
+            result = asyncio.run(delegate.delegate_task_async(
+                TaskType.UNZIP, zip_path, output_dir=os.path.join(self.test_dir, "out")))
+        finally:
+            delegate.close()
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['extraction']['files_extracted'], 1)
+        with self.assertRaises(ValueError):
+            CloudAgentDelegate(task_executor='fiber')
+    
+    def test_pipeline_shares_extracted_index(self):
+        """Test a task chain on one extracted tree with per-stage timings."""
+        zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr("pkg/main.py", "print('hi')\n")
+            archive.writestr("README.md", "# Project\n")
+        extracted = os.path.join(self.test_dir, "extracted")
+        self.delegate.result_cache = None
+        
+        chain = [TaskType.UNZIP, TaskType.ORGANIZE, TaskType.REVIEW, TaskType.REPORT]
+        result = self.delegate.run_pipeline(chain, zip_path, output_dir=extracted)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual([stage['task'] for stage in result['stages']],
+                         ['unzip', 'organize', 'review', 'report'])
+        self.assertEqual(sum(result['results']['organize']['categories'].values()), 2)
+        self.assertEqual(result['results']['review']['review']['files_reviewed'], 1)
+        report = result['results']['report']['report_data']
+        self.assertEqual([stage['task'] for stage in report['stages']],
+                         ['unzip', 'organize', 'review'])
+        self.assertGreaterEqual(result['total_seconds'], report['total_seconds'])
+        self.assertEqual([key[1] for key in self.delegate.file_index._indexes], [extracted])
+        os.remove(result['results']['report']['report_path'])
+        
+        # The chain stops at the first stage that fails
+        missing = os.path.join(self.test_dir, "missing.zip")
+        result = self.delegate.run_pipeline(chain, missing)
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual([stage['task'] for stage in result['stages']], ['unzip'])
+    
+    def test_serve_runs_submitted_tasks(self):
+        """Test that a serving delegate runs tasks submitted over HTTP."""
+        for name in ("app.py", "README.md"):
+            Path(os.path.join(self.test_dir, name)).touch()
+        
+        async def run():
+            started = asyncio.get_running_loop().create_future()
+            serving = asyncio.ensure_future(self.delegate.serve(port=0,
+                                                                on_start=started.set_result))
+            server = await started
+            client = HttpAgent("client", f"http://127.0.0.1:{server.port}",
+                               wait_for_result=True)
+            try:
+                return await asyncio.gather(
+                    client.execute({"action": "organize", "input": self.test_dir}),
+                    client.execute({"action": "review", "input": self.test_dir}))
+            finally:
+                client.close()
+                serving.cancel()
+                await serving
+        
+        organized, reviewed = asyncio.run(run())
+        self.assertEqual(sum(organized['categories'].values()), 2)
+        self.assertEqual(reviewed['review']['files_reviewed'], 1)
+    
+    def test_scheduler_reads_json_retry_attempts(self):
+        """Test that retryAttempts of the JSON agent settings applies without max_attempts."""
+        self.delegate.config.set('retry_policy', {'initial_delay_seconds': 1})
+        
+        async def run():
+            scheduler = await self.delegate._start_scheduler()
+            await self.delegate._stop_scheduler(scheduler)
+            return scheduler.delegator.retry_policy
+        
+        with mock.patch('cloud_agent_delegate.load_cloud_config',
+                        return_value={'settings': {'retryAttempts': 2}}):
+            policy = asyncio.run(run())
+        self.assertEqual((policy.max_attempts, policy.initial_delay), (3, 1.0))
+    
+    def test_scheduler_reads_json_timeout(self):
+        """Test that the JSON agent settings give the default timeout unless overridden."""
+        async def run():
+            scheduler = await self.delegate._start_scheduler()
+            await self.delegate._stop_scheduler(scheduler)
+            return scheduler.delegator.default_timeout
+        
+        with mock.patch('cloud_agent_delegate.load_cloud_config',
+                        return_value={'settings': {'timeout': 120}}):
+            self.assertEqual(asyncio.run(run()), 120)
+            self.delegate.config.set('routing', {'default_timeout': 30})
+            self.assertEqual(asyncio.run(run()), 30)
+    
+    def test_scheduler_reads_json_priority(self):
+        """Test that the JSON agent settings give the default priority unless overridden."""
+        async def run():
+            scheduler = await self.delegate._start_scheduler()
+            await self.delegate._stop_scheduler(scheduler)
+            return scheduler.default_priority
+        
+        with mock.patch('cloud_agent_delegate.load_cloud_config',
+                        return_value={'settings': {'priority': 'low'}}):
+            self.assertEqual(asyncio.run(run()), 'low')
+            self.delegate.config.set('scheduling', {'default_priority': 'high'})
+            self.assertEqual(asyncio.run(run()), 'high')
+    
     def test_report_generation(self):
         """Test report generation."""
         result = self.delegate.delegate_task(
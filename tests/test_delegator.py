@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the task delegator and agent routing
+"""
+
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import CloudAgent, LocalAgent
+from src.delegator import (AgentRegistry, AgentRouter, CircuitBreaker, HealthMonitor, HedgePolicy,
+                           QueueFullError, RetryPolicy, TaskDelegator, TaskScheduler,
+                           TaskTimeoutError)
+
+
+class FakeAgent(CloudAgent):
+    """Agent that records tasks and sleeps for a configured delay."""
+
+    def __init__(self, agent_id, capabilities=None, delay=0.0):
+        config = {"capabilities": capabilities} if capabilities else {}
+        super().__init__(agent_id, config)
+        self.delay = delay
+        self.tasks = []
+
+    async def execute(self, task):
+        self.tasks.append(task)
+        await asyncio.sleep(self.delay)
+        return {"status": "success", "agent_id": self.agent_id}
+
+    def health_check(self):
+        return True
+
+
+class TestAgentRegistry(unittest.TestCase):
+    """Test cases for AgentRegistry."""
+
+    def test_lookup_and_snapshot(self):
+        """Test O(1) membership and that snapshots are immutable copies."""
+        registry = AgentRegistry()
+        agents = [FakeAgent(f"a{i}") for i in range(3)]
+        for agent in agents:
+            registry.add(agent)
+        snapshot = registry.snapshot()
+        self.assertIs(registry.snapshot(), snapshot)
+
+        self.assertIs(registry.remove("a1"), agents[1])
+        self.assertIsNone(registry.remove("a1"))
+        self.assertEqual([a.agent_id for a in snapshot], ["a0", "a1", "a2"])
+        self.assertEqual([a.agent_id for a in registry], ["a0", "a2"])
+        self.assertNotIn("a1", registry)
+        self.assertIs(registry.get("a2"), agents[2])
+
+        replacement = FakeAgent("a0")
+        self.assertIs(registry.add(replacement), agents[0])
+        self.assertEqual(len(registry), 2)
+
+
+class TestAgentRouter(unittest.TestCase):
+    """Test cases for AgentRouter."""
+
+    def test_routes_by_capability(self):
+        """Test that only agents declaring a capability (or none) are chosen."""
+        router = AgentRouter()
+        router.add(FakeAgent("files", ["unzip", "organize"]))
+        router.add(FakeAgent("reviewer", ["review"]))
+        self.assertEqual({router.select("review").agent_id for _ in range(4)}, {"reviewer"})
+        self.assertEqual({router.select("unzip").agent_id for _ in range(4)}, {"files"})
+        self.assertIsNone(router.select("deploy"))
+
+        router.add(FakeAgent("generic"))
+        self.assertEqual({router.select("review").agent_id for _ in range(4)},
+                         {"reviewer", "generic"})
+        self.assertEqual(router.select("deploy").agent_id, "generic")
+
+        router.remove("generic")
+        self.assertIsNone(router.select("deploy"))
+
+    def test_least_inflight(self):
+        """Test that the least loaded matching agent is chosen."""
+        router = AgentRouter("least_inflight")
+        for i in range(3):
+            router.add(FakeAgent(f"a{i}", ["review"]))
+        chosen = []
+        for _ in range(6):
+            agent = router.select("review")
+            router.begin(agent)
+            chosen.append(agent.agent_id)
+        self.assertEqual(sorted(chosen), ["a0", "a0", "a1", "a1", "a2", "a2"])
+
+        router.finish(router.get("a1"), 0.1)
+        self.assertEqual(router.select("review").agent_id, "a1")
+        router.remove("a1")
+        self.assertIn(router.select("review").agent_id, {"a0", "a2"})
+
+    def test_ewma_prefers_fast_agents(self):
+        """Test that two-choice EWMA routing avoids the slow agent."""
+        router = AgentRouter("ewma", seed=1)
+        router.add(FakeAgent("fast"))
+        router.add(FakeAgent("slow"))
+        router.finish(router.get("fast"), 0.01)
+        router.finish(router.get("slow"), 1.0)
+        self.assertEqual({router.select("x").agent_id for _ in range(10)}, {"fast"})
+        self.assertAlmostEqual(router.stats("slow")["latency_ewma"], 1.0)
+
+    def test_many_agents(self):
+        """Test least-inflight bookkeeping with thousands of agents."""
+        router = AgentRouter("least_inflight")
+        for i in range(5000):
+            router.add(FakeAgent(f"a{i}", ["review"] if i % 2 else ["test"]))
+        picked = set()
+        for _ in range(2500):
+            agent = router.select("review")
+            router.begin(agent)
+            picked.add(agent.agent_id)
+        self.assertEqual(len(picked), 2500)
+        self.assertEqual(router.stats(router.select("review").agent_id)["inflight"], 1)
+
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected."""
+        with self.assertRaises(ValueError):
+            AgentRouter("random")
+
+
+class TestTaskDelegator(unittest.TestCase):
+    """Test cases for TaskDelegator routing."""
+
+    def test_delegate_routes_by_action_and_load(self):
+        """Test that concurrent tasks spread across capable agents."""
+        async def run():
+            delegator = TaskDelegator(strategy="least_inflight")
+            agents = [FakeAgent("r1", ["review"], 0.05), FakeAgent("r2", ["review"], 0.05),
+                      FakeAgent("t1", ["test"])]
+            for agent in agents:
+                await delegator.register_agent(agent)
+            await asyncio.gather(*(delegator.delegate({"action": "review"}) for _ in range(4)))
+            with self.assertRaises(ValueError):
+                await delegator.delegate({"action": "deploy"})
+            result = await delegator.delegate({"action": "anything"}, agent_id="t1")
+            return agents, result
+
+        agents, result = asyncio.run(run())
+        self.assertEqual([len(agent.tasks) for agent in agents], [2, 2, 1])
+        self.assertEqual(result["agent_id"], "t1")
+
+    def test_delegate_many_limits_concurrency(self):
+        """Test that bulk delegation respects global and per-agent limits."""
+        class CountingAgent(FakeAgent):
+            running = 0
+            peak = 0
+            
+            async def execute(self, task):
+                CountingAgent.running += 1
+                self.active = getattr(self, 'active', 0) + 1
+                self.peak_active = max(getattr(self, 'peak_active', 0), self.active)
+                CountingAgent.peak = max(CountingAgent.peak, CountingAgent.running)
+                await asyncio.sleep(0.001)
+                CountingAgent.running -= 1
+                self.active -= 1
+                return {"status": "success", "n": task["n"]}
+
+        async def run():
+            delegator = TaskDelegator()
+            agents = [CountingAgent(f"a{i}", ["work"]) for i in range(4)]
+            for agent in agents:
+                await delegator.register_agent(agent)
+            tasks = ({"action": "work", "n": n} for n in range(500))
+            results = [item async for item in delegator.delegate_many(
+                tasks, max_concurrency=10, per_agent_limit=2)]
+            return agents, results
+
+        agents, results = asyncio.run(run())
+        self.assertEqual(sorted(index for index, _ in results), list(range(500)))
+        self.assertTrue(all(result["n"] == index for index, result in results))
+        self.assertLessEqual(CountingAgent.peak, 8)
+        self.assertTrue(all(agent.peak_active <= 2 for agent in agents))
+
+    def test_delegate_many_ordered_async_source(self):
+        """Test input-order streaming from an async iterator with failures inline."""
+        async def source():
+            for n in range(50):
+                yield {"action": "deploy" if n == 7 else "work", "n": n}
+
+        async def run():
+            delegator = TaskDelegator(strategy="least_inflight")
+            await delegator.register_agent(FakeAgent("slowish", ["work"], 0.01))
+            await delegator.register_agent(FakeAgent("fast", ["work"]))
+            return [item async for item in delegator.delegate_many(
+                source(), max_concurrency=8, ordered=True)]
+
+        results = asyncio.run(run())
+        self.assertEqual([index for index, _ in results], list(range(50)))
+        self.assertEqual(results[7][1]["status"], "error")
+        self.assertEqual(sum(1 for _, r in results if r["status"] == "success"), 49)
+
+    def test_churn_during_dispatch(self):
+        """Test that agents can leave and be replaced while their tasks run."""
+        async def run():
+            delegator = TaskDelegator(strategy="least_inflight")
+            original = FakeAgent("worker", delay=0.05)
+            await delegator.register_agent(original)
+            running = asyncio.create_task(delegator.delegate({"action": "x"}))
+            await asyncio.sleep(0.01)
+            self.assertTrue(await delegator.unregister_agent("worker"))
+            replacement = FakeAgent("worker")
+            await delegator.register_agent(replacement)
+            first = await running
+            await delegator.delegate({"action": "x"})
+            listed = await delegator.list_agents()
+            return first, replacement, delegator, listed
+
+        first, replacement, delegator, listed = asyncio.run(run())
+        self.assertEqual(first["agent_id"], "worker")
+        self.assertEqual(len(replacement.tasks), 1)
+        # The old agent's completion must not touch the replacement's count.
+        self.assertEqual(delegator.router.stats("worker")["inflight"], 0)
+        self.assertEqual([agent["agent_id"] for agent in listed], ["worker"])
+
+
+
+class FlakyAgent(FakeAgent):
+    """Agent that raises on its first ``failures`` tasks."""
+
+    def __init__(self, agent_id, failures):
+        super().__init__(agent_id)
+        self.failures = failures
+
+    async def execute(self, task):
+        self.tasks.append(task)
+        if len(self.tasks) <= self.failures:
+            raise ConnectionError("agent unavailable")
+        return {"status": "success", "agent_id": self.agent_id}
+
+
+class TestRetryAndHedging(unittest.TestCase):
+    """Test cases for retry and hedging policies."""
+
+    def test_retry_policy_backoff(self):
+        """Test jittered backoff bounds and config parsing."""
+        policy = RetryPolicy(max_attempts=4, initial_delay=1.0, backoff_multiplier=2.0,
+                             max_delay=3.0, seed=7)
+        for attempt, ceiling in ((1, 1.0), (2, 2.0), (3, 3.0), (10, 3.0)):
+            delays = [policy.backoff(attempt) for _ in range(50)]
+            self.assertTrue(all(0.0 <= delay <= ceiling for delay in delays))
+            self.assertGreater(max(delays), ceiling / 2)
+
+        policy = RetryPolicy.from_config({"max_attempts": 3, "backoff_multiplier": 2,
+                                          "initial_delay_seconds": 5})
+        self.assertEqual((policy.max_attempts, policy.initial_delay), (3, 5.0))
+        self.assertEqual(RetryPolicy.from_config({"retryAttempts": 3}).max_attempts, 4)
+        settings = {"retryAttempts": 2}
+        self.assertEqual(RetryPolicy.from_config({}, settings).max_attempts, 3)
+        self.assertEqual(RetryPolicy.from_config({"max_attempts": 1}, settings).max_attempts, 1)
+        self.assertEqual(RetryPolicy.from_config(None).max_attempts, 1)
+        self.assertIsNone(HedgePolicy.from_config({"enabled": False}))
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_retries_failed_attempts(self):
+        """Test that raised errors are retried until the attempts run out."""
+        async def run(max_attempts):
+            delegator = TaskDelegator(retry_policy=RetryPolicy(max_attempts=max_attempts))
+            agent = FlakyAgent("flaky", failures=2)
+            await delegator.register_agent(agent)
+            return await delegator.delegate({"action": "x"}), agent, delegator
+
+        result, agent, delegator = asyncio.run(run(3))
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(len(agent.tasks), 3)
+        self.assertEqual(delegator.router.stats("flaky")["inflight"], 0)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(run(2))
+
+    def test_hedge_policy_delay(self):
+        """Test that hedging waits for samples and uses the percentile."""
+        policy = HedgePolicy(percentile=90, min_samples=10)
+        for latency in range(1, 10):
+            policy.record("review", latency / 100)
+        self.assertIsNone(policy.delay("review"))
+        policy.record("review", 1.0)
+        self.assertEqual(policy.delay("review"), 1.0)
+        self.assertIsNone(policy.delay("test"))
+
+    def test_hedges_slow_task(self):
+        """Test that a straggler is hedged onto another agent and cancelled."""
+        async def run():
+            hedge = HedgePolicy(percentile=50, min_samples=5)
+            for _ in range(5):
+                hedge.record("review", 0.01)
+            delegator = TaskDelegator(hedge_policy=hedge)
+            slow = FakeAgent("slow", delay=5.0)
+            fast = FakeAgent("fast")
+            await delegator.register_agent(slow)
+            await delegator.register_agent(fast)
+            start = asyncio.get_running_loop().time()
+            result = await delegator.delegate({"action": "review"})
+            return result, asyncio.get_running_loop().time() - start, delegator
+
+        result, elapsed, delegator = asyncio.run(run())
+        self.assertEqual(result["agent_id"], "fast")
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(delegator.hedge_policy.stats(), {"sent": 1, "won": 1})
+        self.assertEqual(delegator.router.stats("slow")["inflight"], 0)
+        self.assertIsNone(delegator.router.stats("slow")["latency_ewma"])
+
+    def test_uncancellable_agents_are_not_hedged(self):
+        """Test that no copy runs next to, or on, an agent that cannot be cancelled."""
+        async def run(primary_cancellable, backup_cancellable):
+            hedge = HedgePolicy(percentile=50, min_samples=5)
+            for _ in range(5):
+                hedge.record("review", 0.01)
+            delegator = TaskDelegator(hedge_policy=hedge)
+            slow = FakeAgent("slow", delay=0.2)
+            backup = FakeAgent("backup")
+            slow.cancellable = primary_cancellable
+            backup.cancellable = backup_cancellable
+            await delegator.register_agent(slow)
+            await delegator.register_agent(backup)
+            result = await delegator.delegate({"action": "review"})
+            return result, backup.tasks, delegator.hedge_policy.stats()
+
+        for cancellable in ((False, True), (True, False)):
+            with self.subTest(cancellable=cancellable):
+                result, backup_tasks, stats = asyncio.run(run(*cancellable))
+                self.assertEqual(result["agent_id"], "slow")
+                self.assertEqual(backup_tasks, [])
+                self.assertEqual(stats, {"sent": 0, "won": 0})
+
+
+
+class TestTimeouts(unittest.TestCase):
+    """Test cases for deadlines and delegation metrics."""
+
+    def test_hung_agent_times_out(self):
+        """Test that a hung call is cancelled and reported as a timeout."""
+        class HungAgent(FakeAgent):
+            cancelled = False
+
+            async def execute(self, task):
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    HungAgent.cancelled = True
+                    raise
+
+        async def run():
+            delegator = TaskDelegator()
+            await delegator.register_agent(HungAgent("hung", ["work"]))
+            await delegator.register_agent(FakeAgent("quick", ["other"]))
+            return await delegator.delegate({"action": "work", "timeout": 0.05}), delegator
+
+        result, delegator = asyncio.run(run())
+        self.assertEqual(result["status"], "timeout")
+        self.assertEqual((result["agent_id"], result["timeout"]), ("hung", 0.05))
+        self.assertGreaterEqual(result["elapsed"], 0.05)
+        self.assertTrue(HungAgent.cancelled)
+        metrics = delegator.metrics.agent("hung")
+        self.assertEqual(metrics["timeout"]["count"], 1)
+        self.assertGreaterEqual(metrics["timeout"]["seconds"], 0.05)
+        self.assertEqual(delegator.router.stats("hung")["inflight"], 0)
+
+    def test_deadline_precedence_and_retry(self):
+        """Test agent and default deadlines and that timeouts are retried."""
+        class SlowOnceAgent(FakeAgent):
+            async def execute(self, task):
+                self.tasks.append(task)
+                await asyncio.sleep(1.0 if len(self.tasks) == 1 else 0)
+                return {"status": "success"}
+
+        async def run():
+            delegator = TaskDelegator(retry_policy=RetryPolicy(max_attempts=2),
+                                      default_timeout=0.01)
+            slow = SlowOnceAgent("slow")
+            slow.config["timeout"] = 0.05
+            await delegator.register_agent(slow)
+            result = await delegator.delegate({"action": "x"})
+            return result, delegator
+
+        result, delegator = asyncio.run(run())
+        self.assertEqual(result["status"], "success")
+        totals = delegator.metrics.snapshot()["totals"]
+        self.assertEqual(totals["timeout"]["count"], 1)
+        self.assertEqual(totals["completed"]["count"], 1)
+        self.assertGreaterEqual(totals["timeout"]["seconds"], 0.05)
+        self.assertTrue(issubclass(TaskTimeoutError, asyncio.TimeoutError))
+
+    def test_timeouts_on_uncancellable_agents_are_not_retried(self):
+        """Test that a timed-out handler thread is not run again next to itself."""
+        calls = []
+
+        def slow_handler(task):
+            calls.append(task)
+            time.sleep(0.2)
+            return {"status": "success"}
+
+        async def run():
+            delegator = TaskDelegator(retry_policy=RetryPolicy(max_attempts=3))
+            await delegator.register_agent(LocalAgent("local", slow_handler, {"timeout": 0.05}))
+            return await delegator.delegate({"action": "unzip"})
+
+        result = asyncio.run(run())
+        self.assertEqual(result["status"], "timeout")
+        self.assertEqual(len(calls), 1)
+
+
+
+class TestHealthMonitoring(unittest.TestCase):
+    """Test cases for circuit breakers and health probes."""
+
+    def test_circuit_breaker_states(self):
+        """Test closed -> open -> half-open -> closed/open transitions."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        self.assertFalse(breaker.record_failure(0))
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure(1))
+        self.assertTrue(breaker.record_failure(2))
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.half_open(5))
+        self.assertTrue(breaker.half_open(12))
+        self.assertTrue(breaker.record_failure(13))
+        self.assertEqual(breaker.state, "open")
+        self.assertTrue(breaker.half_open(23))
+        self.assertTrue(breaker.record_success())
+        self.assertEqual(breaker.state, "closed")
+
+    def test_router_suspend_and_resume(self):
+        """Test that suspended agents keep their state but are not selected."""
+        router = AgentRouter()
+        router.add(FakeAgent("generic"))
+        router.add(FakeAgent("reviewer", ["review"]))
+        self.assertTrue(router.suspend("generic"))
+        self.assertFalse(router.suspend("generic"))
+        router.add(FakeAgent("tester", ["test"]))
+        self.assertEqual({router.select("review").agent_id for _ in range(4)}, {"reviewer"})
+        self.assertIsNone(router.select("deploy"))
+        self.assertTrue(router.stats("generic")["suspended"])
+
+        self.assertTrue(router.resume("generic"))
+        self.assertEqual({router.select("test").agent_id for _ in range(4)},
+                         {"tester", "generic"})
+        self.assertEqual(router.select("deploy").agent_id, "generic")
+        router.suspend("reviewer")
+        self.assertTrue(router.remove("reviewer"))
+        self.assertEqual(router.select("review").agent_id, "generic")
+
+    def test_breaker_skips_failing_agent(self):
+        """Test that a failing agent is skipped until its breaker half-opens."""
+        async def run():
+            monitor = HealthMonitor(failure_threshold=2, reset_timeout=0.05)
+            delegator = TaskDelegator(health_monitor=monitor)
+            broken = FlakyAgent("broken", failures=2)
+            healthy = FakeAgent("healthy")
+            await delegator.register_agent(broken)
+            await delegator.register_agent(healthy)
+            for _ in range(4):
+                try:
+                    await delegator.delegate({"action": "x"})
+                except ConnectionError:
+                    pass
+            state_open = monitor.state("broken")["circuit"]
+            routed = [(await delegator.delegate({"action": "x"}))["agent_id"] for _ in range(4)]
+            await asyncio.sleep(0.1)
+            half_open = monitor.state("broken")["circuit"]
+            after = [(await delegator.delegate({"action": "x"}))["agent_id"] for _ in range(4)]
+            await monitor.stop()
+            return state_open, routed, half_open, after, monitor.state("broken")["circuit"]
+
+        state_open, routed, half_open, after, final = asyncio.run(run())
+        self.assertEqual(state_open, "open")
+        self.assertEqual(set(routed), {"healthy"})
+        self.assertEqual(half_open, "half_open")
+        self.assertIn("broken", after)
+        self.assertEqual(final, "closed")
+
+    def test_late_success_resumes_open_agent(self):
+        """Test that a task finishing while the breaker is open closes it and resumes the agent."""
+        async def run():
+            monitor = HealthMonitor(failure_threshold=2, reset_timeout=60)
+            delegator = TaskDelegator(health_monitor=monitor)
+            await delegator.register_agent(FakeAgent("only"))
+            monitor.record("only", "failed")
+            monitor.record("only", "failed")
+            suspended = delegator.router.stats("only")["suspended"]
+            # A task dispatched before the breaker opened succeeds afterwards
+            monitor.record("only", "completed")
+            result = await delegator.delegate({"action": "x"})
+            return suspended, monitor, delegator, result
+
+        suspended, monitor, delegator, result = asyncio.run(run())
+        self.assertTrue(suspended)
+        self.assertEqual(monitor.state("only")["circuit"], "closed")
+        self.assertFalse(delegator.router.stats("only")["suspended"])
+        self.assertEqual(result["agent_id"], "only")
+
+    def test_probe_loop_suspends_unhealthy_agents(self):
+        """Test that cached probe results decide which agents are routed to."""
+        class ToggleAgent(FakeAgent):
+            healthy = True
+
+            def health_check(self):
+                return self.healthy
+
+        async def run():
+            monitor = HealthMonitor(interval=0.01)
+            delegator = TaskDelegator(health_monitor=monitor)
+            flaky = ToggleAgent("flaky")
+            await delegator.register_agent(flaky)
+            await delegator.register_agent(FakeAgent("steady"))
+            monitor.start()
+            flaky.healthy = False
+            await asyncio.sleep(0.05)
+            down = [(await delegator.delegate({"action": "x"}))["agent_id"] for _ in range(4)]
+            flaky.healthy = True
+            await asyncio.sleep(0.05)
+            up = [(await delegator.delegate({"action": "x"}))["agent_id"] for _ in range(4)]
+            await monitor.stop()
+            return down, up, monitor.state("flaky")
+
+        down, up, state = asyncio.run(run())
+        self.assertEqual(set(down), {"steady"})
+        self.assertEqual(set(up), {"flaky", "steady"})
+        self.assertTrue(state["healthy"])
+        self.assertIsNotNone(state["last_probe"])
+
+
+
+class TestTaskScheduler(unittest.TestCase):
+    """Test cases for priority scheduling."""
+
+    def test_weighted_fair_dispatch(self):
+        """Test that high priority gets most slots without starving low."""
+        async def run():
+            delegator = TaskDelegator()
+            agent = FakeAgent("worker")
+            await delegator.register_agent(agent)
+            scheduler = TaskScheduler(delegator, concurrency=1)
+            futures = [await scheduler.submit({"n": n}, "low") for n in range(10)]
+            futures += [await scheduler.submit({"n": n, "priority": "high"}) for n in range(10, 20)]
+            await asyncio.gather(*futures)
+            await scheduler.stop()
+            return [task["n"] for task in agent.tasks], scheduler.stats()
+
+        order, stats = asyncio.run(run())
+        self.assertEqual(sum(1 for n in order[:9] if n >= 10), 8)
+        self.assertLess(order.index(0), 9)
+        self.assertEqual(stats["priorities"]["high"]["dispatched"], 10)
+        self.assertEqual(stats["queued"], 0)
+        with self.assertRaises(ValueError):
+            asyncio.run(TaskScheduler(TaskDelegator()).submit({}, "urgent"))
+
+    def test_stop_cancels_running_tasks(self):
+        """Test that stopping mid-task cancels the submitter's future."""
+        async def run():
+            delegator = TaskDelegator()
+            await delegator.register_agent(FakeAgent("worker", delay=5.0))
+            scheduler = TaskScheduler(delegator, concurrency=1)
+            running = await scheduler.submit({"n": 1})
+            queued = await scheduler.submit({"n": 2})
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+            return running, queued
+
+        running, queued = asyncio.run(asyncio.wait_for(run(), 2))
+        self.assertTrue(running.cancelled())
+        self.assertTrue(queued.cancelled())
+
+    def test_backpressure(self):
+        """Test rejection without waiting and admission once room frees up."""
+        async def run():
+            delegator = TaskDelegator()
+            await delegator.register_agent(FakeAgent("worker", delay=0.02))
+            scheduler = TaskScheduler(delegator, max_queue=2, concurrency=1)
+            first = await scheduler.submit({"n": 1})
+            second = await scheduler.submit({"n": 2})
+            with self.assertRaises(QueueFullError):
+                await scheduler.submit({"n": 3}, wait=False)
+            third = await scheduler.submit({"n": 3})
+            results = await asyncio.gather(first, second, third)
+            await scheduler.stop()
+            return results, scheduler.stats()
+
+        results, stats = asyncio.run(run())
+        self.assertEqual(len(results), 3)
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_aging_promotes_waiting_tasks(self):
+        """Test that a low-priority task moves up after waiting."""
+        async def run():
+            delegator = TaskDelegator()
+            agent = FakeAgent("worker", delay=0.02)
+            await delegator.register_agent(agent)
+            scheduler = TaskScheduler(delegator, concurrency=1, aging=0.01,
+                                      weights={"high": 100})
+            futures = [await scheduler.submit({"n": 0}, "low")]
+            futures += [await scheduler.submit({"n": n}, "high") for n in range(1, 6)]
+            await asyncio.gather(*futures)
+            await scheduler.stop()
+            return [task["n"] for task in agent.tasks], scheduler.stats()
+
+        order, stats = asyncio.run(run())
+        self.assertGreaterEqual(stats["priorities"]["low"]["promoted"], 1)
+        self.assertLess(order.index(0), 5)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
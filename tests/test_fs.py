@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the filesystem access layer
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fs import FileIndex, FileIndexCache, ZipFileSystem, is_zip_archive, scan_tree
+from src.fs import file_index
+
+
+def write_file(path, data="x"):
+    """Create a file and any missing parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(data)
+
+
+def bump_mtime(path):
+    """Advance a directory's mtime so the change is visible on coarse clocks."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestFileIndex(unittest.TestCase):
+    """Test cases for FileIndex and FileIndexCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ("a.py", "pkg/b.py", "pkg/sub/c.md", "docs/d.txt"):
+            write_file(os.path.join(self.test_dir, rel), rel)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.executor.shutdown()
+        shutil.rmtree(self.test_dir)
+
+    def test_build_collects_metadata(self):
+        """Test that the index records every file with its size."""
+        index = FileIndex.build(self.test_dir, self.executor)
+        sizes = {os.path.relpath(e.path, self.test_dir): e.size for e in index.iter_files()}
+
+        self.assertEqual(sizes, {"a.py": 4, os.path.join("pkg", "b.py"): 8,
+                                 os.path.join("pkg", "sub", "c.md"): 12,
+                                 os.path.join("docs", "d.txt"): 10})
+        self.assertEqual(sorted(e.name for e in scan_tree(self.test_dir)),
+                         sorted(e.name for e in index.iter_files()))
+
+    def test_refresh_applies_directory_changes(self):
+        """Test that refresh rescans only directories whose mtime changed."""
+        index = FileIndex.build(self.test_dir, self.executor)
+        pkg = os.path.join(self.test_dir, "pkg")
+        write_file(os.path.join(pkg, "new.py"))
+        shutil.rmtree(os.path.join(self.test_dir, "docs"))
+        write_file(os.path.join(self.test_dir, "fresh", "e.py"))
+        bump_mtime(pkg)
+        bump_mtime(self.test_dir)
+
+        changes = index.refresh(self.executor)
+
+        self.assertEqual(sorted(e.name for e in changes.added), ["e.py", "new.py"])
+        self.assertEqual([e.name for e in changes.removed], ["d.txt"])
+        self.assertEqual(index.file_count(), 5)
+        self.assertFalse(index.refresh(self.executor))
+
+    def test_refresh_detects_in_place_edits(self):
+        """Test that files rewritten in an unchanged directory are re-stated on request."""
+        index = FileIndex.build(self.test_dir, self.executor)
+        pkg = os.path.join(self.test_dir, "pkg")
+        pkg_mtime = os.stat(pkg).st_mtime_ns
+        with open(os.path.join(pkg, "b.py"), 'a') as f:
+            f.write("more = 1\n")
+        os.utime(pkg, ns=(pkg_mtime, pkg_mtime))
+
+        self.assertFalse(index.refresh(self.executor))
+        changes = index.refresh(self.executor, restat=True)
+
+        self.assertEqual([e.name for e in changes.modified], ["b.py"])
+        self.assertFalse(changes.added or changes.removed)
+        entry = next(e for e in index.iter_files() if e.name == "b.py")
+        self.assertEqual(entry.size, os.path.getsize(os.path.join(pkg, "b.py")))
+        self.assertFalse(index.refresh(self.executor, restat=True))
+
+    def test_cache_reuses_index(self):
+        """Test that the cache reuses and re-stats the index of a root."""
+        cache = FileIndexCache(workers=2)
+        try:
+            first = cache.get(self.test_dir)
+            self.assertIs(cache.get(self.test_dir), first)
+            pkg = os.path.join(self.test_dir, "pkg")
+            pkg_mtime = os.stat(pkg).st_mtime_ns
+            with open(os.path.join(pkg, "b.py"), 'a') as f:
+                f.write("more = 1\n")
+            os.utime(pkg, ns=(pkg_mtime, pkg_mtime))
+            entry = next(e for e in cache.get(self.test_dir).iter_files() if e.name == "b.py")
+            self.assertEqual(entry.size, os.path.getsize(os.path.join(pkg, "b.py")))
+            cache.invalidate(self.test_dir)
+            self.assertIsNot(cache.get(self.test_dir), first)
+        finally:
+            cache.close()
+
+    def test_building_one_root_does_not_block_others(self):
+        """Test that a slow build holds only the lock of its own root."""
+        cache = FileIndexCache(workers=2)
+        slow_root = os.path.join(self.test_dir, "pkg")
+        started, release = threading.Event(), threading.Event()
+        build = FileIndex.build.__func__
+
+        def slow_build(cls, root, executor):
+            if root == slow_root:
+                started.set()
+                release.wait(5)
+            return build(cls, root, executor)
+
+        try:
+            with mock.patch.object(file_index.FileIndex, "build", classmethod(slow_build)):
+                slow = threading.Thread(target=cache.get, args=(slow_root,))
+                slow.start()
+                self.assertTrue(started.wait(5))
+                self.assertEqual(cache.get(self.test_dir).file_count(), 4)
+                self.assertIsNotNone(cache.executor)
+                self.assertTrue(slow.is_alive())
+                release.set()
+                slow.join(5)
+            self.assertEqual(cache.get(slow_root).file_count(), 2)
+        finally:
+            release.set()
+            cache.close()
+
+
+class TestZipFileSystem(unittest.TestCase):
+    """Test cases for ZipFileSystem."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.test_dir, "project.zip")
+        with zipfile.ZipFile(self.zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("README.md", "# Project\n")
+            archive.writestr("src/app.py", "print('app')\n")
+            archive.writestr("src/util/helpers.py", "X = 1\n")
+            archive.writestr("docs/", "")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_walk_matches_archive_layout(self):
+        """Test that walk yields the archive's directories and files."""
+        with ZipFileSystem(self.zip_path) as zip_fs:
+            walked = {root: (dirs, files) for root, dirs, files in zip_fs.walk()}
+
+        self.assertEqual(walked[self.zip_path], (['docs', 'src'], ['README.md']))
+        self.assertEqual(walked[os.path.join(self.zip_path, 'src')], (['util'], ['app.py']))
+        self.assertEqual(walked[os.path.join(self.zip_path, 'docs')], ([], []))
+
+    def test_lazy_reads(self):
+        """Test reading member contents through display or member paths."""
+        with ZipFileSystem(self.zip_path) as zip_fs:
+            display_path = os.path.join(self.zip_path, 'src', 'util', 'helpers.py')
+            self.assertEqual(zip_fs.read_bytes(display_path), b"X = 1\n")
+            self.assertEqual(zip_fs.read_bytes('src/app.py'), b"print('app')\n")
+            self.assertEqual(zip_fs.getsize('README.md'), 10)
+            self.assertEqual(zip_fs.file_count(), 3)
+
+    def test_is_zip_archive(self):
+        """Test archive detection for files and directories."""
+        self.assertTrue(is_zip_archive(self.zip_path))
+        self.assertFalse(is_zip_archive(self.test_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the task handler registry
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from importlib import metadata
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cloud_agent_delegate import CloudAgentDelegate
+from src.handlers import HandlerError, HandlerRegistry, load_reference
+from src.handlers import registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def count_handler(delegate, input_path, **kwargs):
+    """Plugin-style handler counting the entries of a directory."""
+    return {"status": "success", "count": len(os.listdir(input_path)), "options": kwargs}
+
+
+class TestHandlerRegistry(unittest.TestCase):
+    """Test cases for HandlerRegistry."""
+
+    def test_references_load_on_first_use(self):
+        """Test that string references are imported when first asked for."""
+        handlers = HandlerRegistry(group=None)
+        handlers.register("count", f"{__name__}:count_handler")
+        handlers.register("broken", "no_such_module_anywhere:handle")
+
+        self.assertIn("count", handlers)
+        self.assertFalse(handlers.is_loaded("count"))
+        self.assertIs(handlers.get("count"), count_handler)
+        self.assertTrue(handlers.is_loaded("count"))
+        self.assertIsNone(handlers.get("missing"))
+        with self.assertRaises(HandlerError):
+            handlers.get("broken")
+        with self.assertRaises(HandlerError):
+            load_reference("no_colon")
+        self.assertIs(load_reference("os.path:join"), os.path.join)
+
+    def test_entry_point_discovery(self):
+        """Test that installed plugins are found only when needed and never shadow."""
+        entry_points = [
+            metadata.EntryPoint("count", f"{__name__}:count_handler", "ymera.handlers"),
+            metadata.EntryPoint("known", "os.path:join", "ymera.handlers"),
+        ]
+        handlers = HandlerRegistry()
+        handlers.register("known", count_handler)
+        with mock.patch.object(registry, "_entry_points",
+                               return_value=entry_points) as listed:
+            self.assertIs(handlers.get("known"), count_handler)
+            listed.assert_not_called()
+            self.assertEqual(handlers.names(), ["count", "known"])
+            self.assertFalse(handlers.is_loaded("count"))
+            self.assertIs(handlers.get("count"), count_handler)
+            self.assertNotIn("other", handlers)
+            listed.assert_called_once_with("ymera.handlers")
+
+
+class TestDelegateHandlers(unittest.TestCase):
+    """Test cases for plugin tasks run by CloudAgentDelegate."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        for name in ("a.py", "b.py"):
+            open(os.path.join(self.test_dir, name), "w").close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_configured_handler(self):
+        """Test that a handlers config entry adds a task type."""
+        delegate = CloudAgentDelegate()
+        delegate.handlers.register_config({"count": f"{__name__}:count_handler"})
+        try:
+            result = delegate.delegate_task("count", self.test_dir, depth=1)
+            pipeline = delegate.run_pipeline(["count", "organize"], self.test_dir)
+            unknown = delegate.delegate_task("missing", self.test_dir)
+        finally:
+            delegate.close()
+
+        self.assertEqual(result, {"status": "success", "count": 2, "options": {"depth": 1}})
+        self.assertEqual([stage["task"] for stage in pipeline["stages"]], ["count", "organize"])
+        self.assertEqual(unknown["status"], "error")
+
+    def test_import_loads_no_task_modules(self):
+        """Test that importing the delegate leaves task-specific modules unloaded."""
+        lazy = ["asyncio", "tarfile", "src.agent", "src.delegator", "src.organize",
+                "src.review", "src.server", "src.testing", "src.workflow"]
+        code = ("import json, sys, cloud_agent_delegate; "
+                f"print(json.dumps([m for m in {lazy!r} if m in sys.modules]))")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                   capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(completed.stdout), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
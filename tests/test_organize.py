@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the organize task components
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import AgentConfig
+from src.config.agent_config import yaml
+from src.organize import FileClassifier
+from src.organize.classifier import DEFAULT_CATEGORIES
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "config", "agent_config.yaml")
+
+
+class TestFileClassifier(unittest.TestCase):
+    """Test cases for FileClassifier."""
+
+    def test_multi_part_suffix_wins_over_extension(self):
+        """Test that the longest configured suffix is used."""
+        classifier = FileClassifier({"tests": [".test.py"], "source_code": [".py"]})
+        self.assertEqual(classifier.classify("widget.test.py"), "tests")
+        self.assertEqual(classifier.classify("widget.py"), "source_code")
+        self.assertEqual(classifier.classify("WIDGET.PY"), "source_code")
+        self.assertEqual(classifier.classify("archive.tar.gz"), "other")
+
+    def test_glob_and_regex_rules(self):
+        """Test that pattern rules take precedence over suffixes."""
+        classifier = FileClassifier({
+            "source_code": [".py"],
+            "tests": ["glob:test_*.py", "re:_spec\\.(js|ts)$"],
+            "configs": ["glob:makefile"],
+        })
+        self.assertEqual(classifier.classify("test_models.py"), "tests")
+        self.assertEqual(classifier.classify("models.py"), "source_code")
+        self.assertEqual(classifier.classify("button_spec.ts"), "tests")
+        self.assertEqual(classifier.classify("Makefile"), "configs")
+
+    def test_hidden_files_have_no_suffix(self):
+        """Test that a leading dot is not treated as a suffix."""
+        classifier = FileClassifier({"configs": [".gitignore"]})
+        self.assertEqual(classifier.classify(".gitignore"), "other")
+        self.assertEqual(classifier.classify("x.gitignore"), "configs")
+
+    def test_invalid_regex_rule(self):
+        """Test that a broken regex is reported when compiling."""
+        with self.assertRaises(ValueError):
+            FileClassifier({"tests": ["re:("]})
+
+    @unittest.skipUnless(yaml, "PyYAML is not installed")
+    def test_config_categories_match_defaults(self):
+        """Test that the shipped configuration classifies like the defaults."""
+        from_config = FileClassifier.from_config(
+            AgentConfig(CONFIG_PATH).get_task_config('organize'))
+        defaults = FileClassifier(DEFAULT_CATEGORIES)
+        names = ["main.c", "app.test.js", "unit_test.py", "integration_spec.js",
+                 "README.md", "settings.toml", "logo.png", "Main.java"]
+        for name in names:
+            self.assertEqual(from_config.classify(name), defaults.classify(name), name)
+        self.assertEqual(from_config.categories[-1], "other")
+
+
+if __name__ == '__main__':
+    unittest.main()
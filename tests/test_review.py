@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the code review engine
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fs.file_index import scan_tree
+from src.review import ReviewCache, ReviewEngine, analyze_source
+
+SAMPLE = b'''"""Sample module."""
+import subprocess
+
+
+def build(items, seen=[]):
+    """Build a string."""
+    out = ""
+    for i in range(len(items)):
+        out += "x"
+    subprocess.run(out, shell=True)
+    return out
+
+
+def undocumented():
+    try:
+        return eval("1")
+    except:
+        pass
+'''
+
+
+def rules(findings):
+    return {finding['rule'] for finding in findings}
+
+
+class TestAnalyzeSource(unittest.TestCase):
+    """Test cases for the AST checks."""
+
+    def test_reports_rules_of_each_category(self):
+        """Test that findings cover every enabled category."""
+        found = rules(analyze_source(SAMPLE))
+        self.assertTrue({"mutable-default-argument", "bare-except"} <= found)
+        self.assertTrue({"subprocess-shell", "eval-used"} <= found)
+        self.assertTrue({"range-len-loop", "string-concat-in-loop"} <= found)
+        self.assertIn("missing-docstring", found)
+        self.assertNotIn("missing-module-docstring", found)
+
+    def test_disabled_categories_are_skipped(self):
+        """Test that only enabled check categories are reported."""
+        findings = analyze_source(SAMPLE, ["security"])
+        self.assertEqual({finding['category'] for finding in findings}, {"security"})
+
+    def test_syntax_error(self):
+        """Test that unparsable sources produce a single syntax error finding."""
+        findings = analyze_source(b"def broken(:\n", ["documentation"])
+        self.assertEqual(rules(findings), {"syntax-error"})
+        self.assertEqual(findings[0]['line'], 1)
+
+
+class TestReviewEngine(unittest.TestCase):
+    """Test cases for ReviewEngine and its cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.tree = os.path.join(self.test_dir, "tree")
+        os.makedirs(os.path.join(self.tree, "pkg"))
+        for i in range(3):
+            with open(os.path.join(self.tree, "pkg", f"mod{i}.py"), 'wb') as f:
+                f.write(SAMPLE)
+        with open(os.path.join(self.tree, "README.md"), 'w') as f:
+            f.write("# Readme\n")
+        self.cache = ReviewCache(os.path.join(self.test_dir, "cache.sqlite"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def review(self, workers=1):
+        engine = ReviewEngine(workers=workers, cache=self.cache)
+        return engine.review(self.tree, scan_tree(self.tree))
+
+    def test_identical_contents_are_parsed_once(self):
+        """Test that files with the same contents share one analysis."""
+        report = self.review()
+        self.assertEqual(report.files_reviewed, 3)
+        self.assertEqual(report.parsed, 1)
+        self.assertEqual(report.content_hits, 2)
+        per_file = len(analyze_source(SAMPLE))
+        self.assertEqual(len(report.findings), 3 * per_file)
+
+    def test_unchanged_files_are_not_read(self):
+        """Test that a re-review only reads and parses changed files."""
+        first = self.review()
+        with open(os.path.join(self.tree, "pkg", "mod1.py"), 'wb') as f:
+            f.write(b'"""Clean."""\n')
+
+        second = self.review()
+        self.assertEqual(second.unchanged, 2)
+        self.assertEqual(second.parsed, 1)
+        self.assertEqual(second.files_reviewed, 3)
+        self.assertLess(len(second.findings), len(first.findings))
+
+        third = self.review()
+        self.assertEqual(third.unchanged, 3)
+        self.assertEqual(third.parsed, 0)
+        self.assertEqual(len(third.findings), len(second.findings))
+
+    def test_process_pool(self):
+        """Test that batches spread across worker processes give the same findings."""
+        for i in range(300):
+            with open(os.path.join(self.tree, f"gen{i}.py"), 'w') as f:
+                f.write(f"def f{i}(a={{}}):\n    return a\n")
+        report = ReviewEngine(workers=2).review(self.tree, scan_tree(self.tree))
+        self.assertEqual(report.files_reviewed, 303)
+        self.assertEqual(report.parsed, 301)
+        defaults = [f for f in report.findings if f['rule'] == "mutable-default-argument"]
+        self.assertEqual(len(defaults), 303)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the delegation server
+"""
+
+import asyncio
+import gzip
+import json
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import CloudAgent, HttpAgent
+from src.delegator import TaskDelegator, TaskScheduler
+from src.server import DelegationServer
+
+
+class EchoAgent(CloudAgent):
+    """Agent that echoes the task after an optional delay."""
+
+    async def execute(self, task):
+        if task.get('sleep'):
+            await asyncio.sleep(task['sleep'])
+        if task.get('fail'):
+            raise RuntimeError("task failed")
+        return {"status": "success", "agent": self.agent_id, "n": task.get('n')}
+
+    def health_check(self):
+        return True
+
+
+async def request(port, method, path, payload=None, headers=None):
+    """Send one raw HTTP/1.1 request and return (status, headers, body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else (
+        payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+    head = [f"{method} {path} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}",
+            "Connection: close"] + [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), response_headers, body
+
+
+class TestDelegationServer(unittest.TestCase):
+    """Test cases for DelegationServer."""
+
+    async def start(self, max_queue=100, concurrency=4, **kwargs):
+        delegator = TaskDelegator()
+        await delegator.register_agent(EchoAgent("echo"))
+        await delegator.register_agent(EchoAgent("pinned", {"capabilities": ["special"]}))
+        scheduler = TaskScheduler(delegator, max_queue=max_queue, concurrency=concurrency)
+        server = DelegationServer(scheduler, **kwargs)
+        await server.start()
+        return server, scheduler
+
+    def test_http_agent_round_trip(self):
+        """Test polling and waiting clients, pinned agents and the result store."""
+        async def run():
+            server, scheduler = await self.start()
+            url = f"http://127.0.0.1:{server.port}"
+            polling = HttpAgent("client", url, poll_interval=0.01, max_connections=2)
+            waiting = HttpAgent("pinned", url, wait_for_result=True)
+            try:
+                polled = await asyncio.gather(
+                    *(polling.execute({"n": n, "sleep": 0.01}) for n in range(10)))
+                pinned = await waiting.execute({"action": "special", "n": 1})
+                failed = await waiting.execute({"n": 2, "fail": True})
+                return polled, pinned, failed, polling.pool.opened, server.stats()
+            finally:
+                polling.close()
+                waiting.close()
+                await server.close()
+                await scheduler.stop()
+
+        polled, pinned, failed, opened, stats = asyncio.run(run())
+        self.assertEqual([result["n"] for result in polled], list(range(10)))
+        self.assertEqual(pinned["agent"], "pinned")
+        self.assertEqual(failed, {"status": "error", "message": "task failed"})
+        self.assertLessEqual(opened, 2)
+        self.assertEqual((stats["submitted"], stats["completed"], stats["running"]), (12, 12, 0))
+
+    def test_protocol_errors_and_limits(self):
+        """Test unknown ids, bad requests, gzip bodies, eviction and a full queue."""
+        async def run():
+            server, scheduler = await self.start(max_queue=1, concurrency=1, max_results=2,
+                                                 compress_threshold=10)
+            port = server.port
+            try:
+                answers = {
+                    "missing": await request(port, "GET", "/api/nothing"),
+                    "method": await request(port, "GET", "/api/delegate"),
+                    "no_task": await request(port, "POST", "/api/delegate", {"n": 1}),
+                    "bad_json": await request(port, "POST", "/api/delegate", b"{"),
+                    "bad_length": await request(port, "POST", "/api/delegate", b"",
+                                                {"Content-Length": "ten"}),
+                    "negative_length": await request(port, "POST", "/api/delegate", b"",
+                                                     {"Content-Length": "-5"}),
+                    "unknown": await request(port, "POST", "/api/results",
+                                             {"task_ids": ["nope"]}),
+                    "gzip": await request(port, "POST", "/api/delegate",
+                                          gzip.compress(json.dumps(
+                                              {"task": {"n": 7}, "wait": True}).encode()),
+                                          {"Content-Encoding": "gzip",
+                                           "Accept-Encoding": "gzip"}),
+                }
+                # One task runs and one waits, so the queue is full
+                await server.submit({"n": 1, "sleep": 0.2})
+                await asyncio.sleep(0)
+                await server.submit({"n": 2})
+                answers["full"] = await request(port, "POST", "/api/delegate",
+                                                {"task": {"n": 2}})
+                ids = [await server.submit({"n": n}, "pinned") for n in range(3)]
+                await asyncio.sleep(0.01)
+                return answers, [server.result(task_id) for task_id in ids]
+            finally:
+                await server.close()
+                await scheduler.stop()
+
+        answers, stored = asyncio.run(run())
+        self.assertEqual(answers["missing"][0], 404)
+        self.assertEqual(answers["method"][0], 405)
+        self.assertEqual(answers["no_task"][0], 400)
+        self.assertEqual(answers["bad_json"][0], 400)
+        self.assertEqual(answers["bad_length"][0], 400)
+        self.assertEqual(answers["negative_length"][0], 400)
+        status, _, body = answers["unknown"]
+        self.assertEqual(json.loads(body)["results"]["nope"]["status"], "error")
+        status, headers, body = answers["gzip"]
+        self.assertEqual((status, headers["Content-Encoding"]), (200, "gzip"))
+        self.assertEqual(json.loads(gzip.decompress(body))["result"]["n"], 7)
+        self.assertEqual(answers["full"][0], 503)
+        # Only the newest max_results results are kept
+        self.assertTrue(stored[0]["message"].startswith("Unknown task id"))
+        self.assertEqual([result["n"] for result in stored[1:]], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
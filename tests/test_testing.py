@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the sharded test runner
+"""
+
+import importlib.util
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.testing import DurationStore, ShardedTestRunner, plan_shards
+
+HAS_PYTEST = importlib.util.find_spec("pytest") is not None
+
+
+class TestPlanShards(unittest.TestCase):
+    """Test cases for plan_shards."""
+
+    def test_balances_by_recorded_duration(self):
+        """Test that shards are balanced by duration, not by file count."""
+        counts = {"slow.py": 1, "a.py": 10, "b.py": 10, "c.py": 10}
+        durations = {"slow.py": 9.0, "a.py": 3.0, "b.py": 3.0, "c.py": 3.0}
+        shards = plan_shards(counts, durations, 2)
+        self.assertEqual(sorted(files for files, _ in shards),
+                         [["a.py", "b.py", "c.py"], ["slow.py"]])
+        self.assertEqual(sorted(expected for _, expected in shards), [9.0, 9.0])
+
+    def test_unmeasured_files_are_estimated_per_test(self):
+        """Test that new files are weighted by their test count."""
+        counts = {"old.py": 10, "new.py": 20, "tiny.py": 1}
+        shards = plan_shards(counts, {"old.py": 1.0}, 2)
+        self.assertEqual(sorted(files for files, _ in shards),
+                         [["new.py"], ["old.py", "tiny.py"]])
+
+
+@unittest.skipUnless(HAS_PYTEST, "pytest is not installed")
+class TestShardedTestRunner(unittest.TestCase):
+    """Test cases for ShardedTestRunner."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.suite = os.path.join(self.test_dir, "suite")
+        os.makedirs(os.path.join(self.suite, "tests"))
+        with open(os.path.join(self.suite, "tests", "test_ok.py"), 'w') as f:
+            f.write("import pytest\n\n"
+                    "def test_one():\n    pass\n\n"
+                    "class TestGroup:\n    def test_two(self):\n        pass\n\n"
+                    "@pytest.mark.skip\ndef test_skipped():\n    pass\n")
+        with open(os.path.join(self.suite, "tests", "test_bad.py"), 'w') as f:
+            f.write("def test_fails():\n    assert 1 == 2\n")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir)
+
+    def test_merges_shard_results_and_records_durations(self):
+        """Test that shard reports are merged and durations are saved."""
+        store_path = os.path.join(self.test_dir, "durations.json")
+        runner = ShardedTestRunner(workers=2, timeout=120,
+                                   durations=DurationStore(store_path))
+        report = runner.run(self.suite)
+
+        self.assertEqual(len(report.shards), 2)
+        self.assertEqual((report.total_tests, report.passed, report.failed, report.skipped),
+                         (4, 2, 1, 1))
+        self.assertFalse(report.ok)
+        self.assertEqual(report.failures[0]['test'], "tests/test_bad.py::test_fails")
+        self.assertIn("tests/test_ok.py::TestGroup::test_two",
+                      [slow['test'] for slow in report.slow_tests()])
+
+        recorded = DurationStore(store_path).get(self.suite)
+        self.assertEqual(set(recorded), {"tests/test_ok.py", "tests/test_bad.py"})
+
+    def test_suite_below_a_project_root(self):
+        """Test that test ids stay relative to the suite under another project's rootdir."""
+        with open(os.path.join(self.test_dir, "setup.py"), 'w') as f:
+            f.write("")
+        os.remove(os.path.join(self.suite, "tests", "test_bad.py"))
+        report = ShardedTestRunner(workers=2, timeout=120).run(self.suite)
+        self.assertEqual((report.total_tests, report.passed, report.errors), (3, 2, 0))
+        self.assertTrue(report.ok)
+
+    def test_empty_suite(self):
+        """Test that a directory without tests yields an empty report."""
+        shutil.rmtree(os.path.join(self.suite, "tests"))
+        report = ShardedTestRunner(workers=2).run(self.suite)
+        self.assertEqual(report.total_tests, 0)
+        self.assertEqual(report.shards, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the workflow engine
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agent import LocalAgent
+from src.delegator import TaskDelegator
+from src.workflow import Workflow, WorkflowExecutor
+
+EXAMPLE_TASK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "tasks", "example_task.json")
+
+
+class TestWorkflowGraph(unittest.TestCase):
+    """Test cases for dependency derivation."""
+
+    def test_example_task_dependencies(self):
+        """Test that organize, review and test only wait for unzip, and report waits for all."""
+        workflow = Workflow.load(EXAMPLE_TASK, base_dir="/work")
+        self.assertEqual(workflow.dependencies, {1: [], 2: [1], 3: [1], 4: [1], 5: [2, 3, 4]})
+
+    def test_write_conflicts_are_ordered(self):
+        """Test that steps writing the same path, or a path read earlier, are ordered."""
+        workflow = Workflow.from_dict({"workflow": [
+            {"action": "review", "input": "src/"},
+            {"action": "unzip", "input": "a.zip", "output": "src/pkg"},
+            {"action": "report", "input": "x", "output": "src/pkg/report.json"},
+            {"action": "test", "input": "tests/", "depends_on": [1]},
+        ]}, base_dir="/work")
+        self.assertEqual(workflow.dependencies, {1: [], 2: [1], 3: [1, 2], 4: [1]})
+
+    def test_invalid_depends_on(self):
+        """Test that depending on a later step is rejected."""
+        with self.assertRaises(ValueError):
+            Workflow.from_dict({"workflow": [
+                {"action": "review", "input": "a", "depends_on": [2]},
+                {"action": "test", "input": "b"},
+            ]})
+
+    def test_critical_path(self):
+        """Test that the critical path follows the slowest dependency chain."""
+        workflow = Workflow.load(EXAMPLE_TASK, base_dir="/work")
+        path, total = workflow.critical_path({1: 1.0, 2: 1.0, 3: 5.0, 4: 2.0, 5: 1.0})
+        self.assertEqual(path, [1, 3, 5])
+        self.assertEqual(total, 7.0)
+
+
+class TestWorkflowExecutor(unittest.TestCase):
+    """Test cases for WorkflowExecutor."""
+
+    def run_workflow(self, handler):
+        async def run():
+            delegator = TaskDelegator()
+            for agent_id in ["file_processor", "code_reviewer", "test_runner",
+                             "report_generator"]:
+                await delegator.register_agent(LocalAgent(agent_id, handler))
+            return await WorkflowExecutor(delegator).run(Workflow.load(EXAMPLE_TASK))
+        return asyncio.run(run())
+
+    def test_independent_steps_run_concurrently(self):
+        """Test that review and test overlap and the critical path is reported."""
+        def handler(task):
+            time.sleep(0.3 if task['action'] in ('review', 'test') else 0.01)
+            return {"status": "success", "message": task['action']}
+
+        result = self.run_workflow(handler)
+        self.assertTrue(result.succeeded)
+        self.assertEqual(result.critical_path[0], 1)
+        self.assertIn(result.critical_path[1], (3, 4))
+        self.assertEqual(result.critical_path[-1], 5)
+        self.assertLess(result.wall_time, result.serial_time - 0.2)
+        self.assertAlmostEqual(result.wall_time, result.critical_path_time, delta=0.1)
+
+    def test_failed_step_skips_dependents(self):
+        """Test that steps after a failure are skipped, not run."""
+        ran = []
+
+        def handler(task):
+            ran.append(task['action'])
+            status = "error" if task['action'] == 'review' else "success"
+            return {"status": status, "message": task['action']}
+
+        result = self.run_workflow(handler)
+        self.assertFalse(result.succeeded)
+        self.assertEqual([step.status for step in result.steps],
+                         ["success", "success", "error", "success", "skipped"])
+        self.assertNotIn("report", ran)
+
+
+if __name__ == '__main__':
+    unittest.main()